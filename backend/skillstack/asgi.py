@@ -2,6 +2,9 @@
 ASGI config for skillstack project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The dashboard event stream is served directly by the ASGI app so that each
+connected client holds a coroutine rather than a worker thread; it is only
+available under an ASGI server (e.g. ``uvicorn skillstack.asgi:application``).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -13,4 +16,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillstack.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from tracker.engines import warmup_if_enabled  # noqa: E402  (needs the app registry)
+from tracker.events import sse_app  # noqa: E402
+
+# Optional engine warmup at worker boot (TRACKER_WARMUP)
+warmup_if_enabled()
+
+DASHBOARD_STREAM_PATH = '/api/dashboard/stream/'
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == DASHBOARD_STREAM_PATH and scope['method'] == 'GET':
+        await sse_app(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'tracker.middleware.ThresholdGZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -51,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tracker.middleware.RequestProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'skillstack.urls'
@@ -77,13 +80,30 @@ WSGI_APPLICATION = 'skillstack.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+ANALYTICS_DB_PATH = os.environ.get('ANALYTICS_DB_PATH', str(BASE_DIR / 'analytics.sqlite3'))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Background workers write concurrently with request handlers
+        'OPTIONS': {
+            'timeout': 20,
+            # Take the write lock up front so waiting writers queue on the busy timeout
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Read-only snapshot of default for dashboard and report reads (refresh_analytics_snapshot)
+    'analytics': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{ANALYTICS_DB_PATH}?mode=ro",
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['tracker.analytics_db.AnalyticsRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -131,10 +151,58 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny'
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'tracker.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# Responses smaller than this many bytes are sent uncompressed
+GZIP_MIN_LENGTH = 1024
+
+# On-demand request profiling (X-Profile header or ?profile=1, DEBUG or staff only)
+PROFILING_DIR = BASE_DIR / 'profiles'
+
+# Item-item collaborative filtering model (see the train_item_similarity command)
+ITEM_SIMILARITY_DIR = BASE_DIR / 'model_store' / 'item_similarity'
+
+# Recommendation result cache (LRU bounded, per-entry TTL in seconds)
+RECOMMENDATION_CACHE_SIZE = 256
+RECOMMENDATION_CACHE_TTL = 300
+
+# Changes feed re-sends rows modified this many seconds before the client's cursor
+CHANGES_FEED_OVERLAP_SECONDS = 2
+
+# Deletion tombstones are kept this many days; older cursors get a full resync
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Running jobs not finished within this many seconds are claimed again (crashed worker)
+JOB_LEASE_SECONDS = 600
+
+# Load recommendation/similarity engines at worker boot instead of on first use
+TRACKER_WARMUP = os.environ.get('TRACKER_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+# startup_profile fails when `check` plus the first request take longer than this
+STARTUP_BUDGET_SECONDS = 3.0
+
+# Analytics reads fall back to the primary once the snapshot is older than this
+ANALYTICS_MAX_STALENESS_SECONDS = 300
+
+# Concurrent identical stats/skills_breakdown/recommendations requests share one
+# computation; set a lock directory to also coalesce across worker processes
+SINGLE_FLIGHT_LOCK_DIR = os.environ.get('SINGLE_FLIGHT_LOCK_DIR') or None
+
+# Above zero, serve the last result up to this old while a refresh runs in the background
+SINGLE_FLIGHT_STALE_SECONDS = 0
+
+# Results younger than this are served without a background refresh (None: half the stale window)
+SINGLE_FLIGHT_REFRESH_SECONDS = None
+
+# Dashboard stream notifications within this window are recomputed once
+DASHBOARD_STREAM_COALESCE_SECONDS = 0.5
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
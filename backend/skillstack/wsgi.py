@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillstack.settings')
 
 application = get_wsgi_application()
+
+# Optional engine warmup at worker boot (TRACKER_WARMUP)
+from tracker.engines import warmup_if_enabled  # noqa: E402
+
+warmup_if_enabled()
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .models import DailyActivity, Progress, Resource
+
+
+def record_activity(skill_id, user_id=None, hours=0, completions=0, day=None):
+    """
+    Add hours and completions to the rollup row for (skill, day), creating it if needed
+    Updates use F() expressions so concurrent writers never lose increments.
+    """
+    hours = Decimal(hours or 0)
+    if not hours and not completions:
+        return
+    day = day or timezone.localdate()
+    changes = {'hours': F('hours') + hours, 'completions': F('completions') + completions, 'updated_at': timezone.now()}
+    if DailyActivity.objects.filter(skill_id=skill_id, date=day).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DailyActivity.objects.create(
+                user_id=user_id, skill_id=skill_id, date=day, hours=hours, completions=completions
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        DailyActivity.objects.filter(skill_id=skill_id, date=day).update(**changes)
+
+
+def record_progress_change(progress, created=False):
+    """
+    Roll the difference between a Progress row's loaded and saved state into today's activity
+
+    Returns the change in completions: 1 when the save completed the row,
+    -1 when it un-completed it, otherwise 0.
+    """
+    old_hours = Decimal('0') if created else Decimal(progress.loaded_value('hours_spent', progress.hours_spent) or 0)
+    old_status = None if created else progress.loaded_value('status', progress.status)
+    hours = Decimal(progress.hours_spent or 0) - old_hours
+
+    completions = 0
+    if progress.status == 'completed' and old_status != 'completed':
+        completions = 1
+    elif old_status == 'completed' and progress.status != 'completed':
+        completions = -1
+
+    if hours or completions:
+        skill_id = Resource.objects.filter(pk=progress.resource_id).values_list('skill_id', flat=True).first()
+        if skill_id is not None:
+            record_activity(skill_id, progress.user_id, hours=hours, completions=completions)
+    progress.mark_saved_values()
+    return completions
+
+
+def remove_activity(skill_id, day, hours=0, completions=0):
+    """
+    Subtract hours and completions from the rollup row for (skill, day), never below zero
+    """
+    hours = Decimal(hours or 0)
+    if not hours and not completions:
+        return
+    DailyActivity.objects.filter(skill_id=skill_id, date=day).update(
+        hours=Greatest(F('hours') - hours, Value(Decimal('0')), output_field=DecimalField()),
+        completions=Greatest(F('completions') - completions, Value(0)),
+        updated_at=timezone.now(),
+    )
+
+
+def record_progress_deletion(progress):
+    """
+    Take a deleted Progress row's hours and completion back out of the days
+    rebuild_activity attributes them to: hours to the day of the last update,
+    the completion to the completion day
+    """
+    hours = Decimal(progress.loaded_value('hours_spent', progress.hours_spent) or 0)
+    completed = progress.loaded_value('status', progress.status) == 'completed'
+    if not hours and not completed:
+        return
+    skill_id = Resource.objects.filter(pk=progress.resource_id).values_list('skill_id', flat=True).first()
+    if skill_id is None:
+        return
+    day = timezone.localdate(progress.updated_at) if progress.updated_at else timezone.localdate()
+    remove_activity(skill_id, day, hours=hours)
+    if completed:
+        completed_day = timezone.localdate(progress.completed_at) if progress.completed_at else day
+        remove_activity(skill_id, completed_day, completions=1)
+
+
+def rebuild_activity():
+    """
+    Recreate every rollup row from Progress: hours on the day of the last
+    update and completions on the completion day
+    """
+    rollup = {}
+    rows = Progress.objects.values_list('user_id', 'resource__skill_id', 'hours_spent', 'status', 'updated_at', 'completed_at')
+    for user_id, skill_id, hours, status, updated_at, completed_at in rows.iterator():
+        day = timezone.localdate(updated_at)
+        entry = rollup.setdefault((skill_id, day), {'user_id': user_id, 'hours': Decimal('0'), 'completions': 0})
+        entry['hours'] += hours or 0
+        if status == 'completed':
+            completed_day = timezone.localdate(completed_at) if completed_at else day
+            entry = rollup.setdefault((skill_id, completed_day), {'user_id': user_id, 'hours': Decimal('0'), 'completions': 0})
+            entry['completions'] += 1
+
+    with transaction.atomic():
+        DailyActivity.objects.all().delete()
+        DailyActivity.objects.bulk_create(
+            [DailyActivity(skill_id=skill_id, date=day, **values) for (skill_id, day), values in rollup.items()],
+            batch_size=1000,
+        )
+    return len(rollup)
+
+
+def activity_calendar(user, days=365, skill_id=None, today=None):
+    """
+    Daily hours/completions for the last ``days`` days plus current and longest streaks
+    """
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    queryset = DailyActivity.objects.owned_by(user).filter(date__gte=start, date__lte=today)
+    if skill_id is not None:
+        queryset = queryset.filter(skill_id=skill_id)
+    rows = queryset.order_by('date').values('date').annotate(hours=Sum('hours'), completions=Sum('completions'))
+
+    calendar = [
+        {'date': row['date'], 'hours': float(row['hours']), 'completions': row['completions']}
+        for row in rows
+        if row['hours'] > 0 or row['completions'] > 0
+    ]
+    active_days = {entry['date'] for entry in calendar}
+
+    longest = run = 0
+    previous = None
+    for day in sorted(active_days):
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    # The current streak may end yesterday if nothing has been logged yet today
+    current = 0
+    day = today if today in active_days else today - timedelta(days=1)
+    while day in active_days:
+        current += 1
+        day -= timedelta(days=1)
+
+    return {
+        'start': start,
+        'end': today,
+        'days': calendar,
+        'active_days': len(active_days),
+        'total_hours': round(sum(entry['hours'] for entry in calendar), 2),
+        'total_completions': sum(entry['completions'] for entry in calendar),
+        'current_streak': current,
+        'longest_streak': longest,
+    }
@@ -0,0 +1,140 @@
+"""
+Read-only analytics snapshot of the primary database
+
+Views opt in per request: dashboard and recommendation reads run inside
+``analytics_reads()`` and AnalyticsRouter sends them to the ``analytics``
+alias: a copy of the primary taken with SQLite's online backup API by
+``refresh_snapshot`` (the refresh_analytics_snapshot command). Writes always go
+to the primary. When the snapshot is missing or older than
+``ANALYTICS_MAX_STALENESS_SECONDS`` reads fall back to the primary.
+Commands and backfills that must see current (or uncommitted) data wrap
+their work in ``primary_reads()``, which wins over any ``analytics_reads()``
+entered inside it.
+"""
+import contextlib
+import contextvars
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+ANALYTICS_DB = 'analytics'
+
+_analytics_reads = contextvars.ContextVar('analytics_reads', default=False)
+_primary_reads = contextvars.ContextVar('primary_reads', default=False)
+
+
+@contextlib.contextmanager
+def analytics_reads():
+    """
+    Route tracker reads made inside the block to the analytics snapshot
+    """
+    token = _analytics_reads.set(True)
+    try:
+        yield
+    finally:
+        _analytics_reads.reset(token)
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """
+    Keep every read made inside the block on the primary, even inside analytics_reads()
+    """
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+def snapshot_path():
+    """
+    Filesystem path of the snapshot, or None when there is no file-backed analytics alias
+    """
+    if ANALYTICS_DB not in settings.DATABASES or connections[ANALYTICS_DB].is_in_memory_db():
+        return None
+    return Path(settings.ANALYTICS_DB_PATH)
+
+
+def snapshot_age(path=None):
+    """
+    Seconds since the snapshot was taken, or None when there is none
+    """
+    path = path or snapshot_path()
+    try:
+        return max(time.time() - os.stat(path).st_mtime, 0.0)
+    except (OSError, TypeError):
+        return None
+
+
+def snapshot_is_fresh():
+    age = snapshot_age()
+    return age is not None and age <= getattr(settings, 'ANALYTICS_MAX_STALENESS_SECONDS', 300)
+
+
+def copy_database(source, target, pages=1024, timeout=20):
+    """
+    Copy the SQLite file ``source`` to ``target`` with the online backup API
+
+    The copy is written next to ``target`` and renamed over it, so readers see
+    either the old or the new snapshot. ``pages`` pages are copied per step,
+    so writers on the source are only blocked for one step at a time. The
+    target's modification time is set to when the copy started.
+    """
+    target = Path(target)
+    started = time.time()
+    partial = target.with_name(target.name + '.partial')
+    partial.unlink(missing_ok=True)
+    primary = sqlite3.connect(str(source), timeout=timeout)
+    copy = sqlite3.connect(str(partial))
+    try:
+        primary.backup(copy, pages=pages)
+    finally:
+        copy.close()
+        primary.close()
+    os.utime(partial, (started, started))
+    os.replace(partial, target)
+    return target.stat().st_size, time.time() - started
+
+
+def refresh_snapshot(pages=1024):
+    """
+    Copy the primary into the analytics snapshot; returns ``(size_bytes, seconds)``
+    """
+    target = snapshot_path()
+    primary = connections[DEFAULT_DB_ALIAS]
+    if target is None or primary.is_in_memory_db():
+        raise ValueError("The analytics snapshot needs file-backed default and analytics databases")
+    result = copy_database(primary.settings_dict['NAME'], target, pages=pages,
+                           timeout=primary.settings_dict['OPTIONS'].get('timeout', 5))
+    # Connections of this process opened on the old file would keep reading it
+    connections[ANALYTICS_DB].close()
+    return result
+
+
+class AnalyticsRouter:
+    """
+    Send tracker reads inside ``analytics_reads()`` (and outside
+    ``primary_reads()``) to a fresh snapshot; everything else, and every
+    write, uses the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        if _analytics_reads.get() and not _primary_reads.get() and model._meta.app_label == 'tracker' and snapshot_is_fresh():
+            return ANALYTICS_DB
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Instances loaded from the snapshot must still be saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, ANALYTICS_DB}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The snapshot gets its schema from the primary
+        return db != ANALYTICS_DB
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Skill, Resource, Progress, Certification, Tombstone
+from .serializers import SkillSerializer, ResourceSerializer, ProgressSerializer, CertificationDetailSerializer
+
+# Feed name -> (model, serializer, queryset hook)
+SYNCED_MODELS = {
+    'skills': (Skill, SkillSerializer, lambda queryset: queryset),
+    'resources': (Resource, ResourceSerializer, lambda queryset: queryset),
+    'progress': (Progress, ProgressSerializer, lambda queryset: queryset.select_related('note_blob')),
+    'certifications': (Certification, CertificationDetailSerializer, lambda queryset: queryset.prefetch_related('skills')),
+}
+
+# Tombstone.model values for each feed
+TOMBSTONE_NAMES = {model: name for name, (model, serializer, hook) in SYNCED_MODELS.items()}
+
+
+def record_tombstone(instance):
+    name = TOMBSTONE_NAMES.get(type(instance))
+    if name is not None:
+        Tombstone.objects.create(user_id=instance.user_id, model=name, object_id=instance.pk)
+
+
+def tombstone_horizon(now=None):
+    """
+    Oldest deletion the feed still has a tombstone for
+    """
+    return (now or timezone.now()) - timedelta(days=getattr(settings, 'TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def prune_tombstones(now=None):
+    """
+    Delete tombstones past the retention window; returns how many were removed
+    """
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_horizon(now)).delete()
+    return deleted
+
+
+def encode_page(cursor, window_start, after):
+    """
+    Signed continuation token: the first page's cursor and window plus the
+    last ``(updated_at, id)`` returned for each model that was truncated
+    """
+    return signing.dumps({
+        'cursor': cursor.isoformat(),
+        'window_start': window_start.isoformat() if window_start is not None else None,
+        'after': {name: [updated_at.isoformat(), pk] for name, (updated_at, pk) in after.items()},
+    }, salt='tracker.changes')
+
+
+def decode_page(token):
+    """
+    Inverse of encode_page; raises ValueError for tampered or malformed tokens
+    """
+    try:
+        state = signing.loads(token, salt='tracker.changes')
+        return (
+            parse_datetime(state['cursor']),
+            parse_datetime(state['window_start']) if state['window_start'] else None,
+            {name: (parse_datetime(updated_at), pk) for name, (updated_at, pk) in state['after'].items()},
+        )
+    except (signing.BadSignature, KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid page token") from exc
+
+
+def collect_changes(user, since=None, limit=500, page=None):
+    """
+    Rows owned by ``user`` modified at or after ``since`` plus ids deleted since then
+
+    The query window starts ``CHANGES_FEED_OVERLAP_SECONDS`` before the cursor
+    so rows committed by slow transactions are not skipped; clients apply
+    changes as idempotent upserts. Without ``since`` the full dataset is
+    returned. At most ``limit`` rows per model are returned; ``has_more``
+    tells the client to call again with ``page=next_page``. Continuation pages
+    resume after the last ``(updated_at, id)`` of each truncated model, so
+    they always advance however many rows share a timestamp. ``cursor`` is
+    the next ``since`` once the last page has been read.
+
+    Deletions are only remembered for ``TOMBSTONE_RETENTION_DAYS``. A
+    ``since`` older than that gets the full dataset with ``resync`` set, and
+    the client must drop any local rows the full sync does not contain.
+    """
+    resync = False
+    if page is not None:
+        cursor, window_start, after = decode_page(page)
+    else:
+        # Cursor is taken before querying so concurrent writes land in the next window
+        cursor = timezone.now()
+        window_start = None
+        if since is not None and since < tombstone_horizon(cursor):
+            resync = True
+        elif since is not None:
+            window_start = since - timedelta(seconds=getattr(settings, 'CHANGES_FEED_OVERLAP_SECONDS', 2))
+        after = None
+
+    changes = {}
+    truncated = {}
+    for name, (model, serializer_class, hook) in SYNCED_MODELS.items():
+        if after is not None and name not in after:
+            # Finished on an earlier page
+            changes[name] = []
+            continue
+        queryset = hook(model.objects.owned_by(user))
+        if window_start is not None:
+            queryset = queryset.filter(updated_at__gte=window_start)
+        if after is not None:
+            updated_at, pk = after[name]
+            queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+        rows = list(queryset.order_by('updated_at', 'id')[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            truncated[name] = (rows[-1].updated_at, rows[-1].pk)
+        changes[name] = serializer_class(rows, many=True).data
+
+    deleted = {name: [] for name in SYNCED_MODELS}
+    if window_start is not None and page is None:
+        tombstones = Tombstone.objects.owned_by(user).filter(deleted_at__gte=window_start)
+        for model_name, object_id in tombstones.values_list('model', 'object_id'):
+            deleted.setdefault(model_name, []).append(object_id)
+
+    return {
+        'cursor': cursor,
+        'resync': resync,
+        'has_more': bool(truncated),
+        'next_page': encode_page(cursor, window_start, truncated) if truncated else None,
+        'changes': changes,
+        'deleted': deleted,
+    }
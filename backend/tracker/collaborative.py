@@ -0,0 +1,307 @@
+import json
+import os
+import shutil
+import time
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .engines import similarity_model_dir, similarity_model_exists
+from .models import Progress
+
+ARRAY_NAMES = [
+    'item_ids', 'item_counts', 'pair_left', 'pair_right', 'pair_counts',
+    'neighbors', 'scores', 'counted_progress',
+]
+
+# Completions are re-read this far before the last training's watermark so
+# rows committed while it ran are not missed; counted_progress drops repeats
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def model_dir():
+    return similarity_model_dir()
+
+
+class ItemSimilarityTrainer:
+    """
+    Builds an item-item similarity model from completed Progress
+
+    Two resources co-occur when they were both completed by the same user or
+    within the same skill. Similarity is the cosine of co-occurrence counts,
+    and only the ``top_k`` neighbours of each resource are kept for serving.
+    """
+
+    def __init__(self, top_k=20, max_basket_size=200):
+        self.top_k = top_k
+        self.max_basket_size = max_basket_size
+
+    def train(self):
+        """
+        Full rebuild from every completed Progress row
+        """
+        watermark = timezone.now()
+        rows = self._completions()
+        progress_ids = np.array(sorted(row[0] for row in rows), dtype=np.int64)
+        item_ids, item_counts, left, right, pair_counts = self._count(self._baskets(rows), {})
+        return self._finish(item_ids, item_counts, left, right, pair_counts, progress_ids, watermark, incremental=False)
+
+    def update(self, model):
+        """
+        Fold completions recorded since ``model`` was trained into its counts
+
+        Only rows updated since the model's watermark are read to find new
+        completions. Each touched basket is truncated to its most recent
+        ``max_basket_size`` members as a whole, as ``train`` does, and new
+        members are paired with the old members that remain. Pairs counted
+        earlier for members that have now dropped out are kept, as are
+        resources that were un-completed or deleted; a periodic full
+        ``train`` removes both.
+        """
+        counted = np.asarray(model.arrays['counted_progress'])
+        watermark = timezone.now()
+        since = parse_datetime(model.meta.get('watermark') or '')
+        candidates = self._completions(since=since - WATERMARK_OVERLAP if since else None)
+        is_counted = np.isin(np.array([row[0] for row in candidates], dtype=np.int64), counted)
+        new_rows = [row for row, seen in zip(candidates, is_counted) if not seen]
+        if not new_rows:
+            return None
+
+        # Every member of each basket touched by the new completions, oldest first
+        touched = self._basket_rows(new_rows)
+        basket_rows = self._completions(
+            users={key[1] for key in touched if key[0] == 'user'},
+            skills={key[1] for key in touched if key[0] == 'skill'},
+        )
+        new_ids = {row[0] for row in new_rows}
+        is_counted = dict(zip(
+            (row[0] for row in basket_rows),
+            np.isin(np.array([row[0] for row in basket_rows], dtype=np.int64), counted),
+        ))
+        new_baskets, old_baskets = {}, {}
+        for key, members in self._basket_rows(basket_rows).items():
+            if key in touched:
+                new_baskets[key] = self._unique_resources(row for row in members if row[0] in new_ids)
+                old_baskets[key] = self._unique_resources(row for row in members if is_counted[row[0]])
+
+        item_ids, item_counts, left, right, pair_counts = self._count(new_baskets, old_baskets)
+        item_ids, item_counts = self._merge_items(
+            np.asarray(model.arrays['item_ids']), np.asarray(model.arrays['item_counts']), item_ids, item_counts
+        )
+        left, right, pair_counts = self._merge_pairs(
+            np.asarray(model.arrays['pair_left']), np.asarray(model.arrays['pair_right']),
+            np.asarray(model.arrays['pair_counts']), left, right, pair_counts
+        )
+        progress_ids = np.union1d(counted, np.array(sorted(new_ids), dtype=np.int64))
+        return self._finish(item_ids, item_counts, left, right, pair_counts, progress_ids, watermark, incremental=True)
+
+    def _completions(self, users=None, skills=None, since=None):
+        queryset = Progress.objects.filter(status='completed')
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+        if users is not None or skills is not None:
+            users, skills = set(users or ()), set(skills or ())
+            # Unowned progress forms a single anonymous basket
+            baskets = Q(pk__in=[])
+            if users - {None}:
+                baskets |= Q(user_id__in=users - {None})
+            if None in users:
+                baskets |= Q(user__isnull=True)
+            if skills:
+                baskets |= Q(resource__skill_id__in=skills)
+            queryset = queryset.filter(baskets)
+        return list(
+            queryset.order_by('completed_at', 'id').values_list('id', 'resource_id', 'user_id', 'resource__skill_id')
+        )
+
+    def _basket_rows(self, rows):
+        baskets = defaultdict(list)
+        for row in rows:
+            _, _, user_id, skill_id = row
+            baskets[('user', user_id)].append(row)
+            baskets[('skill', skill_id)].append(row)
+        # Keep the most recent completions of oversized baskets
+        return {key: members[-self.max_basket_size:] for key, members in baskets.items()}
+
+    def _baskets(self, rows):
+        return {key: self._unique_resources(members) for key, members in self._basket_rows(rows).items()}
+
+    def _unique_resources(self, rows):
+        return np.unique(np.array([row[1] for row in rows], dtype=np.int64))
+
+    def _count(self, new_baskets, old_baskets):
+        """
+        Item and pair counts contributed by new basket members: pairs among the
+        new members plus pairs between new and already counted members
+        """
+        items, lefts, rights = [], [], []
+        for key, new_ids in new_baskets.items():
+            old_ids = old_baskets.get(key)
+            if old_ids is not None:
+                new_ids = np.setdiff1d(new_ids, old_ids)
+            items.append(new_ids)
+
+            i, j = np.triu_indices(len(new_ids), k=1)
+            lefts.append(new_ids[i])
+            rights.append(new_ids[j])
+            if old_ids is not None and len(old_ids):
+                cross_new = np.repeat(new_ids, len(old_ids))
+                cross_old = np.tile(old_ids, len(new_ids))
+                lefts.append(np.minimum(cross_new, cross_old))
+                rights.append(np.maximum(cross_new, cross_old))
+
+        all_items = np.concatenate(items) if items else np.empty(0, dtype=np.int64)
+        item_ids, item_counts = np.unique(all_items, return_counts=True)
+        left = np.concatenate(lefts) if lefts else np.empty(0, dtype=np.int64)
+        right = np.concatenate(rights) if rights else np.empty(0, dtype=np.int64)
+        if len(left):
+            pairs, pair_counts = np.unique(np.stack([left, right], axis=1), axis=0, return_counts=True)
+            left, right = pairs[:, 0], pairs[:, 1]
+        else:
+            pair_counts = np.empty(0, dtype=np.int64)
+        return item_ids, item_counts, left, right, pair_counts
+
+    def _merge_items(self, ids_a, counts_a, ids_b, counts_b):
+        ids, inverse = np.unique(np.concatenate([ids_a, ids_b]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([counts_a, counts_b]), minlength=len(ids))
+        return ids, counts.astype(np.int64)
+
+    def _merge_pairs(self, left_a, right_a, counts_a, left_b, right_b, counts_b):
+        stacked = np.stack([np.concatenate([left_a, left_b]), np.concatenate([right_a, right_b])], axis=1)
+        if not len(stacked):
+            return left_a, right_a, counts_a
+        pairs, inverse = np.unique(stacked, axis=0, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=np.concatenate([counts_a, counts_b]), minlength=len(pairs))
+        return pairs[:, 0], pairs[:, 1], counts.astype(np.int64)
+
+    def _finish(self, item_ids, item_counts, left, right, pair_counts, progress_ids, watermark, incremental):
+        neighbors, scores = self._top_k(item_ids, item_counts, left, right, pair_counts)
+        arrays = {
+            'item_ids': item_ids.astype(np.int64),
+            'item_counts': item_counts.astype(np.int64),
+            'pair_left': left.astype(np.int64),
+            'pair_right': right.astype(np.int64),
+            'pair_counts': pair_counts.astype(np.int64),
+            'neighbors': neighbors,
+            'scores': scores,
+            'counted_progress': progress_ids.astype(np.int64),
+        }
+        meta = {
+            'trained_at': timezone.now().isoformat(),
+            'watermark': watermark.isoformat(),
+            'incremental': incremental,
+            'items': int(len(item_ids)),
+            'pairs': int(len(left)),
+            'top_k': self.top_k,
+        }
+        return arrays, meta
+
+    def _top_k(self, item_ids, item_counts, left, right, pair_counts):
+        n = len(item_ids)
+        neighbors = np.full((n, self.top_k), -1, dtype=np.int32)
+        scores = np.zeros((n, self.top_k), dtype=np.float32)
+        if not len(left):
+            return neighbors, scores
+
+        left_idx = np.searchsorted(item_ids, left)
+        right_idx = np.searchsorted(item_ids, right)
+        similarity = pair_counts / np.sqrt(item_counts[left_idx] * item_counts[right_idx])
+
+        rows = np.concatenate([left_idx, right_idx])
+        cols = np.concatenate([right_idx, left_idx])
+        sims = np.concatenate([similarity, similarity])
+
+        # Sort by row, then by descending similarity, and keep the first top_k of each row
+        order = np.lexsort((-sims, rows))
+        rows, cols, sims = rows[order], cols[order], sims[order]
+        starts = np.searchsorted(rows, np.arange(n))
+        rank = np.arange(len(rows)) - starts[rows]
+        keep = rank < self.top_k
+        neighbors[rows[keep], rank[keep]] = cols[keep]
+        scores[rows[keep], rank[keep]] = sims[keep]
+        return neighbors, scores
+
+
+class ItemSimilarityModel:
+    """
+    Read-only, memory-mapped view of a trained similarity model
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = Path(path)
+        mmap_mode = 'r' if mmap else None
+        self.arrays = {name: np.load(self.path / f"{name}.npy", mmap_mode=mmap_mode) for name in ARRAY_NAMES}
+        with open(self.path / 'meta.json') as f:
+            self.meta = json.load(f)
+        self.item_ids = self.arrays['item_ids']
+        self.neighbors = self.arrays['neighbors']
+        self.scores = self.arrays['scores']
+
+    def similar(self, resource_id, limit=5):
+        """
+        Return up to ``limit`` (resource_id, score) pairs most similar to resource_id
+        """
+        index = int(np.searchsorted(self.item_ids, resource_id))
+        if index >= len(self.item_ids) or self.item_ids[index] != resource_id:
+            return []
+        results = []
+        for neighbor, score in zip(self.neighbors[index], self.scores[index]):
+            if neighbor < 0 or len(results) >= limit:
+                break
+            results.append((int(self.item_ids[neighbor]), float(score)))
+        return results
+
+
+def save_model(arrays, meta, base_dir=None, keep_versions=2):
+    """
+    Write the model to a new version directory and atomically point CURRENT at it
+    """
+    base_dir = Path(base_dir or model_dir())
+    version = f"v{time.time_ns()}"
+    version_dir = base_dir / version
+    version_dir.mkdir(parents=True)
+    for name in ARRAY_NAMES:
+        np.save(version_dir / f"{name}.npy", arrays[name])
+    with open(version_dir / 'meta.json', 'w') as f:
+        json.dump(dict(meta, version=version), f, indent=2)
+
+    pointer = base_dir / 'CURRENT.tmp'
+    pointer.write_text(version)
+    os.replace(pointer, base_dir / 'CURRENT')
+
+    # Older versions may still be memory-mapped by running workers, which is
+    # safe on POSIX; only prune beyond the most recent few
+    versions = sorted(path for path in base_dir.iterdir() if path.is_dir() and path.name.startswith('v'))
+    for stale in versions[:-keep_versions]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return version_dir
+
+
+_loaded = {}
+
+
+def get_model(base_dir=None):
+    """
+    Return the current model for this process, reloading when CURRENT changes
+    Returns None when no model has been trained yet.
+    """
+    base_dir = Path(base_dir or model_dir())
+    pointer = base_dir / 'CURRENT'
+    try:
+        mtime = pointer.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(base_dir)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    model = ItemSimilarityModel(base_dir / pointer.read_text().strip())
+    _loaded[base_dir] = (mtime, model)
+    return model
+
+
+def model_exists(base_dir=None):
+    return similarity_model_exists(base_dir)
@@ -0,0 +1,198 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.functional import cached_property
+from .models import Skill, Resource, Progress, Certification
+
+def build_stats(owner):
+    """
+    Headline dashboard figures for the given owner (None means unowned data)
+    """
+    resources = Resource.objects.owned_by(owner)
+    progress = Progress.objects.owned_by(owner)
+    
+    total_skills = Skill.objects.owned_by(owner).count()
+    total_resources = resources.count()
+    completed_resources = progress.filter(status='completed').count()
+    
+    # Get resources by platform
+    resources_by_platform = resources.order_by().values('platform').annotate(count=Count('platform'))
+    
+    # Get resources by type
+    resources_by_type = resources.order_by().values('resource_type').annotate(count=Count('resource_type'))
+    
+    # Get recent activity (last 7 days)
+    week_ago = timezone.now() - timedelta(days=7)
+    recent_activity = progress.filter(
+        updated_at__gte=week_ago
+    ).order_by().values('status').annotate(count=Count('status'))
+    
+    # Get certification count
+    total_certifications = Certification.objects.owned_by(owner).count()
+    
+    data = {
+        'total_skills': total_skills,
+        'total_resources': total_resources,
+        'total_certifications': total_certifications,
+        'completed_resources': completed_resources,
+        'completion_rate': (completed_resources / total_resources * 100) if total_resources > 0 else 0,
+        'resources_by_platform': list(resources_by_platform),
+        'resources_by_type': list(resources_by_type),
+        'recent_activity': list(recent_activity)
+    }
+    
+    return data
+
+def build_skills_breakdown(owner):
+    """
+    Per-skill resource counts by progress status for the given owner
+    """
+    # Get skills with their resource counts and completion status
+    skills_data = Skill.objects.owned_by(owner).prefetch_related('resources__progress').annotate(
+        resource_count=Count('resources')
+    )
+    
+    skills_list = []
+    for skill in skills_data:
+        # Count resources by different statuses
+        started_count = 0
+        in_progress_count = 0
+        completed_count = 0
+        
+        for resource in skill.resources.all():
+            if hasattr(resource, 'progress') and resource.progress:
+                status = resource.progress.status
+                if status == 'started':
+                    started_count += 1
+                elif status == 'in_progress':
+                    in_progress_count += 1
+                elif status == 'completed':
+                    completed_count += 1
+        
+        # Total active resources (started + in_progress + completed)
+        active_count = started_count + in_progress_count + completed_count
+        
+        skills_list.append({
+            'id': skill.id,
+            'name': skill.name,
+            'resource_count': skill.resource_count,
+            'started_count': started_count,
+            'in_progress_count': in_progress_count,
+            'completed_count': completed_count,
+            'active_count': active_count,
+            'completion_rate': (completed_count / skill.resource_count * 100) if skill.resource_count > 0 else 0,
+            'activity_rate': (active_count / skill.resource_count * 100) if skill.resource_count > 0 else 0
+        })
+        
+    return skills_list
+
+def _grouped_counts(items, field):
+    # Same shape and order as .values(field).annotate(count=Count(field))
+    counts = Counter(getattr(item, field) for item in items)
+    return [{field: value, 'count': count} for value, count in sorted(counts.items())]
+
+class DashboardContext:
+    """
+    Query results shared by the sections of one dashboard response
+    The owner's skills and resources (with skill and progress) are each loaded
+    once and every section is derived from them in memory.
+    """
+    
+    def __init__(self, owner):
+        self.owner = owner
+        self.owner_id = getattr(owner, 'pk', owner)
+        
+    @cached_property
+    def skills(self):
+        # Annotated queries drop Meta.ordering, so the separate endpoints list skills by id
+        return list(Skill.objects.owned_by(self.owner).order_by('id'))
+        
+    @cached_property
+    def resources(self):
+        return list(Resource.objects.owned_by(self.owner).select_related('skill', 'progress'))
+        
+    @cached_property
+    def resources_by_skill(self):
+        grouped = defaultdict(list)
+        for resource in self.resources:
+            grouped[resource.skill_id].append(resource)
+        return grouped
+        
+    @cached_property
+    def progress(self):
+        """
+        The owner's progress rows, newest first like Progress.objects
+        """
+        items = [
+            resource.progress for resource in self.resources
+            if hasattr(resource, 'progress') and resource.progress.user_id == self.owner_id
+        ]
+        items.sort(key=lambda item: item.created_at, reverse=True)
+        return items
+        
+    @cached_property
+    def certification_count(self):
+        return Certification.objects.owned_by(self.owner).count()
+        
+    def recent_progress(self, days=7):
+        since = timezone.now() - timedelta(days=days)
+        return [item for item in self.progress if item.updated_at >= since]
+        
+    def stats(self):
+        """
+        Same figures as build_stats
+        """
+        total_resources = len(self.resources)
+        completed_resources = sum(1 for item in self.progress if item.status == 'completed')
+        return {
+            'total_skills': len(self.skills),
+            'total_resources': total_resources,
+            'total_certifications': self.certification_count,
+            'completed_resources': completed_resources,
+            'completion_rate': (completed_resources / total_resources * 100) if total_resources > 0 else 0,
+            'resources_by_platform': _grouped_counts(self.resources, 'platform'),
+            'resources_by_type': _grouped_counts(self.resources, 'resource_type'),
+            'recent_activity': _grouped_counts(self.recent_progress(), 'status'),
+        }
+        
+    @cached_property
+    def status_counts_by_skill(self):
+        return {
+            skill.id: Counter(
+                resource.progress.status for resource in self.resources_by_skill[skill.id]
+                if hasattr(resource, 'progress')
+            )
+            for skill in self.skills
+        }
+        
+    def skills_breakdown(self):
+        """
+        Same rows as build_skills_breakdown
+        """
+        skills_list = []
+        for skill in self.skills:
+            statuses = self.status_counts_by_skill[skill.id]
+            resource_count = len(self.resources_by_skill[skill.id])
+            active_count = statuses['started'] + statuses['in_progress'] + statuses['completed']
+            skills_list.append({
+                'id': skill.id,
+                'name': skill.name,
+                'resource_count': resource_count,
+                'started_count': statuses['started'],
+                'in_progress_count': statuses['in_progress'],
+                'completed_count': statuses['completed'],
+                'active_count': active_count,
+                'completion_rate': (statuses['completed'] / resource_count * 100) if resource_count > 0 else 0,
+                'activity_rate': (active_count / resource_count * 100) if resource_count > 0 else 0
+            })
+        return skills_list
+        
+    def recommendations(self, recommender, limit=5):
+        """
+        ``(skills, resources)`` ranked by ``recommender`` from the loaded rows
+        """
+        for skill in self.skills:
+            skill.resource_count = len(self.resources_by_skill[skill.id])
+            skill.completed_count = self.status_counts_by_skill[skill.id]['completed']
+        return recommender.rank_skills(self.skills, limit), recommender.rank_resources(self.resources, limit)
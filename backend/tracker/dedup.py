@@ -0,0 +1,115 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'yclid', '_ga', '_gl',
+    'ref', 'ref_', 'referrer', 'si', 'feature', 'trk', 'trackingid',
+    # Udemy / Rakuten affiliate and coupon links
+    'couponcode', 'referralcode', 'ranmid', 'raneaid', 'ransiteid', 'lsnpubid', 'utm_referrer',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+# Largest number of URLs accepted by one duplicate check
+MAX_CHECK_URLS = 5000
+
+HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+YOUTUBE_HOSTS = {'youtube.com', 'youtube-nocookie.com', 'music.youtube.com'}
+YOUTUBE_ID = re.compile(r'^[A-Za-z0-9_-]{11}$')
+YOUTUBE_PATH_ID = re.compile(r'^/(?:embed|shorts|live|v|e)/([A-Za-z0-9_-]{11})(?:/|$)')
+
+
+def _youtube_url(host, path, query):
+    """
+    Single watch URL for every YouTube video link form, or None for non-video links
+    """
+    video_id = None
+    if host == 'youtu.be':
+        candidate = path.strip('/').split('/')[0]
+        video_id = candidate if YOUTUBE_ID.match(candidate) else None
+    elif host in YOUTUBE_HOSTS:
+        if path.rstrip('/') == '/watch':
+            candidate = dict(query).get('v', '')
+            video_id = candidate if YOUTUBE_ID.match(candidate) else None
+        else:
+            match = YOUTUBE_PATH_ID.match(path)
+            video_id = match.group(1) if match else None
+    if video_id is None:
+        return None
+    return f"https://youtube.com/watch?v={video_id}"
+
+
+def canonicalize_url(url):
+    """
+    Canonical form of a resource URL, so equivalent links compare equal
+
+    Lower-cases the scheme and host, upgrades http to https, drops ``www.``,
+    default ports, credentials, fragments, trailing slashes and tracking
+    parameters, sorts the remaining query, and maps every YouTube video link
+    (youtu.be, /embed/, /shorts/, watch?v=...) to one watch URL.
+    Returns None for empty input.
+    """
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+    if '://' not in url:
+        url = 'https://' + url.lstrip('/')
+    parts = urlsplit(url)
+
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    host = (parts.hostname or '').rstrip('.')
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port == DEFAULT_PORTS.get(parts.scheme.lower()):
+        port = None
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    youtube = _youtube_url(host, parts.path, query)
+    if youtube is not None:
+        return youtube
+
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    netloc = f"{host}:{port}" if port else host
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ''))
+
+
+def url_hash(url):
+    """
+    Hex SHA-256 of the canonical URL, or None when there is no URL
+    """
+    canonical = canonicalize_url(url)
+    if canonical is None:
+        return None
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def find_duplicates(resources, urls, batch_size=500):
+    """
+    Map each URL to the id of an existing resource with the same canonical URL
+
+    ``resources`` is the caller's owner-scoped queryset. Lookups go through the
+    indexed ``url_hash`` column in batches, so cost grows with the number of
+    URLs checked rather than the number of resources stored.
+    """
+    hashes = {url: url_hash(url) for url in urls}
+    wanted = sorted({value for value in hashes.values() if value})
+    existing = {}
+    for start in range(0, len(wanted), batch_size):
+        rows = resources.filter(url_hash__in=wanted[start:start + batch_size]).order_by('id').values_list('url_hash', 'id')
+        for hash_value, resource_id in rows:
+            existing.setdefault(hash_value, resource_id)
+    return {url: existing.get(hash_value) for url, hash_value in hashes.items()}
@@ -0,0 +1,101 @@
+"""
+Lazy access to the tracker's heavier engines
+
+Views, models and signals reach the recommender, the collaborative
+similarity model (NumPy) and the summarizer through these accessors, so
+importing the app stays cheap and each engine is imported on first use.
+``warmup`` loads them up front for workers that prefer a slower boot to a
+slow first request.
+"""
+import importlib
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by warmup(), heaviest first
+ENGINE_MODULES = ['tracker.collaborative', 'tracker.recommendations', 'tracker.coverage', 'tracker.summarization']
+
+_summarizer = None
+
+
+def similarity_model_dir():
+    return Path(getattr(settings, 'ITEM_SIMILARITY_DIR', settings.BASE_DIR / 'model_store' / 'item_similarity'))
+
+
+def similarity_model_exists(base_dir=None):
+    """
+    Whether a collaborative model has been trained, without importing NumPy
+    """
+    return (Path(base_dir or similarity_model_dir()) / 'CURRENT').exists()
+
+
+def similarity_model():
+    """
+    The current item-similarity model, or None when none has been trained
+    """
+    if not similarity_model_exists():
+        return None
+    from .collaborative import get_model
+    return get_model()
+
+
+def recommender(cache=None):
+    from .recommendations import ResourceRecommender
+    return ResourceRecommender(cache=cache)
+
+
+def recommendation_cache():
+    from .recommendations import recommendation_cache
+    return recommendation_cache
+
+
+def coverage_report(skills):
+    from .coverage import SkillCoverageReport
+    return SkillCoverageReport(skills)
+
+
+def summarizer():
+    """
+    Shared NoteSummarizer; it holds no per-call state
+    """
+    global _summarizer
+    if _summarizer is None:
+        from .summarization import NoteSummarizer
+        _summarizer = NoteSummarizer()
+    return _summarizer
+
+
+def warmup():
+    """
+    Import every engine and load the similarity model; returns seconds per step
+    """
+    timings = {}
+    for module in ENGINE_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        timings[module] = time.perf_counter() - start
+    start = time.perf_counter()
+    similarity_model()
+    summarizer()
+    timings['similarity model'] = time.perf_counter() - start
+    return timings
+
+
+def warmup_if_enabled():
+    """
+    Worker boot hook (wsgi/asgi): warm up when ``TRACKER_WARMUP`` is set
+    """
+    if not getattr(settings, 'TRACKER_WARMUP', False):
+        return None
+    try:
+        timings = warmup()
+    except Exception:
+        # A failed warmup only costs the first request its latency
+        logger.exception("Engine warmup failed")
+        return None
+    logger.info("Engines warmed up in %.3fs", sum(timings.values()))
+    return timings
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import threading
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def compute_dashboard_snapshot(owner_id):
+    """
+    Dashboard figures pushed over the stream: stats plus the skills breakdown
+    """
+    from django.db import close_old_connections
+    from .dashboard import build_stats, build_skills_breakdown
+    close_old_connections()
+    return {
+        'stats': build_stats(owner_id),
+        'skills_breakdown': build_skills_breakdown(owner_id),
+    }
+
+
+def diff_snapshots(old, new):
+    """
+    Smallest delta turning ``old`` into ``new``: changed stats keys, changed or
+    added skill rows and removed skill ids. Returns None when nothing changed.
+    """
+    stats = {key: value for key, value in new['stats'].items() if old['stats'].get(key) != value}
+    old_skills = {row['id']: row for row in old['skills_breakdown']}
+    new_skills = {row['id']: row for row in new['skills_breakdown']}
+    changed_skills = [row for skill_id, row in new_skills.items() if old_skills.get(skill_id) != row]
+    removed_skills = [skill_id for skill_id in old_skills if skill_id not in new_skills]
+    if not stats and not changed_skills and not removed_skills:
+        return None
+    return {'stats': stats, 'skills': changed_skills, 'removed_skills': removed_skills}
+
+
+class DashboardBroker:
+    """
+    In-process fan-out of dashboard updates to server-sent-event streams
+
+    Change notifications may arrive from any thread. They are coalesced per
+    owner: however many arrive within ``coalesce_seconds``, the dashboard is
+    recomputed once and the resulting delta is pushed to every connected
+    stream for that owner.
+    """
+
+    def __init__(self, compute=compute_dashboard_snapshot, coalesce_seconds=None, queue_size=100):
+        self.compute = compute
+        self.coalesce_seconds = (
+            coalesce_seconds if coalesce_seconds is not None
+            else getattr(settings, 'DASHBOARD_STREAM_COALESCE_SECONDS', 0.5)
+        )
+        self.queue_size = queue_size
+        self.loop = None
+        self.subscribers = {}
+        self.snapshots = {}
+        self.pending = set()
+        self.recomputations = 0
+        self._lock = threading.Lock()
+
+    async def subscribe(self, owner_id):
+        """
+        Register a stream; returns its queue and the current snapshot
+        """
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self.subscribers.setdefault(owner_id, set()).add(queue)
+        snapshot = self.snapshots.get(owner_id)
+        if snapshot is None:
+            snapshot = await self._compute(owner_id)
+            self.snapshots[owner_id] = snapshot
+        return queue, snapshot
+
+    def unsubscribe(self, owner_id, queue):
+        with self._lock:
+            queues = self.subscribers.get(owner_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self.subscribers[owner_id]
+                    self.snapshots.pop(owner_id, None)
+
+    def notify_change(self, owner_id):
+        """
+        Thread-safe: mark an owner's dashboard as stale
+        """
+        with self._lock:
+            if owner_id not in self.subscribers or self.loop is None:
+                return
+        self.loop.call_soon_threadsafe(self._schedule, owner_id)
+
+    def _schedule(self, owner_id):
+        if owner_id in self.pending:
+            return
+        self.pending.add(owner_id)
+        self.loop.create_task(self._recompute_later(owner_id))
+
+    async def _recompute_later(self, owner_id):
+        await asyncio.sleep(self.coalesce_seconds)
+        # Changes arriving from here on schedule another pass
+        self.pending.discard(owner_id)
+        if owner_id not in self.subscribers:
+            return
+        snapshot = await self._compute(owner_id)
+        previous = self.snapshots.get(owner_id)
+        self.snapshots[owner_id] = snapshot
+        delta = diff_snapshots(previous, snapshot) if previous is not None else None
+        if delta is None:
+            return
+        with self._lock:
+            queues = list(self.subscribers.get(owner_id, ()))
+        for queue in queues:
+            try:
+                queue.put_nowait(('delta', delta))
+            except asyncio.QueueFull:
+                # A slow client gets a full snapshot once it catches up
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(('snapshot', snapshot))
+
+    async def _compute(self, owner_id):
+        self.recomputations += 1
+        return await sync_to_async(self.compute, thread_sensitive=False)(owner_id)
+
+
+broker = DashboardBroker()
+
+
+def format_event(event, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"event: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+
+def _session_user_id(session_key):
+    from django.contrib.auth import SESSION_KEY
+    session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    user_id = session.get(SESSION_KEY)
+    return int(user_id) if user_id is not None else None
+
+
+async def resolve_owner_id(scope):
+    """
+    Owner of the stream from the Django session cookie, or None without a valid session
+    """
+    cookies = SimpleCookie()
+    for name, value in scope.get('headers', []):
+        if name == b'cookie':
+            cookies.load(value.decode('latin-1'))
+    morsel = cookies.get(settings.SESSION_COOKIE_NAME)
+    if morsel is None:
+        return None
+    return await sync_to_async(_session_user_id)(morsel.value)
+
+
+def cors_headers(scope):
+    """
+    CORS response headers for the request's Origin, following the
+    django-cors-headers settings the rest of the API is served with
+    """
+    origin = next((value for name, value in scope.get('headers', []) if name == b'origin'), None)
+    if origin is None:
+        return []
+    allowed = getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False) or (
+        origin.decode('latin-1') in getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+    )
+    if not allowed:
+        return []
+    headers = [(b'access-control-allow-origin', origin), (b'vary', b'origin')]
+    if getattr(settings, 'CORS_ALLOW_CREDENTIALS', False):
+        headers.append((b'access-control-allow-credentials', b'true'))
+    return headers
+
+
+def make_sse_app(broker, heartbeat_seconds=15):
+    """
+    Raw ASGI application streaming dashboard snapshots and deltas as SSE
+
+    It runs outside Django's middleware, so it answers CORS itself and
+    rejects requests without a logged-in session with 401.
+    """
+
+    async def sse_app(scope, receive, send):
+        owner_id = await resolve_owner_id(scope)
+        if owner_id is None:
+            await send({
+                'type': 'http.response.start',
+                'status': 401,
+                'headers': [(b'content-type', b'application/json')] + cors_headers(scope),
+            })
+            await send({'type': 'http.response.body', 'body': b'{"detail":"Authentication credentials were not provided."}'})
+            return
+
+        queue, snapshot = await broker.subscribe(owner_id)
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    disconnected.set()
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ] + cors_headers(scope),
+            })
+            await send({'type': 'http.response.body', 'body': format_event('snapshot', snapshot), 'more_body': True})
+            while not disconnected.is_set():
+                getter = asyncio.create_task(queue.get())
+                stopper = asyncio.create_task(disconnected.wait())
+                done, _ = await asyncio.wait({getter, stopper}, timeout=heartbeat_seconds,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                stopper.cancel()
+                if getter in done:
+                    event, data = getter.result()
+                    body = format_event(event, data)
+                else:
+                    getter.cancel()
+                    if disconnected.is_set():
+                        break
+                    body = b": keepalive\n\n"
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        finally:
+            watcher.cancel()
+            broker.unsubscribe(owner_id, queue)
+
+    return sse_app
+
+
+sse_app = make_sse_app(broker)
@@ -0,0 +1,222 @@
+import hashlib
+import inspect
+import json
+import logging
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Registered task callables keyed by job kind
+TASKS = {}
+
+
+def task(kind):
+    """
+    Register a function as the handler for jobs of the given kind
+
+    Handlers are called with the job owner's ``user_id`` plus the job payload
+    as keyword arguments and must return a JSON-serializable result.
+    """
+    def decorator(func):
+        TASKS[kind] = func
+        return func
+    return decorator
+
+
+def make_dedup_key(kind, payload, user_id):
+    raw = json.dumps([kind, user_id, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def validate_payload(kind, payload):
+    """
+    Raise ValueError unless ``payload`` matches the arguments of the task
+
+    ``user_id`` is always supplied from the job owner and cannot be set in
+    the payload.
+    """
+    if kind not in TASKS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if 'user_id' in payload:
+        raise ValueError("Payload cannot set user_id")
+    try:
+        inspect.signature(TASKS[kind]).bind(user_id=None, **payload)
+    except TypeError as exc:
+        raise ValueError(f"Invalid payload for {kind}: {exc}") from exc
+
+
+def enqueue(kind, payload=None, user=None, max_attempts=3):
+    """
+    Queue a job, reusing an identical job that is still pending
+
+    Returns ``(job, created)``. Raises ValueError for an unknown kind or a
+    payload the task does not accept.
+    """
+    payload = payload or {}
+    validate_payload(kind, payload)
+    user_id = getattr(user, 'pk', user)
+    dedup_key = make_dedup_key(kind, payload, user_id)
+
+    with transaction.atomic():
+        existing = Job.objects.filter(dedup_key=dedup_key, status='pending').order_by('id').first()
+        if existing is not None:
+            return existing, False
+        job = Job.objects.create(
+            user_id=user_id,
+            kind=kind,
+            payload=payload,
+            dedup_key=dedup_key,
+            max_attempts=max_attempts,
+        )
+    return job, True
+
+
+def claim_job():
+    """
+    Atomically move the oldest runnable job to ``running`` and return it
+
+    Runnable jobs are pending ones that are due, and running ones whose
+    worker has held them longer than ``JOB_LEASE_SECONDS`` (it presumably
+    died); those are retried, or failed once out of attempts. The claim is a
+    conditional UPDATE, so concurrent workers never run the same job twice
+    even without row locks (SQLite).
+    """
+    lease = timedelta(seconds=getattr(settings, 'JOB_LEASE_SECONDS', 600))
+    while True:
+        now = timezone.now()
+        candidate = (
+            Job.objects.filter(
+                Q(status='pending', run_after__lte=now) | Q(status='running', started_at__lt=now - lease)
+            )
+            .order_by('run_after', 'id')
+            .values_list('id', 'status', 'started_at', 'attempts', 'max_attempts')
+            .first()
+        )
+        if candidate is None:
+            return None
+        job_id, job_status, started_at, attempts, max_attempts = candidate
+        # Matching the state read above makes the claim lose to any concurrent claim
+        unchanged = Job.objects.filter(id=job_id, status=job_status, started_at=started_at)
+        if job_status == 'running':
+            logger.warning("Job %s lease expired after attempt %s", job_id, attempts)
+            if attempts >= max_attempts:
+                unchanged.update(status='failed', error="Worker lease expired", finished_at=now, updated_at=now)
+                continue
+        claimed = unchanged.update(
+            status='running',
+            attempts=F('attempts') + 1,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+
+
+def run_job(job):
+    """
+    Execute a claimed job and record its outcome, scheduling a retry with
+    exponential backoff when attempts remain
+    """
+    try:
+        result = TASKS[job.kind](user_id=job.user_id, **job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.kind, job.attempts)
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = 'pending'
+            job.run_after = timezone.now() + timedelta(seconds=2 ** job.attempts)
+        else:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'run_after', 'finished_at', 'updated_at'])
+        return job
+
+    job.status = 'succeeded'
+    job.result = result
+    job.error = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at', 'updated_at'])
+    return job
+
+
+def work(max_jobs=None, poll_interval=1.0, stop_when_idle=False):
+    """
+    Worker loop: claim and run jobs until ``max_jobs`` have run, or until the
+    queue is empty when ``stop_when_idle`` is set. Returns the number of jobs run.
+    """
+    processed = 0
+    try:
+        while max_jobs is None or processed < max_jobs:
+            close_old_connections()
+            job = claim_job()
+            if job is None:
+                if stop_when_idle:
+                    break
+                time.sleep(poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+    finally:
+        close_old_connections()
+    return processed
+
+
+def init_worker_process():
+    """
+    Process pool initializer; spawned workers need their own Django setup
+    """
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+@task('weekly_summary')
+def weekly_summary_task(user_id=None):
+    from .models import Progress
+    from .summarization import NoteSummarizer
+    week_ago = timezone.now() - timedelta(days=7)
+    progress_items = Progress.objects.owned_by(user_id).filter(
+        updated_at__gte=week_ago
+    ).select_related('resource')
+    return {'summary': NoteSummarizer().generate_weekly_summary(progress_items)}
+
+
+@task('recommendations')
+def recommendations_task(user_id=None, limit=5):
+    from .recommendations import ResourceRecommender
+    recommender = ResourceRecommender()
+    return {
+        'skills': [skill.id for skill in recommender.recommend_skills(user_id=user_id, limit=limit)],
+        'resources': [resource.id for resource in recommender.recommend_resources(user_id=user_id, limit=limit)],
+    }
+
+
+@task('progress_summary')
+def progress_summary_task(progress_id, user_id=None):
+    from .models import Progress
+    progress = Progress.objects.owned_by(user_id).get(pk=progress_id)
+    return {
+        'summary': progress.get_summary(),
+        'key_points': progress.get_key_points(),
+    }
+
+
+@task('update_item_similarity')
+def update_item_similarity_task(user_id=None):
+    from .collaborative import ItemSimilarityTrainer, get_model, save_model
+    model = get_model()
+    trainer = ItemSimilarityTrainer(top_k=model.meta['top_k']) if model else ItemSimilarityTrainer()
+    trained = trainer.update(model) if model else trainer.train()
+    if trained is None:
+        return {'updated': False}
+    arrays, meta = trained
+    save_model(arrays, meta)
+    return {'updated': True, 'items': meta['items'], 'pairs': meta['pairs']}
@@ -0,0 +1,293 @@
+"""
+Asyncio load generator for a running tracker API
+
+Every virtual user keeps one HTTP/1.1 keep-alive connection (a minimal
+client on ``asyncio.open_connection``) and picks requests from a weighted
+mix until the stage ends. Only the standard library is used.
+"""
+import asyncio
+import base64
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+# name: (method, path); {id} is replaced by a resource id found at startup
+ENDPOINTS = {
+    'resources': ('GET', '/api/resources/'),
+    'skills': ('GET', '/api/skills/'),
+    'progress': ('GET', '/api/progress/'),
+    'dashboard': ('GET', '/api/dashboard/stats/'),
+    'skills_breakdown': ('GET', '/api/dashboard/skills_breakdown/'),
+    'recommendations': ('GET', '/api/dashboard/recommendations/'),
+    'start_learning': ('POST', '/api/resources/{id}/start_learning/'),
+    'mark_complete': ('POST', '/api/resources/{id}/mark_complete/'),
+}
+
+DEFAULT_MIX = {
+    'resources': 25,
+    'skills': 10,
+    'progress': 10,
+    'dashboard': 20,
+    'skills_breakdown': 10,
+    'recommendations': 10,
+    'start_learning': 8,
+    'mark_complete': 7,
+}
+
+
+def parse_mix(text):
+    """
+    Parse ``"resources=3,dashboard=1"`` into a weight per endpoint
+    """
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = item.partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight) if weight else 1.0
+    if not mix or not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The request mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class HTTPConnection:
+    """
+    One keep-alive HTTP/1.1 connection; reconnects when the server closes it
+    """
+
+    def __init__(self, base_url, headers=None, timeout=30):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError("Only http:// servers are supported")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.host_header = parts.netloc
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        """
+        Send one request and return ``(status, body_bytes)``
+        """
+        reused = self.writer is not None
+        if not reused:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            return await asyncio.wait_for(self._roundtrip(method, path, body), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a new one
+            return await self.request(method, path, body)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _roundtrip(self, method, path, body):
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host_header}', 'Accept: application/json',
+                 f'Content-Length: {len(payload)}']
+        if body is not None:
+            lines.append('Content-Type: application/json')
+        lines.extend(f'{name}: {value}' for name, value in self.headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        version, status = status_line.split()[:2]
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            content = await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            content = await self._read_chunked()
+        else:
+            content = await self.reader.read()
+            headers['connection'] = 'close'
+        if headers.get('connection', '').lower() == 'close' or version == b'HTTP/1.0':
+            await self.close()
+        return int(status), content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Skip trailers up to the blank line
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+    async def close(self):
+        writer, self.reader, self.writer = self.writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+def auth_headers(username=None, password=None):
+    if not username:
+        return {}
+    token = base64.b64encode(f'{username}:{password or ""}'.encode('utf-8')).decode('ascii')
+    return {'Authorization': f'Basic {token}'}
+
+
+async def discover_resource_ids(base_url, headers=None, max_pages=5):
+    """
+    Resource ids visible to the load-test user, for the write endpoints
+    """
+    connection = HTTPConnection(base_url, headers)
+    ids = []
+    try:
+        for page in range(1, max_pages + 1):
+            status, content = await connection.request('GET', f'/api/resources/?page={page}')
+            if status != 200:
+                break
+            data = json.loads(content)
+            results = data.get('results', []) if isinstance(data, dict) else data
+            ids.extend(item['id'] for item in results)
+            if not isinstance(data, dict) or not data.get('next'):
+                break
+    finally:
+        await connection.close()
+    return ids
+
+
+class StageResult:
+    """
+    Latencies (seconds) and errors of one load stage, per endpoint
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.elapsed = 0.0
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name, latency, status):
+        self.latencies[name].append(latency)
+        self.statuses[name][status] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[name] += 1
+
+    def summary(self):
+        """
+        ``{endpoint: figures}`` plus an ``'all'`` row; latencies in milliseconds
+        """
+        rows = {}
+        names = sorted(self.latencies)
+        for name, latencies in [(name, self.latencies[name]) for name in names] + [
+            ('all', [latency for name in names for latency in self.latencies[name]])
+        ]:
+            errors = sum(self.errors.values()) if name == 'all' else self.errors[name]
+            ordered = sorted(latencies)
+            rows[name] = {
+                'requests': len(ordered),
+                'errors': errors,
+                'error_rate': errors / len(ordered) if ordered else 0.0,
+                'throughput': len(ordered) / self.elapsed if self.elapsed else 0.0,
+                **{f'p{pct}': percentile(ordered, pct) * 1000 if ordered else None for pct in (50, 95, 99)},
+            }
+        return rows
+
+
+async def run_stage(base_url, concurrency, duration, mix, resource_ids=(), headers=None, seed=None, max_requests=None):
+    """
+    Drive ``concurrency`` virtual users for ``duration`` seconds (or until
+    ``max_requests`` have been sent) and return a StageResult
+    """
+    if not resource_ids:
+        mix = {name: weight for name, weight in mix.items() if '{id}' not in ENDPOINTS[name][1]}
+    if not mix:
+        raise ValueError("No endpoint left in the mix (write endpoints need existing resources)")
+    names, weights = list(mix), list(mix.values())
+    result = StageResult(concurrency)
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration
+    budget = [max_requests]
+
+    async def user():
+        connection = HTTPConnection(base_url, headers)
+        try:
+            while time.perf_counter() < deadline:
+                if budget[0] is not None:
+                    if budget[0] <= 0:
+                        break
+                    budget[0] -= 1
+                name = rng.choices(names, weights)[0]
+                method, path = ENDPOINTS[name]
+                if '{id}' in path:
+                    path = path.format(id=rng.choice(resource_ids))
+                start = time.perf_counter()
+                try:
+                    status, _ = await connection.request(method, path, {} if method == 'POST' else None)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+                    status = type(exc).__name__
+                result.record(name, time.perf_counter() - start, status)
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def meets_slo(result, slo_ms, pct=95, max_error_rate=0.01):
+    overall = result.summary()['all']
+    return (
+        overall['requests'] > 0
+        and overall[f'p{pct}'] <= slo_ms
+        and overall['error_rate'] <= max_error_rate
+    )
+
+
+async def ramp(base_url, start, max_concurrency, duration, mix, slo_ms, pct=95, max_error_rate=0.01,
+               factor=2, on_stage=None, **kwargs):
+    """
+    Multiply concurrency by ``factor`` each stage until the p``pct`` latency
+    or the error rate breaks the SLO. Returns ``(stages, best)`` where ``best``
+    is the last stage within the SLO, or None.
+    """
+    stages, best = [], None
+    concurrency = start
+    while concurrency <= max_concurrency:
+        result = await run_stage(base_url, concurrency, duration, mix, **kwargs)
+        stages.append(result)
+        within = meets_slo(result, slo_ms, pct, max_error_rate)
+        if on_stage is not None:
+            on_stage(result, within)
+        if not within:
+            break
+        best = result
+        concurrency = max(concurrency + 1, int(concurrency * factor))
+    return stages, best
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from tracker.events import broker
+from tracker.models import (
+    Certification, DailyActivity, NoteTerm, Progress, ProgressEvent, Resource, Skill, Tombstone
+)
+
+# Weekly reports keep their unowned scope key (regenerate them instead) and
+# unowned jobs are system jobs, so neither is reassigned
+OWNED_MODELS = [Skill, Resource, Progress, Certification, DailyActivity, ProgressEvent, NoteTerm, Tombstone]
+
+class Command(BaseCommand):
+    help = ('Assign tracker rows created before user scoping (user=NULL) to one user. '
+            'Run once after migrating so the owner sees their existing data')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='User who takes ownership of the unowned rows')
+        parser.add_argument('--dry-run', action='store_true', help='Report the row counts without changing anything')
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['username']}'")
+
+        now = timezone.now()
+        total = 0
+        with transaction.atomic():
+            for model in OWNED_MODELS:
+                unowned = model.objects.owned_by(None)
+                if options['dry_run']:
+                    count = unowned.count()
+                else:
+                    changes = {'user': owner}
+                    # Bumped so /api/changes/ clients pick the rows up
+                    if any(field.name == 'updated_at' for field in model._meta.fields):
+                        changes['updated_at'] = now
+                    count = unowned.update(**changes)
+                total += count
+                self.stdout.write(f"{model._meta.verbose_name_plural}: {count}")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{total} unowned row(s) would be assigned to {owner.username}'))
+            return
+        broker.notify_change(owner.pk)
+        self.stdout.write(self.style.SUCCESS(f'Assigned {total} row(s) to {owner.username}'))
@@ -0,0 +1,81 @@
+import re
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand
+from tracker.notes import compress_notes, iter_decompressed
+from tracker.summarization import NoteSummarizer
+
+PARAGRAPH = (
+    "Ownership rules decide which binding frees a value. Borrowing lends access without moving it! "
+    "Lifetimes tie references to the data they point at? Most of the time the compiler infers them.\n"
+)
+BULLET = "- Prefer slices over owned vectors in function arguments\n"
+
+
+def legacy_split_into_sentences(text):
+    sentences = re.split(r'[.!?]+', text)
+    return [s.strip() for s in sentences if s.strip()]
+
+
+def legacy_summarize_notes(notes, max_sentences=3):
+    sentences = legacy_split_into_sentences(notes)
+    if len(sentences) <= max_sentences:
+        return notes
+    return ". ".join(sentences[:max_sentences]) + "."
+
+
+def legacy_extract_key_points(notes, max_points=5):
+    lines = [line.strip() for line in notes.split('\n') if line.strip()]
+    key_points = []
+    for line in lines:
+        if line.startswith(('-', '*', '•', '1', '2', '3', '4', '5', '6', '7', '8', '9')):
+            key_points.append(line.lstrip('-*•0123456789 .'))
+        elif ':' in line and len(line) < 100:
+            key_points.append(line)
+    return key_points[:max_points] if key_points else lines[:max_points]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark memory and throughput of note summarization and key-point extraction on large notes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=float, default=10, help='Size of the generated notes in MB (default: 10)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (best is reported)')
+
+    def handle(self, *args, **options):
+        size = int(options['size_mb'] * 1024 * 1024)
+        prose = (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+        # Worst case for key points: the only bullets sit at the very end
+        late_bullets = prose[:size - len(BULLET) * 5] + BULLET * 5
+        codec, data, _ = compress_notes(late_bullets)
+        summarizer = NoteSummarizer()
+
+        cases = [
+            ('summary', 'legacy', lambda: legacy_summarize_notes(prose)),
+            ('summary', 'streaming', lambda: summarizer.summarize_notes(prose)),
+            ('key points, prose', 'legacy', lambda: legacy_extract_key_points(prose)),
+            ('key points, prose', 'streaming', lambda: summarizer.extract_key_points(prose)),
+            ('key points, late', 'legacy', lambda: legacy_extract_key_points(late_bullets)),
+            ('key points, late', 'streaming', lambda: summarizer.extract_key_points(late_bullets)),
+            ('key points, late', 'from blob', lambda: summarizer.extract_key_points(iter_decompressed(data, codec))),
+        ]
+
+        self.stdout.write(f"Notes: {size / 1024 / 1024:.1f} MB ({len(data) / 1024:.0f} KB compressed with {codec})")
+        self.stdout.write(f"{'case':<20} {'variant':<10} {'ms':>9} {'MB/s':>9} {'peak KB':>10}")
+        for name, variant, run in cases:
+            best = None
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            throughput = size / 1024 / 1024 / best if best else float('inf')
+            self.stdout.write(f"{name:<20} {variant:<10} {best * 1000:>9.2f} {throughput:>9.1f} {peak / 1024:>10.0f}")
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished'))
@@ -0,0 +1,86 @@
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from tracker.models import Skill, Resource, Progress, Certification
+from tracker.renderers import FastJSONRenderer, orjson
+from tracker.serializers import ResourceListSerializer, CertificationSerializer
+
+class Command(BaseCommand):
+    help = 'Benchmark JSON rendering time and bytes on the wire for large list responses (seeded data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per rendered list (default: 1000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed renders per renderer')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        renderers = {'stdlib json': JSONRenderer()}
+        if orjson is not None:
+            renderers['orjson'] = FastJSONRenderer()
+        else:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer falls back to stdlib'))
+
+        self.stdout.write(
+            f"{'payload':<16} {'renderer':<12} {'ms/1k rows':>11} {'p95 ms':>9} {'bytes':>10} {'gzip bytes':>11}"
+        )
+        with transaction.atomic():
+            self._seed(rows)
+            payloads = {
+                'resources': ResourceListSerializer(
+                    Resource.objects.select_related('skill', 'progress')[:rows], many=True
+                ).data,
+                'certifications': CertificationSerializer(
+                    Certification.objects.prefetch_related('skills')[:rows], many=True
+                ).data,
+            }
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+        for payload_name, data in payloads.items():
+            per_thousand = 1000 / max(1, len(data))
+            for renderer_name, renderer in renderers.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    body = renderer.render(data, 'application/json', {})
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                self.stdout.write(
+                    f"{payload_name:<16} {renderer_name:<12} {statistics.median(timings) * per_thousand:>11.2f} "
+                    f"{p95:>9.2f} {len(body):>10} {len(compress_string(body)):>11}"
+                )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; seeded data rolled back'))
+
+    def _seed(self, rows):
+        skills = Skill.objects.bulk_create([
+            Skill(name=f'Bench skill {i}', target_hours=Decimal('12.50')) for i in range(max(1, rows // 20))
+        ])
+        resources = Resource.objects.bulk_create([
+            Resource(skill=skills[i % len(skills)], title=f'Bench resource {i}', resource_type='course',
+                     platform='udemy', url=f'https://udemy.com/course/bench-{i}',
+                     description='A reasonably long description of what this course covers. ' * 3)
+            for i in range(rows)
+        ])
+        Progress.objects.bulk_create([
+            Progress(resource=resource, status='in_progress', hours_spent=Decimal('3.25'))
+            for resource in resources
+        ])
+        certifications = Certification.objects.bulk_create([
+            Certification(name=f'Bench certification {i}', issuing_organization='Bench Org',
+                          issue_date=date.today() - timedelta(days=i % 700),
+                          expiration_date=date.today() + timedelta(days=365 - i % 700),
+                          credential_id=f'CERT-{i:06d}', credential_url=f'https://example.com/cert/{i}')
+            for i in range(rows)
+        ])
+        links = Certification.skills.through
+        links.objects.bulk_create([
+            links(certification_id=certification.id, skill_id=skills[i % len(skills)].id)
+            for i, certification in enumerate(certifications)
+        ])
@@ -0,0 +1,74 @@
+import statistics
+import time
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from tracker.analytics_db import primary_reads
+from tracker.models import Skill, Resource, Progress
+from tracker.views import DashboardViewSet, ResourceViewSet
+
+class Command(BaseCommand):
+    help = 'Benchmark per-user endpoint latency as the number of users grows (seeded data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-counts', default='1,10,100,1000',
+                            help='Comma-separated user counts to benchmark (default: 1,10,100,1000)')
+        parser.add_argument('--skills', type=int, default=5, help='Skills per user')
+        parser.add_argument('--resources', type=int, default=4, help='Resources per skill')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per endpoint')
+
+    def handle(self, *args, **options):
+        user_counts = [int(count) for count in options['user_counts'].split(',')]
+        endpoints = {
+            'dashboard/stats': DashboardViewSet.as_view({'get': 'stats'}),
+            'dashboard/skills_breakdown': DashboardViewSet.as_view({'get': 'skills_breakdown'}),
+            'resources (list)': ResourceViewSet.as_view({'get': 'list'}),
+        }
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{'users':>8}  {'endpoint':<28} {'median ms':>10} {'p95 ms':>10}")
+        # The seeded rows are uncommitted, so the analytics snapshot cannot see them
+        with transaction.atomic(), primary_reads():
+            seeded = 0
+            for user_count in sorted(user_counts):
+                self._seed(seeded, user_count, options['skills'], options['resources'])
+                seeded = user_count
+                probe_user = User.objects.filter(username='bench-user-0').get()
+
+                for name, view in endpoints.items():
+                    timings = []
+                    for _ in range(options['repeat']):
+                        request = factory.get('/', HTTP_HOST='localhost')
+                        force_authenticate(request, probe_user)
+                        start = time.perf_counter()
+                        view(request).render()
+                        timings.append((time.perf_counter() - start) * 1000)
+                    timings.sort()
+                    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                    self.stdout.write(f"{user_count:>8}  {name:<28} {statistics.median(timings):>10.2f} {p95:>10.2f}")
+
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; seeded data rolled back'))
+
+    def _seed(self, start, stop, skills_per_user, resources_per_skill):
+        users = User.objects.bulk_create(
+            [User(username=f'bench-user-{i}') for i in range(start, stop)]
+        )
+        skills = Skill.objects.bulk_create([
+            Skill(user=user, name=f'Skill {i}', target_hours=Decimal('10'))
+            for user in users for i in range(skills_per_user)
+        ])
+        resources = Resource.objects.bulk_create([
+            Resource(user_id=skill.user_id, skill=skill, title=f'{skill.name} resource {i}',
+                     resource_type='course', platform='udemy')
+            for skill in skills for i in range(resources_per_skill)
+        ])
+        Progress.objects.bulk_create([
+            Progress(user_id=resource.user_id, resource=resource,
+                     status='completed' if i % 2 else 'in_progress', hours_spent=Decimal('2'))
+            for i, resource in enumerate(resources)
+        ])
@@ -1,13 +1,90 @@
-from django.core.management.base import BaseCommand
-from tracker.weekly_summary import WeeklySummaryGenerator
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from tracker.jobs import init_worker_process
+from tracker.models import Progress, Skill, WeeklyReport
+from tracker.weekly_summary import build_report_fields, _build_report_fields_star, scope_key, week_starts
+
+UPDATE_FIELDS = ['user', 'skill', 'scope', 'week_end', 'summary', 'stats', 'generated_at']
 
 class Command(BaseCommand):
-    help = 'Generate and display weekly learning summary'
+    help = 'Generate and store weekly learning reports for every user or skill over a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day of the range (YYYY-MM-DD, default: today)')
+        parser.add_argument('--until', help='Last day of the range (YYYY-MM-DD, default: today)')
+        parser.add_argument('--by', choices=['user', 'skill'], default='user',
+                            help='Generate one report per user or per skill (default: user)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes used to build reports (default: 1, in-process)')
+        parser.add_argument('--only-missing', action='store_true',
+                            help='Skip weeks that already have a stored report')
+        parser.add_argument('--batch-size', type=int, default=500, help='Reports written per database batch')
 
     def handle(self, *args, **options):
-        generator = WeeklySummaryGenerator()
-        summary = generator.print_weekly_summary()
-        
+        today = timezone.now().date()
+        since = self._parse_date(options['since'], '--since') or today
+        until = self._parse_date(options['until'], '--until') or today
+        if since > until:
+            raise CommandError('--since must not be after --until')
+
+        scope = options['by']
+        weeks = week_starts(since, until)
+        if scope == 'skill':
+            scope_ids = list(Skill.objects.order_by('id').values_list('id', flat=True))
+        else:
+            scope_ids = list(Progress.objects.order_by('user_id').values_list('user_id', flat=True).distinct())
+
+        tasks = [(scope, scope_id, week) for scope_id in scope_ids for week in weeks]
+        if options['only_missing']:
+            existing = set(
+                WeeklyReport.objects.filter(scope=scope, week_start__in=weeks).values_list('scope_key', 'week_start')
+            )
+            tasks = [task for task in tasks if (scope_key(task[0], task[1]), task[2]) not in existing]
+
+        self.stdout.write(f"Generating {len(tasks)} {scope} report(s) for {len(weeks)} week(s)")
+        written = 0
+        batch = []
+        for fields in self._build(tasks, options['workers']):
+            batch.append(WeeklyReport(**fields))
+            if len(batch) >= options['batch_size']:
+                written += self._save(batch)
+                batch = []
+        written += self._save(batch)
+
         self.stdout.write(
-            self.style.SUCCESS('Successfully generated weekly summary')
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'Successfully stored {written} weekly report(s)')
+        )
+
+    def _build(self, tasks, workers):
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield build_report_fields(*task)
+            return
+
+        # Child processes open their own connections
+        connections.close_all()
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_process) as executor:
+            yield from executor.map(_build_report_fields_star, tasks, chunksize=chunksize)
+
+    def _save(self, reports):
+        if not reports:
+            return 0
+        WeeklyReport.objects.bulk_create(
+            reports,
+            update_conflicts=True,
+            unique_fields=['scope_key', 'week_start'],
+            update_fields=UPDATE_FIELDS,
+        )
+        return len(reports)
+
+    def _parse_date(self, value, option):
+        if value is None:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise CommandError(f'{option} must be a date in YYYY-MM-DD format')
+        return parsed
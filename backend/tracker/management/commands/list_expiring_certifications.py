@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+from tracker.models import Certification, Skill
+
+class Command(BaseCommand):
+    help = 'List certifications expiring within the next N days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Look-ahead window in days (default: 30)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        days = options['days']
+        # Range scan on the expiration_date index; skills are prefetched per chunk
+        certifications = Certification.objects.expiring(days).prefetch_related(
+            Prefetch('skills', queryset=Skill.objects.only('id', 'name'))
+        ).only('id', 'name', 'issuing_organization', 'expiration_date')
+
+        count = 0
+        for certification in certifications.iterator(chunk_size=options['chunk_size']):
+            skills = ", ".join(skill.name for skill in certification.skills.all())
+            self.stdout.write(
+                f"{certification.expiration_date}  {certification.name} "
+                f"({certification.issuing_organization})" + (f" [{skills}]" if skills else "")
+            )
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{count} certification(s) expiring in the next {days} days')
+        )
@@ -0,0 +1,83 @@
+import asyncio
+from django.core.management.base import BaseCommand, CommandError
+from tracker.loadtest import DEFAULT_MIX, ENDPOINTS, auth_headers, discover_resource_ids, parse_mix, ramp, run_stage
+
+class Command(BaseCommand):
+    help = ('Load-test a running tracker API with a weighted request mix and report throughput, '
+            'p50/p95/p99 latency and error rates per endpoint. Write endpoints change data: '
+            'point it at a development server')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL (default: http://127.0.0.1:8000)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent virtual users (default: 10)')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per stage (default: 10)')
+        parser.add_argument('--mix', help='Weighted endpoints, e.g. "resources=3,dashboard=2,mark_complete=1" '
+                                          f'(default: {",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())})')
+        parser.add_argument('--username', help='Authenticate with HTTP basic auth as this user')
+        parser.add_argument('--password', default='', help='Password for --username')
+        parser.add_argument('--seed', type=int, help='Random seed for the request sequence')
+        parser.add_argument('--ramp', action='store_true', help='Double concurrency each stage until the SLO breaks')
+        parser.add_argument('--max-concurrency', type=int, default=512, help='Upper bound while ramping (default: 512)')
+        parser.add_argument('--slo-ms', type=float, default=250, help='Latency SLO in ms while ramping (default: 250)')
+        parser.add_argument('--slo-percentile', type=int, choices=[50, 95, 99], default=95,
+                            help='Percentile the SLO applies to (default: 95)')
+        parser.add_argument('--max-error-rate', type=float, default=0.01, help='Error rate that breaks the SLO (default: 0.01)')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix']) if options['mix'] else dict(DEFAULT_MIX)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+        headers = auth_headers(options['username'], options['password'])
+        try:
+            asyncio.run(self.run(options, mix, headers))
+        except OSError as exc:
+            raise CommandError(f"Cannot reach {options['url']}: {exc}")
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+    async def run(self, options, mix, headers):
+        resource_ids = await discover_resource_ids(options['url'], headers)
+        if not resource_ids and any('{id}' in ENDPOINTS[name][1] for name in mix):
+            self.stdout.write(self.style.WARNING('No resources found; write endpoints are left out of the mix'))
+        kwargs = {'resource_ids': resource_ids, 'headers': headers, 'seed': options['seed']}
+
+        if not options['ramp']:
+            result = await run_stage(options['url'], options['concurrency'], options['duration'], mix, **kwargs)
+            self.report(result)
+            return
+
+        def on_stage(result, within):
+            self.report(result)
+            verdict = self.style.SUCCESS('within SLO') if within else self.style.ERROR('SLO broken')
+            self.stdout.write(f"{verdict}\n")
+
+        stages, best = await ramp(
+            options['url'], options['concurrency'], options['max_concurrency'], options['duration'], mix,
+            options['slo_ms'], pct=options['slo_percentile'], max_error_rate=options['max_error_rate'],
+            on_stage=on_stage, **kwargs,
+        )
+        target = f"p{options['slo_percentile']} <= {options['slo_ms']:g} ms"
+        if best is None:
+            self.stdout.write(self.style.ERROR(f"Even {options['concurrency']} concurrent users break {target}"))
+            return
+        overall = best.summary()['all']
+        self.stdout.write(self.style.SUCCESS(
+            f"Highest concurrency within {target}: {best.concurrency} "
+            f"({overall['throughput']:.1f} req/s)"
+        ))
+
+    def report(self, result):
+        self.stdout.write(f"Concurrency {result.concurrency}, {result.elapsed:.1f}s")
+        self.stdout.write(
+            f"{'endpoint':<18} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for name, row in result.summary().items():
+            latencies = ' '.join(
+                f"{row[key]:>8.1f}" if row[key] is not None else f"{'-':>8}" for key in ('p50', 'p95', 'p99')
+            )
+            self.stdout.write(
+                f"{name:<18} {row['requests']:>9} {row['throughput']:>8.1f} {latencies} {row['error_rate']:>7.1%}"
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from tracker.changes import prune_tombstones
+
+class Command(BaseCommand):
+    help = 'Delete changes-feed tombstones older than TOMBSTONE_RETENTION_DAYS'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(f'Pruned {deleted} tombstone(s)')
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from tracker.activity import rebuild_activity
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily activity rollup from existing progress'
+
+    def handle(self, *args, **options):
+        rows = rebuild_activity()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {rows} daily activity row(s)')
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from tracker.note_search import rebuild_note_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the inverted keyword index over progress notes'
+
+    def handle(self, *args, **options):
+        rows = rebuild_note_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {rows} note term(s)')
+        )
@@ -0,0 +1,31 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from tracker.analytics_db import refresh_snapshot
+
+class Command(BaseCommand):
+    help = 'Copy the primary database into the read-only analytics snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float,
+                            help='Keep refreshing every this many seconds instead of refreshing once')
+        parser.add_argument('--pages', type=int, default=1024, help='Pages copied per backup step (default: 1024)')
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        if interval is not None and interval >= settings.ANALYTICS_MAX_STALENESS_SECONDS:
+            self.stderr.write(self.style.WARNING(
+                f'An interval of {interval:g}s lets the snapshot go stale '
+                f'(ANALYTICS_MAX_STALENESS_SECONDS={settings.ANALYTICS_MAX_STALENESS_SECONDS})'
+            ))
+        while True:
+            try:
+                size, seconds = refresh_snapshot(pages=options['pages'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(
+                self.style.SUCCESS(f'Analytics snapshot refreshed: {size / 1024:.0f} KB in {seconds:.3f}s')
+            )
+            if interval is None:
+                break
+            time.sleep(interval)
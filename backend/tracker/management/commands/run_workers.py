@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from tracker.changes import prune_tombstones
+from tracker.jobs import init_worker_process, work
+
+class Command(BaseCommand):
+    help = 'Run background job workers for queued tracker jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Number of concurrent workers (default: 2)')
+        parser.add_argument('--mode', choices=['thread', 'process'], default='thread',
+                            help='Run workers in a thread pool or a process pool (default: thread)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit instead of polling forever')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        kwargs = {
+            'poll_interval': options['poll_interval'],
+            'stop_when_idle': options['once'],
+        }
+
+        # Tombstones past retention are swept on every worker start
+        pruned = prune_tombstones()
+        if pruned:
+            self.stdout.write(f"Pruned {pruned} expired tombstone(s)")
+
+        if options['mode'] == 'process':
+            # Connections must not be shared with child processes
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker_process)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tracker-worker')
+
+        self.stdout.write(f"Starting {workers} {options['mode']} worker(s)")
+        with executor:
+            futures = [executor.submit(work, **kwargs) for _ in range(workers)]
+            processed = sum(future.result() for future in futures)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Workers stopped after running {processed} job(s)')
+        )
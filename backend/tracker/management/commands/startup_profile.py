@@ -0,0 +1,82 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: Django setup, system checks, then one request
+PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillstack.settings')
+import django
+django.setup()
+from tracker.engines import warmup_if_enabled
+warmup_if_enabled()
+from django.core.management import call_command
+call_command('check', verbosity=0)
+checked = time.perf_counter()
+from django.test import Client
+response = Client(HTTP_HOST='localhost', raise_request_exception=False).get(sys.argv[1])
+done = time.perf_counter()
+print(json.dumps({
+    'setup_and_check': checked - start,
+    'first_request': done - checked,
+    'status': response.status_code,
+    'numpy_loaded': 'numpy' in sys.modules,
+}))
+"""
+
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)$')
+
+class Command(BaseCommand):
+    help = 'Profile cold start (imports, system checks, first request) and fail when it exceeds the startup budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/dashboard/stats/', help='Path requested as the first request')
+        parser.add_argument('--budget', type=float, help='Seconds allowed (default: STARTUP_BUDGET_SECONDS)')
+        parser.add_argument('--top', type=int, default=15, help='Slowest modules to list (default: 15)')
+        parser.add_argument('--warmup', action='store_true', help='Profile with TRACKER_WARMUP enabled')
+
+    def handle(self, *args, **options):
+        budget = options['budget'] if options['budget'] is not None else getattr(settings, 'STARTUP_BUDGET_SECONDS', 3.0)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'skillstack.settings'))
+        if options['warmup']:
+            env['TRACKER_WARMUP'] = '1'
+
+        start = time.perf_counter()
+        probe = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, options['path']],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        total = time.perf_counter() - start
+        if probe.returncode != 0:
+            raise CommandError(f"Startup probe failed:\n{probe.stderr[-2000:]}")
+        result = json.loads(probe.stdout.strip().splitlines()[-1])
+
+        modules = []
+        for line in probe.stderr.splitlines():
+            match = IMPORT_TIME.match(line)
+            if match:
+                self_us, cumulative_us, name = match.groups()
+                modules.append((int(self_us), int(cumulative_us), name))
+
+        self.stdout.write(f"{'module':<48} {'self ms':>9} {'cumul. ms':>10}")
+        for self_us, cumulative_us, name in sorted(modules, reverse=True)[:options['top']]:
+            self.stdout.write(f"{name:<48} {self_us / 1000:>9.1f} {cumulative_us / 1000:>10.1f}")
+        imports = sum(self_us for self_us, _, _ in modules) / 1e6
+        app_imports = sum(self_us for self_us, _, name in modules if name.split('.')[0] == 'tracker') / 1e6
+        self.stdout.write(f"\n{len(modules)} modules imported in {imports:.3f}s (tracker modules: {app_imports:.3f}s)")
+        self.stdout.write(f"NumPy imported at startup: {'yes' if result['numpy_loaded'] else 'no'}")
+        self.stdout.write(f"setup + check:   {result['setup_and_check']:.3f}s")
+        self.stdout.write(f"first request:   {result['first_request']:.3f}s (GET {options['path']} -> {result['status']})")
+        self.stdout.write(f"total wall time: {total:.3f}s (budget {budget:.3f}s)")
+
+        if result['status'] >= 500:
+            self.stdout.write(self.style.WARNING(f"First request failed with {result['status']}; is the database migrated?"))
+        if total > budget:
+            raise CommandError(f"Startup took {total:.3f}s, over the {budget:.3f}s budget")
+        self.stdout.write(self.style.SUCCESS('Startup within budget'))
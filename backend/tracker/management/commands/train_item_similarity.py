@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from tracker.collaborative import ItemSimilarityTrainer, get_model, save_model
+
+class Command(BaseCommand):
+    help = 'Train the item-item collaborative filtering model from completed progress'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help='Fold new completions into the current model instead of rebuilding it')
+        parser.add_argument('--top-k', type=int, default=20, help='Neighbours kept per resource (default: 20)')
+        parser.add_argument('--max-basket-size', type=int, default=200,
+                            help='Most recent completions considered per user or skill (default: 200)')
+
+    def handle(self, *args, **options):
+        trainer = ItemSimilarityTrainer(top_k=options['top_k'], max_basket_size=options['max_basket_size'])
+        start = time.perf_counter()
+
+        model = get_model() if options['incremental'] else None
+        if options['incremental'] and model is None:
+            self.stdout.write('No trained model found; running a full build')
+        if model is not None:
+            trained = trainer.update(model)
+            if trained is None:
+                self.stdout.write(self.style.SUCCESS('Model is already up to date'))
+                return
+        else:
+            trained = trainer.train()
+
+        arrays, meta = trained
+        version_dir = save_model(arrays, meta)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {meta['items']} items / {meta['pairs']} pairs to {version_dir} "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,145 @@
+import cProfile
+import json
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, DatabaseError
+from django.middleware.gzip import GZipMiddleware
+
+
+class QueryLogger:
+    """
+    Database execute wrapper that records every SQL statement with its timing
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': self.alias,
+                'sql': sql,
+                'params': self._jsonable_params(params, many),
+                'many': many,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    def _jsonable_params(self, params, many):
+        if params is None or many:
+            return None
+        return [p if isinstance(p, (int, float, str, bool, type(None))) else str(p) for p in params]
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile a single request on demand
+
+    Profiling is triggered by the ``X-Profile: 1`` header or the ``?profile=1``
+    query flag (``true`` and ``yes`` also count) and is only honoured in DEBUG
+    or for staff users. The request runs under cProfile while every SQL
+    statement is captured with its timing and query plan. A pstats file and a JSON SQL log are written to
+    ``PROFILING_DIR`` and their ids are returned in response headers.
+    """
+
+    header = 'HTTP_X_PROFILE'
+    query_flag = 'profile'
+    truthy = ('1', 'true', 'yes')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._profiling_requested(request) or not self._profiling_allowed(request):
+            return self.get_response(request)
+
+        loggers = {}
+        for alias in connections:
+            loggers[alias] = QueryLogger(alias)
+            connections[alias].execute_wrappers.append(loggers[alias])
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            elapsed = time.perf_counter() - start
+            for alias, logger in loggers.items():
+                connections[alias].execute_wrappers.remove(logger)
+
+        queries = [query for logger in loggers.values() for query in logger.queries]
+        self._explain(queries)
+
+        profile_id = uuid.uuid4().hex
+        self._store(profile_id, request, profiler, queries, elapsed)
+
+        response['X-Profile-Id'] = profile_id
+        response['X-Profile-Duration-Ms'] = f"{elapsed * 1000:.1f}"
+        response['X-Profile-Query-Count'] = str(len(queries))
+        response['X-Profile-Query-Ms'] = f"{sum(q['duration_ms'] for q in queries):.1f}"
+        return response
+
+    def _profiling_requested(self, request):
+        values = (request.META.get(self.header, ''), request.GET.get(self.query_flag, ''))
+        return any(value.strip().lower() in self.truthy for value in values)
+
+    def _profiling_allowed(self, request):
+        if settings.DEBUG:
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_authenticated and user.is_staff)
+
+    def _explain(self, queries):
+        """
+        Attach the database query plan to every captured SELECT statement
+        """
+        for query in queries:
+            if query['many'] or not query['sql'].lstrip().upper().startswith('SELECT'):
+                continue
+            connection = connections[query['alias']]
+            prefix = connection.ops.explain_query_prefix()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{prefix} {query['sql']}", query['params'])
+                    query['explain'] = [' '.join(str(col) for col in row) for row in cursor.fetchall()]
+            except DatabaseError as exc:
+                query['explain_error'] = str(exc)
+
+    def _store(self, profile_id, request, profiler, queries, elapsed):
+        profile_dir = Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        profiler.dump_stats(profile_dir / f"{profile_id}.pstats")
+
+        sql_log = {
+            'id': profile_id,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'duration_ms': round(elapsed * 1000, 3),
+            'query_count': len(queries),
+            'query_time_ms': round(sum(q['duration_ms'] for q in queries), 3),
+            'queries': queries,
+        }
+        with open(profile_dir / f"{profile_id}.sql.json", 'w') as f:
+            json.dump(sql_log, f, indent=2)
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    Gzip responses only once they reach ``GZIP_MIN_LENGTH`` bytes
+
+    Small payloads gain little from compression and pay its CPU cost on
+    every request; larger list responses shrink several-fold.
+    """
+
+    def process_response(self, request, response):
+        min_length = getattr(settings, 'GZIP_MIN_LENGTH', 1024)
+        if not response.streaming and len(response.content) < min_length:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_certification'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='certification',
+            name='expiration_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_certification_expiration_date_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillcategory',
+            index=models.Index(fields=['category', 'skill'], name='tracker_skillcat_cat_skill_idx'),
+        ),
+    ]
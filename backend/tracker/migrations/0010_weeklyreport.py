@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('user', 'User'), ('skill', 'Skill')], max_length=10)),
+                ('scope_key', models.CharField(max_length=50)),
+                ('week_start', models.DateField()),
+                ('week_end', models.DateField()),
+                ('summary', models.TextField()),
+                ('stats', models.JSONField(default=dict)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+                ('skill', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='weekly_reports', to='tracker.skill')),
+                ('user', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='weekly_reports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-week_start', 'scope_key'],
+                'indexes': [models.Index(fields=['user', 'week_start'], name='tracker_report_user_week_idx')],
+                'constraints': [models.UniqueConstraint(fields=('scope_key', 'week_start'), name='tracker_weeklyreport_scope_week_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+from tracker.dedup import url_hash
+
+
+def backfill_url_hashes(apps, schema_editor):
+    Resource = apps.get_model('tracker', 'Resource')
+    batch = []
+    for resource in Resource.objects.exclude(url__isnull=True).exclude(url='').only('id', 'url').iterator(chunk_size=2000):
+        resource.url_hash = url_hash(resource.url)
+        batch.append(resource)
+        if len(batch) >= 2000:
+            Resource.objects.bulk_update(batch, ['url_hash'])
+            batch = []
+    Resource.objects.bulk_update(batch, ['url_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_progressevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='url_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_url_hashes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['user', 'url_hash'], name='tracker_res_user_urlhash_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from tracker.notes import compress_notes, decompress_notes
+
+
+def move_notes_to_side_table(apps, schema_editor):
+    Progress = apps.get_model('tracker', 'Progress')
+    ProgressNote = apps.get_model('tracker', 'ProgressNote')
+    batch = []
+    rows = Progress.objects.exclude(notes__isnull=True).exclude(notes='').values_list('id', 'notes')
+    for progress_id, text in rows.iterator(chunk_size=500):
+        codec, data, size = compress_notes(text)
+        batch.append(ProgressNote(progress_id=progress_id, codec=codec, data=data, size=size))
+        if len(batch) >= 500:
+            ProgressNote.objects.bulk_create(batch)
+            batch = []
+    ProgressNote.objects.bulk_create(batch)
+
+
+def restore_notes_column(apps, schema_editor):
+    Progress = apps.get_model('tracker', 'Progress')
+    ProgressNote = apps.get_model('tracker', 'ProgressNote')
+    for note in ProgressNote.objects.iterator(chunk_size=500):
+        Progress.objects.filter(pk=note.progress_id).update(notes=decompress_notes(note.data, note.codec))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_resource_url_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressNote',
+            fields=[
+                ('progress', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='note_blob', serialize=False, to='tracker.progress')),
+                ('codec', models.CharField(choices=[('raw', 'Uncompressed'), ('zlib', 'zlib')], default='zlib', max_length=10)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(move_notes_to_side_table, restore_notes_column),
+        migrations.RemoveField(
+            model_name='progress',
+            name='notes',
+        ),
+    ]
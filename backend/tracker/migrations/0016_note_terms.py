@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from tracker.notes import extract_terms, iter_decompressed
+
+
+def index_existing_notes(apps, schema_editor):
+    Progress = apps.get_model('tracker', 'Progress')
+    ProgressNote = apps.get_model('tracker', 'ProgressNote')
+    NoteTerm = apps.get_model('tracker', 'NoteTerm')
+    owners = dict(Progress.objects.values_list('id', 'user_id'))
+    batch = []
+    for note in ProgressNote.objects.iterator(chunk_size=200):
+        for term, count in extract_terms(iter_decompressed(note.data, note.codec)).items():
+            batch.append(NoteTerm(user_id=owners.get(note.progress_id), progress_id=note.progress_id, term=term, count=count))
+        if len(batch) >= 5000:
+            NoteTerm.objects.bulk_create(batch, batch_size=500)
+            batch = []
+    NoteTerm.objects.bulk_create(batch, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0015_progress_notes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('progress', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='note_terms', to='tracker.progress')),
+                ('user', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='note_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'term'], name='tracker_noteterm_user_term_idx')],
+                'constraints': [models.UniqueConstraint(fields=('progress', 'term'), name='tracker_noteterm_progress_term_uniq')],
+            },
+        ),
+        migrations.RunPython(index_existing_notes, migrations.RunPython.noop),
+    ]
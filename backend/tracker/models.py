@@ -1,8 +1,30 @@
+from datetime import timedelta
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
-from .summarization import NoteSummarizer
+from django.utils import timezone
+from .dedup import url_hash
+from .notes import compress_notes, decompress_notes, iter_decompressed
+from . import engines
+
+class OwnedQuerySet(models.QuerySet):
+    """
+    Queryset for models that belong to a learner
+    """
+    
+    def owned_by(self, user):
+        """
+        Rows owned by ``user`` (a User or a user id); anonymous callers and
+        ``None`` get the unowned rows
+        """
+        user_id = getattr(user, 'pk', user)
+        if user_id is None:
+            return self.filter(user__isnull=True)
+        return self.filter(user_id=user_id)
 
 class Skill(models.Model):
+    # Owner columns lead the composite indexes in Meta, so no standalone index
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skills', null=True, blank=True, db_index=False)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     category = models.CharField(max_length=100, blank=True, null=True)
@@ -19,11 +41,17 @@ class Skill(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OwnedQuerySet.as_manager()
+
     def __str__(self):
         return self.name
         
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='tracker_skill_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='tracker_skill_user_updated_idx'),
+        ]
 
 class Resource(models.Model):
     RESOURCE_TYPES = [
@@ -45,20 +73,37 @@ class Resource(models.Model):
         ('other', 'Other'),
     ]
     
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resources', null=True, blank=True, db_index=False)
     title = models.CharField(max_length=200)
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='resources')
     resource_type = models.CharField(max_length=20, choices=RESOURCE_TYPES)
     platform = models.CharField(max_length=30, choices=PLATFORMS)
     url = models.URLField(blank=True, null=True)
+    # SHA-256 of the canonical URL (see tracker.dedup), kept in step by save()
+    url_hash = models.CharField(max_length=64, blank=True, null=True, editable=False)
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OwnedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} ({self.get_resource_type_display()})"
         
+    def save(self, *args, **kwargs):
+        self.url_hash = url_hash(self.url)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'url' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'url_hash'}
+        super().save(*args, **kwargs)
+        
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='tracker_res_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='tracker_res_user_updated_idx'),
+            models.Index(fields=['user', 'url_hash'], name='tracker_res_user_urlhash_idx'),
+        ]
 
 class Progress(models.Model):
     STATUS_CHOICES = [
@@ -68,19 +113,84 @@ class Progress(models.Model):
         ('completed', 'Completed'),
     ]
     
+    # Denormalized from resource.user so per-learner queries stay on one table
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_items', null=True, blank=True, db_index=False)
     resource = models.OneToOneField(Resource, on_delete=models.CASCADE, related_name='progress')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='not_started')
     hours_spent = models.DecimalField(max_digits=5, decimal_places=2, default=0)
-    notes = models.TextField(blank=True, null=True)
+    # Notes live compressed in ProgressNote and load on first access of ``notes``
     difficulty_rating = models.IntegerField(choices=[(i, i) for i in range(1, 6)], null=True, blank=True)  # 1-5 scale
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OwnedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.resource.title} - {self.get_status_display()}"
         
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so post_save handlers can compute deltas without a query
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in ('status', 'hours_spent')
+        }
+        return instance
+        
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.user_id is None and self.resource_id is not None:
+            self.user_id = self.resource.user_id
+        update_fields = kwargs.get('update_fields')
+        save_notes = getattr(self, '_notes_changed', False) and (update_fields is None or 'notes' in update_fields)
+        if update_fields is not None and 'notes' in update_fields:
+            kwargs['update_fields'] = [name for name in update_fields if name != 'notes'] + ['updated_at']
+        super().save(*args, **kwargs)
+        if save_notes:
+            ProgressNote.store(self.pk, self._notes)
+            self._notes_changed = False
+            
+    @property
+    def notes(self):
+        """
+        Note text, read and decompressed from ProgressNote on first access
+        """
+        if not hasattr(self, '_notes'):
+            self._notes = None
+            if self.pk is not None:
+                try:
+                    self._notes = self.note_blob.text
+                except ProgressNote.DoesNotExist:
+                    pass
+        return self._notes
+        
+    @notes.setter
+    def notes(self, value):
+        self._notes = value
+        self._notes_changed = True
+        
+    def loaded_value(self, name, default=None):
+        """
+        Value of a field as last loaded from or saved to the database
+        """
+        return getattr(self, '_loaded_values', {}).get(name, default)
+        
+    def mark_saved_values(self):
+        self._loaded_values = {'status': self.status, 'hours_spent': self.hours_spent}
+        
+    def iter_notes(self):
+        """
+        Note text as a stream of chunks, decompressed incrementally unless the
+        full text is already loaded
+        """
+        if hasattr(self, '_notes') or self.pk is None:
+            return [self._notes] if self.notes else []
+        try:
+            return self.note_blob.iter_text()
+        except ProgressNote.DoesNotExist:
+            return []
+        
     def get_summary(self, max_sentences=3):
         """
         Get a summary of the notes
@@ -88,21 +198,23 @@ class Progress(models.Model):
         if not self.notes:
             return "No notes available."
             
-        summarizer = NoteSummarizer()
+        summarizer = engines.summarizer()
         return summarizer.summarize_notes(self.notes, max_sentences)
         
     def get_key_points(self, max_points=5):
         """
         Get key points from the notes
         """
-        if not self.notes:
-            return []
-            
-        summarizer = NoteSummarizer()
-        return summarizer.extract_key_points(self.notes, max_points)
+        summarizer = engines.summarizer()
+        return summarizer.extract_key_points(self.iter_notes(), max_points)
         
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='tracker_prog_user_created_idx'),
+            models.Index(fields=['user', 'status'], name='tracker_prog_user_status_idx'),
+            models.Index(fields=['user', 'updated_at'], name='tracker_prog_user_updated_idx'),
+        ]
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -124,28 +236,253 @@ class SkillCategory(models.Model):
     class Meta:
         unique_together = ('skill', 'category')
         ordering = ['-assigned_at']
+        indexes = [
+            # unique_together covers skill-led lookups; category rollups join from the other side
+            models.Index(fields=['category', 'skill'], name='tracker_skillcat_cat_skill_idx'),
+        ]
+
+class CertificationQuerySet(OwnedQuerySet):
+    """
+    Expiry filters evaluated in SQL against the indexed expiration_date
+    """
+    
+    def expired(self, today=None):
+        today = today or timezone.now().date()
+        return self.filter(expiration_date__lt=today)
+        
+    def active(self, today=None):
+        today = today or timezone.now().date()
+        return self.filter(Q(expiration_date__isnull=True) | Q(expiration_date__gte=today))
+        
+    def expiring(self, days=30, today=None):
+        """
+        Certifications that are still valid but expire within the next ``days`` days
+        """
+        today = today or timezone.now().date()
+        return self.filter(
+            expiration_date__gte=today,
+            expiration_date__lte=today + timedelta(days=days)
+        ).order_by('expiration_date', 'id')
 
 # Certification model for tracking earned certifications
 class Certification(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='certifications', null=True, blank=True, db_index=False)
     name = models.CharField(max_length=200)
     issuing_organization = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     skills = models.ManyToManyField(Skill, related_name='certifications', blank=True)
     issue_date = models.DateField()
-    expiration_date = models.DateField(blank=True, null=True)
+    expiration_date = models.DateField(blank=True, null=True, db_index=True)
     credential_id = models.CharField(max_length=100, blank=True, null=True)
     credential_url = models.URLField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CertificationQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} - {self.issuing_organization}"
         
     def is_expired(self):
         if self.expiration_date:
-            from django.utils import timezone
             return self.expiration_date < timezone.now().date()
         return False
         
     class Meta:
         ordering = ['-issue_date']
+        indexes = [
+            models.Index(fields=['user', 'issue_date'], name='tracker_cert_user_issue_idx'),
+            models.Index(fields=['user', 'expiration_date'], name='tracker_cert_user_expiry_idx'),
+            models.Index(fields=['user', 'updated_at'], name='tracker_cert_user_updated_idx'),
+        ]
+
+# Background job queue backing tracker/jobs.py
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs', null=True, blank=True)
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    # Hash of kind, owner and payload used to collapse identical pending jobs
+    dedup_key = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, null=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OwnedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+        
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='tracker_job_status_run_idx'),
+            models.Index(fields=['dedup_key', 'status'], name='tracker_job_dedup_idx'),
+        ]
+
+# Persisted weekly learning reports, one per scope (user or skill) and week
+class WeeklyReport(models.Model):
+    SCOPE_CHOICES = [
+        ('user', 'User'),
+        ('skill', 'Skill'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='weekly_reports', null=True, blank=True, db_index=False)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='weekly_reports', null=True, blank=True)
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    # "user:<id>", "user:none" or "skill:<id>"; unique per week so backfills are idempotent
+    scope_key = models.CharField(max_length=50)
+    week_start = models.DateField()
+    week_end = models.DateField()
+    summary = models.TextField()
+    stats = models.JSONField(default=dict)
+    generated_at = models.DateTimeField(auto_now=True)
+
+    objects = OwnedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.scope_key} week of {self.week_start}"
+        
+    class Meta:
+        ordering = ['-week_start', 'scope_key']
+        constraints = [
+            models.UniqueConstraint(fields=['scope_key', 'week_start'], name='tracker_weeklyreport_scope_week_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'week_start'], name='tracker_report_user_week_idx'),
+        ]
+
+# Daily learning activity rollup, maintained incrementally from Progress changes
+class DailyActivity(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_activity', null=True, blank=True, db_index=False)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='daily_activity')
+    date = models.DateField()
+    hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    completions = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OwnedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.skill_id} on {self.date}: {self.hours}h, {self.completions} completed"
+        
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'date'], name='tracker_dailyactivity_skill_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'date'], name='tracker_activity_user_date_idx'),
+        ]
+
+# Deletion log so clients syncing through /api/changes/ learn about removed rows
+class Tombstone(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones', null=True, blank=True, db_index=False)
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    objects = OwnedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted at {self.deleted_at}"
+        
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='tracker_tomb_user_deleted_idx'),
+        ]
+
+# Compressed Progress notes, kept off the Progress row so list queries stay small
+class ProgressNote(models.Model):
+    CODEC_CHOICES = [
+        ('raw', 'Uncompressed'),
+        ('zlib', 'zlib'),
+    ]
+    
+    progress = models.OneToOneField(Progress, on_delete=models.CASCADE, primary_key=True, related_name='note_blob')
+    codec = models.CharField(max_length=10, choices=CODEC_CHOICES, default='zlib')
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)  # uncompressed bytes
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Notes for progress {self.progress_id} ({self.size} bytes)"
+        
+    @property
+    def text(self):
+        return decompress_notes(self.data, self.codec)
+        
+    def iter_text(self, chunk_size=64 * 1024):
+        return iter_decompressed(self.data, self.codec, chunk_size)
+        
+    @classmethod
+    def store(cls, progress_id, text):
+        """
+        Save (or, for empty text, delete) the notes of a Progress row
+        """
+        if not text:
+            cls.objects.filter(progress_id=progress_id).delete()
+            return None
+        codec, data, size = compress_notes(text)
+        note, created = cls.objects.update_or_create(
+            progress_id=progress_id, defaults={'codec': codec, 'data': data, 'size': size}
+        )
+        return note
+
+# Inverted index over progress notes: one row per (progress, term) with its count
+class NoteTerm(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='note_terms', null=True, blank=True, db_index=False)
+    progress = models.ForeignKey(Progress, on_delete=models.CASCADE, related_name='note_terms', db_index=False)
+    term = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(default=1)
+
+    objects = OwnedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.term} x{self.count} in progress {self.progress_id}"
+        
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['progress', 'term'], name='tracker_noteterm_progress_term_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'term'], name='tracker_noteterm_user_term_idx'),
+        ]
+
+# Append-only log of time logged against a Progress row
+class ProgressEvent(models.Model):
+    KIND_CHOICES = [
+        ('hours_logged', 'Hours Logged'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_events', null=True, blank=True, db_index=False)
+    progress = models.ForeignKey(Progress, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='hours_logged')
+    hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    note = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OwnedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.progress_id}: {self.get_kind_display()} {self.hours}h"
+        
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['progress', 'created_at'], name='tracker_progevent_prog_idx'),
+        ]
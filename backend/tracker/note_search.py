@@ -0,0 +1,117 @@
+import re
+from collections import defaultdict
+from django.db import transaction
+from .models import NoteTerm, Progress, ProgressNote
+from .notes import STOPWORDS, extract_terms, iter_terms
+
+QUERY_ITEM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def index_note(note):
+    """
+    Replace the index rows of one progress with the terms of its stored note
+    """
+    user_id = Progress.objects.filter(pk=note.progress_id).values_list('user_id', flat=True).first()
+    terms = extract_terms(note.iter_text())
+    with transaction.atomic():
+        NoteTerm.objects.filter(progress_id=note.progress_id).delete()
+        NoteTerm.objects.bulk_create([
+            NoteTerm(user_id=user_id, progress_id=note.progress_id, term=term, count=count)
+            for term, count in terms.items()
+        ], batch_size=500)
+    return len(terms)
+
+
+def rebuild_note_index():
+    """
+    Recreate every index row from the stored notes
+    """
+    owners = dict(Progress.objects.values_list('id', 'user_id'))
+    rows = 0
+    with transaction.atomic():
+        NoteTerm.objects.all().delete()
+        batch = []
+        for note in ProgressNote.objects.iterator(chunk_size=200):
+            for term, count in extract_terms(note.iter_text()).items():
+                batch.append(NoteTerm(user_id=owners.get(note.progress_id), progress_id=note.progress_id,
+                                      term=term, count=count))
+            if len(batch) >= 5000:
+                NoteTerm.objects.bulk_create(batch, batch_size=500)
+                rows += len(batch)
+                batch = []
+        NoteTerm.objects.bulk_create(batch, batch_size=500)
+        rows += len(batch)
+    return rows
+
+
+def parse_query(query):
+    """
+    Split a search string into items: single terms, or quoted phrases as
+    tuples of terms. Stopwords and punctuation are dropped the same way the
+    index drops them. Compound forms stay whole (the index also holds them
+    whole), so ``"node.js streams"`` is the phrase ``('node.js', 'streams')``.
+    """
+    items = []
+    for match in QUERY_ITEM.finditer(query or ''):
+        phrase, word = match.groups()
+        terms = tuple(iter_terms(phrase if phrase is not None else word, parts=False))
+        if terms:
+            items.append(terms)
+    return items
+
+
+def search_notes(user, query, mode='and'):
+    """
+    Progress ids whose notes match ``query``, best first, as
+    ``(progress_id, score, {term: count})`` tuples
+
+    Only index rows for the queried terms are read. With ``mode='and'``
+    every item must match, with ``'or'`` any item. A quoted phrase needs all
+    of its terms and is then confirmed against the text of the candidate notes.
+    """
+    items = parse_query(query)
+    if not items:
+        return []
+    terms = {term for item in items for term in item}
+    postings = defaultdict(dict)
+    rows = NoteTerm.objects.owned_by(user).filter(term__in=terms).values_list('progress_id', 'term', 'count')
+    for progress_id, term, count in rows:
+        postings[progress_id][term] = count
+
+    combine = all if mode == 'and' else any
+    candidates = {
+        progress_id: counts for progress_id, counts in postings.items()
+        if combine(all(term in counts for term in item) for item in items)
+    }
+
+    phrases = [item for item in items if len(item) > 1]
+    if phrases and candidates:
+        candidates = _confirm_phrases(candidates, items, phrases, combine)
+
+    results = [(progress_id, sum(counts.values()), counts) for progress_id, counts in candidates.items()]
+    results.sort(key=lambda result: (-result[1], result[0]))
+    return results
+
+
+def _phrase_pattern(phrase):
+    # Words the index drops (stopwords, single characters) may sit between phrase terms
+    skipped = '|'.join(sorted(STOPWORDS) + ['[a-z0-9]'])
+    gap = rf'[^a-z0-9]+(?:(?:{skipped})[^a-z0-9]+)*'
+    return re.compile(r'(?<![a-z0-9])' + gap.join(map(re.escape, phrase)) + r'(?![a-z0-9])')
+
+
+def _confirm_phrases(candidates, items, phrases, combine):
+    patterns = {phrase: _phrase_pattern(phrase) for phrase in phrases}
+    confirmed = {}
+    for note in ProgressNote.objects.filter(progress_id__in=list(candidates)):
+        text = note.text.lower()
+        counts = candidates[note.progress_id]
+        matched = []
+        for item in items:
+            if len(item) == 1:
+                matched.append(item[0] in counts)
+            else:
+                matched.append(all(term in counts for term in item) and patterns[item].search(text) is not None)
+        if combine(matched):
+            confirmed[note.progress_id] = counts
+    return confirmed
@@ -0,0 +1,97 @@
+import codecs
+import re
+import zlib
+from collections import Counter
+from .summarization import iter_lines
+
+# Notes shorter than this are stored as-is; zlib headers outweigh any saving
+MIN_COMPRESS_BYTES = 128
+
+# Words, keeping forms like c++, c#, node.js and scikit-learn whole
+TERM = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[._-][a-z0-9+#]+)*')
+TERM_SEPARATOR = re.compile(r'[._-]')
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+STOPWORDS = frozenset(
+    'an and are as at be but by can do for from has have how if in into is it its of on or so '
+    'that the their then there these this to was we were what when which will with you your'.split()
+)
+
+
+def compress_notes(text):
+    """
+    Encode note text for storage, returning ``(codec, data, size)``
+    where ``size`` is the uncompressed length in bytes
+    """
+    raw = text.encode('utf-8')
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            return 'zlib', compressed, len(raw)
+    return 'raw', raw, len(raw)
+
+
+def decompress_notes(data, codec):
+    """
+    Decode stored note bytes back to text
+    """
+    data = bytes(data)
+    if codec == 'zlib':
+        data = zlib.decompress(data)
+    elif codec != 'raw':
+        raise ValueError(f"Unknown notes codec: {codec}")
+    return data.decode('utf-8')
+
+
+def iter_decompressed(data, codec, chunk_size=64 * 1024):
+    """
+    Decode stored note bytes as a stream of text chunks of roughly
+    ``chunk_size`` characters, without materializing the whole text
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    data = memoryview(bytes(data))
+    if codec == 'raw':
+        for start in range(0, len(data), chunk_size):
+            text = decoder.decode(data[start:start + chunk_size])
+            if text:
+                yield text
+    elif codec == 'zlib':
+        decompressor = zlib.decompressobj()
+        for start in range(0, len(data), chunk_size):
+            pending = data[start:start + chunk_size]
+            while pending:
+                text = decoder.decode(decompressor.decompress(pending, chunk_size))
+                if text:
+                    yield text
+                pending = decompressor.unconsumed_tail
+        text = decoder.decode(decompressor.flush())
+        if text:
+            yield text
+    else:
+        raise ValueError(f"Unknown notes codec: {codec}")
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def iter_terms(source, parts=True):
+    """
+    Index terms of ``source`` (a string or iterable of text chunks) in order
+
+    With ``parts=False`` compound forms are yielded whole, without their parts.
+    """
+    for line in iter_lines(source):
+        for match in TERM.finditer(line.lower()):
+            term = match.group()
+            # Compound forms (asyncio.gather, scikit-learn) are also indexed by their parts
+            pieces = TERM_SEPARATOR.split(term) if parts else [term]
+            for candidate in ([term] + pieces if len(pieces) > 1 else pieces):
+                if MIN_TERM_LENGTH <= len(candidate) <= MAX_TERM_LENGTH and candidate not in STOPWORDS:
+                    yield candidate
+
+
+def extract_terms(source):
+    """
+    Term frequencies of ``source`` for the notes index
+    """
+    return Counter(iter_terms(source))
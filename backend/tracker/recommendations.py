@@ -1,45 +1,151 @@
-from collections import defaultdict
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from django.conf import settings
+from django.db.models import Count, Max, Q
 from .models import Resource, Skill
 
+class RecommendationCache:
+    """
+    Bounded LRU cache with a per-entry TTL for recommendation results
+
+    Every entry remembers the data version it was computed from; a lookup
+    with a different version counts as an invalidation and recomputes.
+    """
+    
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        
+    def get_or_compute(self, key, version, compute):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, value = entry
+                if expires_at > now and entry_version == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if entry_version != version:
+                    self.invalidations += 1
+                del self._entries[key]
+            self.misses += 1
+            
+        value = compute()
+        
+        with self._lock:
+            self._entries[key] = (now + self.ttl, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+        
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = self.evictions = 0
+            
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+recommendation_cache = RecommendationCache(
+    maxsize=getattr(settings, 'RECOMMENDATION_CACHE_SIZE', 256),
+    ttl=getattr(settings, 'RECOMMENDATION_CACHE_TTL', 300),
+)
+
+# Field values _calculate_resource_score distinguishes
+SCORED_TYPES = ['course', 'video']
+SCORED_PLATFORMS = ['udemy', 'coursera', 'youtube', 'edx']
+SCORED_STATUSES = ['completed', 'in_progress', 'started']
+
+def resource_data_version(resources):
+    """
+    Cheap fingerprint of a Resource queryset, its skills and its Progress rows
+    Counts catch deletions and the latest updated_at of each catches saved edits
+    (including a skill rename). Per-value counts of the scored fields also catch
+    ``QuerySet.update`` calls that leave updated_at alone; other fields changed
+    that way show up once the cache TTL expires.
+    """
+    version = resources.order_by().aggregate(
+        resource_count=Count('id'),
+        resource_updated=Max('updated_at'),
+        skill_updated=Max('skill__updated_at'),
+        progress_count=Count('progress'),
+        progress_updated=Max('progress__updated_at'),
+        **{f'type_{value}': Count('id', filter=Q(resource_type=value)) for value in SCORED_TYPES},
+        **{f'platform_{value}': Count('id', filter=Q(platform=value)) for value in SCORED_PLATFORMS},
+        **{f'status_{value}': Count('progress', filter=Q(progress__status=value)) for value in SCORED_STATUSES},
+    )
+    return tuple(version.values())
+
+def skill_data_version(skills):
+    version = skills.order_by().aggregate(skill_count=Count('id'), skill_updated=Max('updated_at'))
+    return tuple(version.values())
+
 class ResourceRecommender:
     """
     A simple recommendation system based on user's past learning history
+    Results are served from recommendation_cache while the underlying data is unchanged
     """
     
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else recommendation_cache
+    
     def recommend_resources(self, user_id=None, limit=5):
         """
         Recommend resources based on the user's past learning history
         For now, we'll implement a simple popularity-based recommendation
+        over the resources owned by user_id (None means unowned resources)
         """
-        # In a real implementation, we would use user_id to personalize recommendations
-        # For now, we'll just recommend popular resources based on completion rates
-        
-        # Get all resources with their completion status
-        resources = Resource.objects.select_related('skill', 'progress').all()
+        resources = Resource.objects.owned_by(user_id)
+        return self.cache.get_or_compute(
+            ('resources', user_id, limit),
+            resource_data_version(resources),
+            lambda: self._recommend_resources(resources, limit)
+        )
         
-        # Calculate completion rate for each resource
-        resource_scores = []
-        for resource in resources:
-            # Simple scoring based on resource type and platform popularity
-            score = self._calculate_resource_score(resource)
-            resource_scores.append((resource, score))
-        
-        # Sort by score and return top recommendations
-        resource_scores.sort(key=lambda x: x[1], reverse=True)
-        recommendations = [resource for resource, score in resource_scores[:limit]]
-        
-        return recommendations
-    
     def recommend_resources_by_skill(self, skill_id, limit=5):
         """
         Recommend resources related to a specific skill
         """
-        # Get resources for the specified skill, sorted by completion rate
-        resources = Resource.objects.filter(skill_id=skill_id).select_related('skill', 'progress')
+        resources = Resource.objects.filter(skill_id=skill_id)
+        return self.cache.get_or_compute(
+            ('skill_resources', skill_id, limit),
+            resource_data_version(resources),
+            lambda: self._recommend_resources(resources, limit)
+        )
+        
+    def _recommend_resources(self, resources, limit):
+        # Get the resources with their completion status
+        return self.rank_resources(resources.select_related('skill', 'progress'), limit)
         
-        # Calculate scores for each resource
+    def rank_resources(self, resources, limit=5):
+        """
+        Top ``limit`` of already loaded resources (with skill and progress)
+        """
+        # Calculate completion rate for each resource
         resource_scores = []
         for resource in resources:
+            # Simple scoring based on resource type and platform popularity
             score = self._calculate_resource_score(resource)
             resource_scores.append((resource, score))
         
@@ -89,9 +195,30 @@ class ResourceRecommender:
         """
         Recommend skills based on user's interests and market demand
         """
-        # Get all skills with their resource counts
-        skills = Skill.objects.prefetch_related('resources').all()
+        skills = Skill.objects.owned_by(user_id)
+        version = skill_data_version(skills) + resource_data_version(Resource.objects.owned_by(user_id))
+        return self.cache.get_or_compute(
+            ('skills', user_id, limit),
+            version,
+            lambda: self._recommend_skills(skills, limit)
+        )
+        
+    def _recommend_skills(self, skills, limit):
+        # Get all skills with their resource and completion counts in one query
+        skills = skills.annotate(
+            resource_count=Count('resources', distinct=True),
+            completed_count=Count(
+                'resources',
+                filter=Q(resources__progress__status='completed'),
+                distinct=True
+            )
+        )
+        return self.rank_skills(skills, limit)
         
+    def rank_skills(self, skills, limit=5):
+        """
+        Top ``limit`` of skills carrying ``resource_count`` and ``completed_count``
+        """
         # Calculate scores for each skill
         skill_scores = []
         for skill in skills:
@@ -112,21 +239,12 @@ class ResourceRecommender:
         score = 0
         
         # Factor 1: Number of resources (more resources = more comprehensive)
-        resource_count = skill.resources.count()
+        resource_count = skill.resource_count
         score += resource_count * 2
         
         # Factor 2: Completion rates of resources (higher completion = more valuable)
-        completed_count = 0
-        total_resources = 0
-        
-        for resource in skill.resources.all():
-            total_resources += 1
-            if hasattr(resource, 'progress') and resource.progress:
-                if resource.progress.status == 'completed':
-                    completed_count += 1
-                    
-        if total_resources > 0:
-            completion_rate = completed_count / total_resources
+        if resource_count > 0:
+            completion_rate = skill.completed_count / resource_count
             score += completion_rate * 10
             
         return score
\ No newline at end of file
@@ -1,5 +1,26 @@
+from decimal import Decimal
 from rest_framework import serializers
-from .models import Skill, Resource, Progress, Category, SkillCategory, Certification
+from .models import Skill, Resource, Progress, Category, SkillCategory, Certification, Job, WeeklyReport, ProgressEvent
+from .dedup import url_hash
+from .jobs import TASKS, validate_payload as validate_job_payload
+
+class OwnedRelationsMixin:
+    """
+    Limit writable relations listed in ``owned_relations`` to rows owned by the requesting user
+    """
+    owned_relations = ()
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None:
+            return fields
+        user = request.user if request.user.is_authenticated else None
+        for name in self.owned_relations:
+            field = getattr(fields[name], 'child_relation', fields[name])
+            if field.queryset is not None:
+                field.queryset = field.queryset.owned_by(user)
+        return fields
 
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,12 +32,29 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'name', 'description', 'created_at']
 
-class ResourceSerializer(serializers.ModelSerializer):
+class ResourceSerializer(OwnedRelationsMixin, serializers.ModelSerializer):
+    owned_relations = ('skill',)
+    
     class Meta:
         model = Resource
         fields = ['id', 'title', 'skill', 'resource_type', 'platform', 'url', 'description', 'created_at', 'updated_at']
+        
+    def validate(self, attrs):
+        hash_value = url_hash(attrs.get('url'))
+        if hash_value:
+            request = self.context.get('request')
+            user = request.user if request is not None and request.user.is_authenticated else None
+            duplicates = Resource.objects.owned_by(user).filter(url_hash=hash_value)
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            existing_id = duplicates.values_list('id', flat=True).first()
+            if existing_id is not None:
+                raise serializers.ValidationError({'url': f"This link is already tracked as resource {existing_id}."})
+        return attrs
 
-class ProgressSerializer(serializers.ModelSerializer):
+class ProgressSerializer(OwnedRelationsMixin, serializers.ModelSerializer):
+    owned_relations = ('resource',)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True, trim_whitespace=False)
     summary = serializers.SerializerMethodField()
     key_points = serializers.SerializerMethodField()
     
@@ -32,6 +70,19 @@ class ProgressSerializer(serializers.ModelSerializer):
     def get_key_points(self, obj):
         return obj.get_key_points()
 
+class ProgressListSerializer(serializers.ModelSerializer):
+    """
+    Progress without notes or anything derived from them, for list responses
+    """
+    
+    class Meta:
+        model = Progress
+        fields = ['id', 'resource', 'status', 'hours_spent', 'difficulty_rating',
+                  'started_at', 'completed_at', 'created_at', 'updated_at']
+
+class ProgressNotesSerializer(serializers.Serializer):
+    notes = serializers.CharField(allow_blank=True, allow_null=True, trim_whitespace=False)
+
 class SkillDetailSerializer(serializers.ModelSerializer):
     resources = ResourceSerializer(many=True, read_only=True)
     
@@ -48,20 +99,72 @@ class ResourceDetailSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'skill', 'skill_name', 'resource_type', 'platform', 'url', 'description',
                   'progress', 'created_at', 'updated_at']
 
+class ResourceListSerializer(ResourceDetailSerializer):
+    progress = ProgressListSerializer(read_only=True)
+
 class CertificationSerializer(serializers.ModelSerializer):
     skills = SkillSerializer(many=True, read_only=True)
+    is_expired = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Certification
         fields = ['id', 'name', 'issuing_organization', 'description', 'skills', 
-                  'issue_date', 'expiration_date', 'credential_id', 'credential_url',
+                  'issue_date', 'expiration_date', 'is_expired', 'credential_id', 'credential_url',
                   'created_at', 'updated_at']
 
-class CertificationDetailSerializer(serializers.ModelSerializer):
+class CertificationDetailSerializer(OwnedRelationsMixin, serializers.ModelSerializer):
     skills = serializers.PrimaryKeyRelatedField(queryset=Skill.objects.all(), many=True, required=False)
+    owned_relations = ('skills',)
     
     class Meta:
         model = Certification
         fields = ['id', 'name', 'issuing_organization', 'description', 'skills', 
                   'issue_date', 'expiration_date', 'credential_id', 'credential_url',
                   'created_at', 'updated_at']
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'payload', 'status', 'attempts', 'max_attempts', 'result', 'error',
+                  'run_after', 'started_at', 'finished_at', 'created_at', 'updated_at']
+        read_only_fields = ['status', 'attempts', 'max_attempts', 'result', 'error',
+                            'run_after', 'started_at', 'finished_at', 'created_at', 'updated_at']
+        
+    def validate_kind(self, value):
+        if value not in TASKS:
+            raise serializers.ValidationError(f"Unknown job kind. Choose one of: {', '.join(sorted(TASKS))}")
+        return value
+        
+    def validate_payload(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Payload must be an object")
+        return value
+        
+    def validate(self, attrs):
+        try:
+            validate_job_payload(attrs['kind'], attrs.get('payload') or {})
+        except ValueError as exc:
+            raise serializers.ValidationError({'payload': str(exc)})
+        return attrs
+
+
+class WeeklyReportSerializer(serializers.ModelSerializer):
+    skill_name = serializers.CharField(source='skill.name', read_only=True, default=None)
+    
+    class Meta:
+        model = WeeklyReport
+        fields = ['id', 'scope', 'skill', 'skill_name', 'week_start', 'week_end', 'summary', 'stats', 'generated_at']
+
+
+class LogHoursSerializer(serializers.Serializer):
+    hours = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal('0.01'))
+    note = serializers.CharField(required=False, allow_blank=True, default='')
+    advance_status = serializers.BooleanField(required=False, default=True)
+    record_event = serializers.BooleanField(required=False, default=True)
+
+
+class ProgressEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProgressEvent
+        fields = ['id', 'progress', 'kind', 'hours', 'note', 'created_at']
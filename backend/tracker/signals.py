@@ -0,0 +1,102 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+from django.dispatch import receiver
+from .models import Skill, Resource, Progress, Certification, ProgressNote, NoteTerm
+
+
+@receiver(post_save, sender=Progress)
+def roll_up_daily_activity(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the DailyActivity rollup in step with hours and completions
+    A save that newly completes the row also queues a similarity update.
+    """
+    if raw:
+        return
+    from .activity import record_progress_change
+    # Compared against the loaded status, so note or hours edits of completed rows queue nothing
+    if record_progress_change(instance, created=created) > 0:
+        queue_similarity_update()
+
+
+def queue_similarity_update():
+    """
+    Fold new completions into the collaborative model in the background
+    Identical pending jobs are de-duplicated, so bursts collapse into one update.
+    """
+    from .engines import similarity_model_exists
+    if similarity_model_exists():
+        from . import jobs
+        jobs.enqueue('update_item_similarity')
+
+
+@receiver(post_delete, sender=Progress)
+def roll_back_daily_activity(sender, instance, origin=None, **kwargs):
+    """
+    Remove a deleted row's hours and completion from the DailyActivity rollup
+    Skipped when its skill is being deleted, since the rollup rows go with it.
+    """
+    if isinstance(origin, Skill) or getattr(origin, 'model', None) is Skill:
+        return
+    from .activity import record_progress_deletion
+    record_progress_deletion(instance)
+
+
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=Resource)
+@receiver(post_delete, sender=Progress)
+@receiver(post_delete, sender=Certification)
+def log_deletion(sender, instance, **kwargs):
+    """
+    Leave a tombstone for the changes feed
+    """
+    from .changes import record_tombstone
+    record_tombstone(instance)
+
+
+@receiver(m2m_changed, sender=Certification.skills.through)
+def touch_certification_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Bump ``updated_at`` on certifications whose skills changed, so the
+    changes feed picks them up; ``skill.certifications`` edits arrive reversed
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Certification.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        return
+    if action == 'pre_clear':
+        # The ids are gone by post_clear, so remember them here
+        instance._cleared_certification_ids = list(instance.certifications.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if action == 'post_clear':
+            pk_set = instance.__dict__.pop('_cleared_certification_ids', [])
+        Certification.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Progress)
+@receiver(post_save, sender=Resource)
+@receiver(post_delete, sender=Progress)
+@receiver(post_delete, sender=Resource)
+def push_dashboard_update(sender, instance, raw=False, **kwargs):
+    """
+    Wake the owner's dashboard streams; the broker coalesces bursts
+    """
+    if raw:
+        return
+    from .events import broker
+    broker.notify_change(instance.user_id)
+
+
+@receiver(post_save, sender=ProgressNote)
+def index_note_terms(sender, instance, raw=False, **kwargs):
+    """
+    Re-index a progress's notes whenever they are saved
+    """
+    if raw:
+        return
+    from .note_search import index_note
+    index_note(instance)
+
+
+@receiver(post_delete, sender=ProgressNote)
+def drop_note_terms(sender, instance, **kwargs):
+    NoteTerm.objects.filter(progress_id=instance.progress_id).delete()
@@ -0,0 +1,192 @@
+import contextvars
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from django.conf import settings
+from django.db import connections
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalescing stays per process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Share one computation between concurrent identical requests
+
+    Callers of ``do`` with the same key while a computation is running wait
+    for it and get its result (or its exception) instead of computing again.
+    With ``lock_dir`` set, processes also take a file lock per key and reuse a
+    result another process stored while they waited.
+
+    With ``stale_seconds`` above zero the last value of a key is returned
+    straight away while it is younger than that (stale-while-revalidate).
+    Once it is older than ``refresh_seconds`` (half the stale window by
+    default) one background refresh replaces it; further hits start no
+    other refresh of that key until another ``refresh_seconds`` have passed.
+    """
+
+    def __init__(self, lock_dir=None, stale_seconds=0, maxsize=1024, refresh_seconds=None):
+        self.lock_dir = Path(lock_dir) if lock_dir and fcntl is not None else None
+        self.stale_seconds = stale_seconds
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else stale_seconds / 2
+        self.maxsize = maxsize
+        self._calls = {}
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+        self.computations = 0
+        self.shared = 0
+        self.stale_served = 0
+        self.refreshes = 0
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def do(self, key, compute):
+        """
+        Return ``compute()`` for ``key``, sharing a computation already in flight
+        """
+        if self.stale_seconds > 0:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._values.get(key)
+                fresh = entry is not None and now - entry[1] <= self.stale_seconds
+                refresh = fresh and (
+                    now - entry[1] > self.refresh_seconds
+                    and now - entry[2] > self.refresh_seconds
+                    and key not in self._calls
+                )
+                if fresh:
+                    self.stale_served += 1
+                if refresh:
+                    # Claimed under the lock so concurrent hits share one refresh
+                    self._values[key] = (entry[0], entry[1], now)
+                    self.refreshes += 1
+            if refresh:
+                self._revalidate(key, compute)
+            if fresh:
+                return entry[0]
+        return self._join(key, compute)
+
+    def _join(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._compute(key, compute)
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.stale_seconds > 0:
+                    self._values[key] = (call.value, time.monotonic(), float('-inf'))
+                    self._values.move_to_end(key)
+                    while len(self._values) > self.maxsize:
+                        self._values.popitem(last=False)
+            call.done.set()
+        return call.value
+
+    def _compute(self, key, compute):
+        if self.lock_dir is None:
+            with self._lock:
+                self.computations += 1
+            return compute()
+
+        path = self.lock_dir / hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        waiting_since = time.time()
+        with open(path.with_suffix('.lock'), 'a') as lock_file:
+            # Blocks while another process computes the same key
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                shared = self._read_shared(path, waiting_since)
+                if shared is not None:
+                    with self._lock:
+                        self.shared += 1
+                    return shared[0]
+                with self._lock:
+                    self.computations += 1
+                value = compute()
+                self._write_shared(path, value)
+                return value
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_shared(self, path, since):
+        """
+        The value another process stored after ``since``, as a 1-tuple, or None
+        """
+        try:
+            if path.stat().st_mtime < since:
+                return None
+            with open(path, 'rb') as result_file:
+                return (pickle.load(result_file),)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _write_shared(self, path, value):
+        partial = path.with_suffix(f'.{os.getpid()}.partial')
+        try:
+            with open(partial, 'wb') as result_file:
+                pickle.dump(value, result_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # Waiting processes then compute for themselves
+            logger.warning("Could not share single-flight result for %r", path.name, exc_info=True)
+            partial.unlink(missing_ok=True)
+
+    def _revalidate(self, key, compute):
+        # The refresh runs with the caller's context (e.g. analytics routing)
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._refresh, key, compute), daemon=True).start()
+
+    def _refresh(self, key, compute):
+        try:
+            self._join(key, compute)
+        except Exception:
+            logger.exception("Background refresh of %r failed", key)
+        finally:
+            connections.close_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'stored': len(self._values),
+                'computations': self.computations,
+                'shared': self.shared,
+                'stale_served': self.stale_served,
+                'refreshes': self.refreshes,
+            }
+
+dashboard_flight = SingleFlight(
+    lock_dir=getattr(settings, 'SINGLE_FLIGHT_LOCK_DIR', None),
+    stale_seconds=getattr(settings, 'SINGLE_FLIGHT_STALE_SECONDS', 0),
+    refresh_seconds=getattr(settings, 'SINGLE_FLIGHT_REFRESH_SECONDS', None),
+)
@@ -1,3 +1,68 @@
+import re
+from itertools import islice
+
+# Compiled once at import; the summarizer runs on every serialized Progress
+SENTENCE_END = re.compile(r'[.!?]+')
+
+KEY_POINT_PREFIXES = ('-', '*', '•', '1', '2', '3', '4', '5', '6', '7', '8', '9')
+
+# Strings are walked in slices of this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+def _slices(text):
+    for start in range(0, len(text), CHUNK_SIZE):
+        yield text[start:start + CHUNK_SIZE]
+
+
+def _split_lines(text):
+    return text.split('\n')
+
+
+def _iter_segments(source, split):
+    """
+    Yield the stripped, non-empty segments of ``source`` one at a time
+
+    ``source`` is a string or an iterable of string chunks (for example
+    incrementally decompressed notes). Each chunk is split in C, so memory
+    stays proportional to the chunk size rather than to the notes.
+    """
+    if isinstance(source, str):
+        source = _slices(source)
+
+    tail = []
+    for chunk in source:
+        pieces = split(chunk)
+        if len(pieces) == 1:
+            # No separator yet: the segment continues into the next chunk
+            tail.append(chunk)
+            continue
+        tail.append(pieces[0])
+        pieces[0] = ''.join(tail)
+        tail = [pieces.pop()]
+        for piece in pieces:
+            piece = piece.strip()
+            if piece:
+                yield piece
+    piece = ''.join(tail).strip()
+    if piece:
+        yield piece
+
+
+def iter_lines(source):
+    """
+    Non-empty lines of ``source``, stripped
+    """
+    return _iter_segments(source, _split_lines)
+
+
+def iter_sentences(source):
+    """
+    Non-empty sentences of ``source``, split on runs of . ! and ?
+    """
+    return _iter_segments(source, SENTENCE_END.split)
+
+
 class NoteSummarizer:
     """
     A simple note summarization utility
@@ -8,12 +73,13 @@ class NoteSummarizer:
     def summarize_notes(self, notes, max_sentences=3):
         """
         Summarize notes by extracting the most important sentences
+        Stops reading after ``max_sentences + 1`` sentences.
         """
         if not notes:
             return "No notes available."
             
-        # Split notes into sentences
-        sentences = self._split_into_sentences(notes)
+        # One sentence past the limit is enough to know the notes need trimming
+        sentences = list(islice(iter_sentences(notes), max_sentences + 1))
         
         if len(sentences) <= max_sentences:
             return notes
@@ -27,38 +93,36 @@ class NoteSummarizer:
         """
         Split text into sentences
         """
-        import re
-        # Simple sentence splitting - in a real implementation, use NLTK or spaCy
-        sentences = re.split(r'[.!?]+', text)
-        # Remove empty sentences and strip whitespace
-        sentences = [s.strip() for s in sentences if s.strip()]
-        return sentences
+        return list(iter_sentences(text))
     
     def extract_key_points(self, notes, max_points=5):
         """
-        Extract key points from notes
+        Extract key points from notes (a string or an iterable of text chunks)
+        
+        Lines are read one at a time and reading stops as soon as ``max_points``
+        key points are found; only the first ``max_points`` lines are kept
+        for the fallback when the notes have no structured points.
         """
-        if not notes:
+        if not notes or max_points <= 0:
             return []
             
-        # Split into lines and filter out empty lines
-        lines = [line.strip() for line in notes.split('\n') if line.strip()]
-        
-        # Look for lines that start with bullet points or numbers
         key_points = []
-        for line in lines:
-            if line.startswith(('-', '*', '•', '1', '2', '3', '4', '5', '6', '7', '8', '9')):
+        first_lines = []
+        for line in iter_lines(notes):
+            if len(first_lines) < max_points:
+                first_lines.append(line)
+            # Look for lines that start with bullet points or numbers
+            if line.startswith(KEY_POINT_PREFIXES):
                 key_points.append(line.lstrip('-*•0123456789 .'))
             elif ':' in line and len(line) < 100:  # Likely a heading or key point
                 key_points.append(line)
+            else:
+                continue
+            if len(key_points) >= max_points:
+                break
                 
         # If we didn't find structured key points, return the first few lines
-        if not key_points:
-            key_points = lines[:max_points]
-        else:
-            key_points = key_points[:max_points]
-            
-        return key_points
+        return key_points or first_lines
     
     def generate_weekly_summary(self, progress_items):
         """
@@ -1,3 +1,1560 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import LiveServerTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import analytics_db, collaborative, engines, jobs, weekly_summary
+from .dedup import canonicalize_url
+from .events import DashboardBroker, diff_snapshots, make_sse_app
+from .loadtest import discover_resource_ids, parse_mix, percentile, run_stage
+from .note_search import parse_query
+from .renderers import FastJSONRenderer
+from .singleflight import SingleFlight
+from .summarization import NoteSummarizer, iter_lines, iter_sentences
+from .recommendations import RecommendationCache, ResourceRecommender, recommendation_cache
+from .models import (
+    Skill, Resource, Progress, Category, SkillCategory, Certification, Job, WeeklyReport, DailyActivity, ProgressEvent,
+    ProgressNote, NoteTerm, Tombstone,
+)
+
+
+def seed_tracker_data(size):
+    """
+    Create ``size`` skills, each with ``size`` resources (most with progress)
+    and a certification covering every skill
+    """
+    statuses = ['started', 'in_progress', 'completed']
+    category = Category.objects.create(name=f"Category {size}")
+    skills = []
+    for i in range(size):
+        skill = Skill.objects.create(name=f"Skill {i}", target_hours=Decimal('10.00'))
+        SkillCategory.objects.create(skill=skill, category=category)
+        skills.append(skill)
+        for j in range(size):
+            resource = Resource.objects.create(
+                title=f"Resource {i}-{j}",
+                skill=skill,
+                resource_type='course' if j % 2 else 'video',
+                platform='udemy' if j % 2 else 'youtube',
+                url=f"https://example.com/{i}/{j}",
+            )
+            if j % 4 != 3:
+                Progress.objects.create(
+                    resource=resource,
+                    status=statuses[j % 3],
+                    hours_spent=Decimal('1.50'),
+                    notes="- First point\n- Second point\nSome closing sentence.",
+                )
+    for i in range(size):
+        certification = Certification.objects.create(
+            name=f"Certification {i}",
+            issuing_organization="Org",
+            issue_date=date(2024, 1, 1),
+        )
+        certification.skills.set(skills)
+    return skills
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every endpoint must issue a constant number of queries regardless of how
+    many rows it renders. Sizes stay below PAGE_SIZE so list endpoints render
+    every seeded row.
+    """
+
+    small = 2
+    large = 3
+
+    def setUp(self):
+        self.client = APIClient()
+        recommendation_cache.clear()
+
+    def count_queries(self, method, url_for, size):
+        seed_tracker_data(size)
+        url = url_for()
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url)
+        self.assertLess(response.status_code, 400, response.content)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, method, url_for):
+        small = self.count_queries(method, url_for, self.small)
+        # Start over with a larger dataset inside the same test transaction
+        Category.objects.all().delete()
+        Skill.objects.all().delete()
+        Certification.objects.all().delete()
+        large = self.count_queries(method, url_for, self.large)
+        self.assertEqual(
+            small, large,
+            f"{method.upper()} {url_for()} issued {small} queries for size {self.small} "
+            f"but {large} for size {self.large}"
+        )
+
+    def first_resource_url(self, suffix=''):
+        return lambda: f"/api/resources/{Resource.objects.order_by('id').first().id}/{suffix}"
+
+    def first_skill_url(self, suffix=''):
+        return lambda: f"/api/skills/{Skill.objects.order_by('id').first().id}/{suffix}"
+
+    def test_resources_list(self):
+        self.assertConstantQueries('get', lambda: '/api/resources/')
+
+    def test_resource_detail(self):
+        self.assertConstantQueries('get', self.first_resource_url())
+
+    def test_resources_recommend(self):
+        self.assertConstantQueries('get', lambda: '/api/resources/recommend/')
+
+    def test_progress_list(self):
+        self.assertConstantQueries('get', lambda: '/api/progress/')
+
+    def test_progress_weekly_summary(self):
+        self.assertConstantQueries('get', lambda: '/api/progress/weekly_summary/')
+
+    def test_skills_list(self):
+        self.assertConstantQueries('get', lambda: '/api/skills/')
+
+    def test_skill_detail(self):
+        self.assertConstantQueries('get', self.first_skill_url())
+
+    def test_skill_recommend_resources(self):
+        self.assertConstantQueries('get', self.first_skill_url('recommend_resources/'))
+
+    def test_certifications_list(self):
+        self.assertConstantQueries('get', lambda: '/api/certifications/')
+
+    def test_dashboard_stats(self):
+        self.assertConstantQueries('get', lambda: '/api/dashboard/stats/')
+
+    def test_dashboard_skills_breakdown(self):
+        self.assertConstantQueries('get', lambda: '/api/dashboard/skills_breakdown/')
+
+    def test_dashboard_recommendations(self):
+        self.assertConstantQueries('get', lambda: '/api/dashboard/recommendations/')
+
+    def test_certifications_expiring(self):
+        self.assertConstantQueries('get', lambda: '/api/certifications/expiring/?days=36500')
+
+    def test_skill_coverage(self):
+        self.assertConstantQueries('get', lambda: '/api/skills/coverage/')
+
+    def test_dashboard_categories_breakdown(self):
+        self.assertConstantQueries('get', lambda: '/api/dashboard/categories_breakdown/')
+
+    def test_dashboard_categories_rollup(self):
+        self.assertConstantQueries('get', lambda: '/api/dashboard/categories_rollup/')
+
+    def test_dashboard_bootstrap(self):
+        self.assertConstantQueries('get', lambda: '/api/dashboard/bootstrap/')
+
+    def test_dashboard_bootstrap_shares_queries_between_sections(self):
+        seed_tracker_data(self.large)
+        sections = ['/api/dashboard/stats/', '/api/dashboard/skills_breakdown/',
+                    '/api/dashboard/recommendations/', '/api/progress/weekly_summary/']
+        separate = {}
+        for url in sections:
+            recommendation_cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                separate[url] = self.client.get(url).json()
+            separate[url + ' queries'] = len(ctx.captured_queries)
+        with CaptureQueriesContext(connection) as ctx:
+            bootstrap = self.client.get('/api/dashboard/bootstrap/').json()
+        self.assertLessEqual(len(ctx.captured_queries), 3)
+        self.assertLess(len(ctx.captured_queries) * 3, sum(separate[url + ' queries'] for url in sections))
+        self.assertEqual(bootstrap['stats'], separate[sections[0]])
+        self.assertEqual(bootstrap['skills_breakdown'], separate[sections[1]])
+        self.assertEqual(bootstrap['recommendations'], separate[sections[2]])
+        self.assertEqual(bootstrap['weekly_summary'], separate[sections[3]])
+
+
+class CertificationExpiryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        today = timezone.now().date()
+        self.expired = Certification.objects.create(
+            name="Expired", issuing_organization="Org", issue_date=date(2020, 1, 1),
+            expiration_date=today - timedelta(days=1)
+        )
+        self.soon = Certification.objects.create(
+            name="Soon", issuing_organization="Org", issue_date=date(2020, 1, 1),
+            expiration_date=today + timedelta(days=10)
+        )
+        self.later = Certification.objects.create(
+            name="Later", issuing_organization="Org", issue_date=date(2020, 1, 1),
+            expiration_date=today + timedelta(days=100)
+        )
+        self.permanent = Certification.objects.create(
+            name="Permanent", issuing_organization="Org", issue_date=date(2020, 1, 1)
+        )
+
+    def names(self, response):
+        return {item['name'] for item in response.data['results']}
+
+    def test_expiring_window(self):
+        response = self.client.get('/api/certifications/expiring/?days=30')
+        self.assertEqual(self.names(response), {"Soon"})
+
+    def test_status_filters(self):
+        expired = self.client.get('/api/certifications/?status=expired')
+        active = self.client.get('/api/certifications/?status=active')
+        self.assertEqual(self.names(expired), {"Expired"})
+        self.assertEqual(self.names(active), {"Soon", "Later", "Permanent"})
+
+    def test_expiring_honours_status_filter(self):
+        self.assertEqual(self.names(self.client.get('/api/certifications/expiring/?days=365&status=active')), {"Soon", "Later"})
+        self.assertEqual(self.names(self.client.get('/api/certifications/expiring/?days=365&status=expired')), set())
+
+    def test_invalid_days(self):
+        response = self.client.get('/api/certifications/expiring/?days=soon')
+        self.assertEqual(response.status_code, 400)
+
+
+class SkillCoverageTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        seed_tracker_data(2)
+
+    def test_coverage_figures(self):
+        response = self.client.get('/api/skills/coverage/')
+        row = next(item for item in response.data if item['skill_name'] == "Skill 0")
+        self.assertEqual(row['certification_count'], 2)
+        self.assertEqual(row['resource_count'], 2)
+        self.assertEqual(row['completed_resource_count'], 0)
+        self.assertEqual(row['completed_hours'], 0.0)
+        self.assertEqual(row['percent_to_target'], 0.0)
+
+    def test_only_completed_hours_count_toward_target(self):
+        skill = Skill.objects.get(name="Skill 0")
+        resource = Resource.objects.create(skill=skill, title="Done", resource_type='book', platform='other')
+        Progress.objects.create(resource=resource, status='completed', hours_spent=Decimal('4'))
+        row = next(item for item in self.client.get('/api/skills/coverage/').data if item['skill_name'] == "Skill 0")
+        self.assertEqual(row['completed_resource_count'], 1)
+        self.assertEqual(row['completed_hours'], 4.0)
+        self.assertEqual(row['percent_to_target'], 40.0)
+
+    def test_coverage_csv(self):
+        response = self.client.get('/api/skills/coverage/?output=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = response.content.decode().strip().splitlines()
+        self.assertEqual(lines[0].split(',')[0], 'skill_id')
+        self.assertEqual(len(lines), 3)
+
+
+class CategoriesBreakdownTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        skills = seed_tracker_data(2)
+        # Put the first skill in a second category as well
+        SkillCategory.objects.create(skill=skills[0], category=Category.objects.create(name="Extra"))
+
+    def test_per_category_counts(self):
+        response = self.client.get('/api/dashboard/categories_breakdown/')
+        by_name = {item['name']: item for item in response.data}
+        self.assertEqual(by_name["Category 2"]['skill_count'], 2)
+        self.assertEqual(by_name["Category 2"]['resource_count'], 4)
+        self.assertEqual(by_name["Category 2"]['hours_spent'], 6.0)
+        self.assertEqual(by_name["Extra"]['resource_count'], 2)
+
+    def test_rollup_does_not_double_count(self):
+        rollup = self.client.get('/api/dashboard/categories_rollup/').data
+        self.assertEqual(rollup['skill_count'], 2)
+        self.assertEqual(rollup['resource_count'], 4)
+        self.assertEqual(rollup['hours_spent'], 6.0)
+
+    def test_rollup_counts_categorized_skills_without_resources(self):
+        skill = Skill.objects.create(name="Unstarted")
+        SkillCategory.objects.create(skill=skill, category=Category.objects.get(name="Extra"))
+        self.assertEqual(self.client.get('/api/dashboard/categories_rollup/').data['skill_count'], 3)
+        self.assertIsInstance(self.client.get('/api/dashboard/categories_breakdown/?rollup=true').data, list)
+
+
+class UserScopingTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.alice_skill = Skill.objects.create(user=self.alice, name="Alice skill")
+        self.bob_skill = Skill.objects.create(user=self.bob, name="Bob skill")
+        self.alice_resource = Resource.objects.create(
+            user=self.alice, skill=self.alice_skill, title="Alice resource",
+            resource_type='video', platform='youtube'
+        )
+        Resource.objects.create(
+            user=self.bob, skill=self.bob_skill, title="Bob resource",
+            resource_type='video', platform='youtube'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_lists_are_scoped_to_request_user(self):
+        response = self.client.get('/api/resources/')
+        self.assertEqual([item['title'] for item in response.data['results']], ["Alice resource"])
+        self.assertEqual(self.client.get('/api/dashboard/stats/').data['total_resources'], 1)
+
+    def test_anonymous_callers_see_unowned_rows(self):
+        Skill.objects.create(name="Shared skill")
+        response = APIClient().get('/api/skills/')
+        self.assertEqual([item['name'] for item in response.data['results']], ["Shared skill"])
+
+    def test_create_stamps_owner_and_rejects_foreign_relations(self):
+        response = self.client.post('/api/resources/', {
+            'title': "New", 'skill': self.alice_skill.id, 'resource_type': 'book', 'platform': 'other'
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Resource.objects.get(id=response.data['id']).user, self.alice)
+        
+        response = self.client.post('/api/resources/', {
+            'title': "Sneaky", 'skill': self.bob_skill.id, 'resource_type': 'book', 'platform': 'other'
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_progress_inherits_resource_owner(self):
+        self.client.post(f'/api/resources/{self.alice_resource.id}/start_learning/')
+        self.assertEqual(Progress.objects.get(resource=self.alice_resource).user, self.alice)
+
+    def test_assign_owner_claims_unowned_rows(self):
+        skill = Skill.objects.create(name="Legacy skill")
+        resource = Resource.objects.create(skill=skill, title="Legacy", resource_type='book', platform='other')
+        Progress.objects.create(resource=resource, status='completed', hours_spent=Decimal('2'))
+        call_command('assign_owner', '--username', 'alice', '--dry-run', stdout=StringIO())
+        self.assertFalse(Skill.objects.owned_by(self.alice).filter(pk=skill.pk).exists())
+
+        call_command('assign_owner', '--username', 'alice', stdout=StringIO())
+        titles = [item['title'] for item in self.client.get('/api/resources/').data['results']]
+        self.assertEqual(sorted(titles), ["Alice resource", "Legacy"])
+        self.assertEqual(self.client.get('/api/dashboard/activity/').data['active_days'], 1)
+        self.assertFalse(Progress.objects.owned_by(None).exists())
+        self.assertEqual(Skill.objects.get(pk=self.bob_skill.pk).user, self.bob)
+        with self.assertRaises(CommandError):
+            call_command('assign_owner', '--username', 'nobody', stdout=StringIO())
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.calls = 0
+
+        def flaky(user_id=None):
+            self.calls += 1
+            raise RuntimeError("boom")
+
+        jobs.TASKS['test_flaky'] = flaky
+        self.addCleanup(jobs.TASKS.pop, 'test_flaky')
+
+    def test_identical_pending_jobs_are_deduplicated(self):
+        first, created = jobs.enqueue('recommendations', {'limit': 3})
+        second, created_again = jobs.enqueue('recommendations', {'limit': 3})
+        third, _ = jobs.enqueue('recommendations', {'limit': 4})
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first.id, second.id)
+        self.assertNotEqual(first.id, third.id)
+
+    def test_worker_runs_job_and_records_result(self):
+        seed_tracker_data(2)
+        job, _ = jobs.enqueue('recommendations', {'limit': 2})
+        self.assertEqual(jobs.work(stop_when_idle=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(len(job.result['resources']), 2)
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        job, _ = jobs.enqueue('test_flaky', max_attempts=2)
+        with self.assertLogs('tracker.jobs', level='ERROR'):
+            jobs.run_job(jobs.claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        with self.assertLogs('tracker.jobs', level='ERROR'):
+            jobs.run_job(jobs.claim_job())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, self.calls), ('failed', 2, 2))
+
+    def test_enqueue_and_poll_over_api(self):
+        response = self.client.post('/api/jobs/', {'kind': 'weekly_summary'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        jobs.work(stop_when_idle=True)
+        response = self.client.get(f"/api/jobs/{response.data['id']}/")
+        self.assertEqual(response.data['status'], 'succeeded')
+        self.assertIn('summary', response.data['result'])
+
+    def test_unknown_kind_is_rejected(self):
+        response = self.client.post('/api/jobs/', {'kind': 'nope'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_payload_must_match_task_arguments(self):
+        for payload in ({'user_id': 5}, {'limit': 2, 'extra': 1}):
+            with self.assertRaises(ValueError):
+                jobs.enqueue('recommendations', payload)
+        with self.assertRaises(ValueError):
+            jobs.enqueue('progress_summary')
+        response = self.client.post('/api/jobs/', {'kind': 'weekly_summary', 'payload': {'user_id': 1}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOB_LEASE_SECONDS=60)
+    def test_jobs_of_crashed_workers_are_reclaimed_after_the_lease(self):
+        job, _ = jobs.enqueue('recommendations', {'limit': 1}, max_attempts=2)
+        jobs.claim_job()
+        self.assertIsNone(jobs.claim_job())
+
+        Job.objects.filter(id=job.id).update(started_at=timezone.now() - timedelta(seconds=61))
+        with self.assertLogs('tracker.jobs', level='WARNING'):
+            reclaimed = jobs.claim_job()
+        self.assertEqual((reclaimed.id, reclaimed.status, reclaimed.attempts), (job.id, 'running', 2))
+
+        Job.objects.filter(id=job.id).update(started_at=timezone.now() - timedelta(seconds=61))
+        with self.assertLogs('tracker.jobs', level='WARNING'):
+            self.assertIsNone(jobs.claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+
+
+class WeeklyReportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        skill = Skill.objects.create(user=self.user, name="Python")
+        resource = Resource.objects.create(
+            user=self.user, skill=skill, title="Course", resource_type='course', platform='udemy'
+        )
+        Progress.objects.create(user=self.user, resource=resource, status='completed', hours_spent=Decimal('4'))
+
+    def generate(self, *args):
+        call_command('generate_weekly_summary', *args, stdout=StringIO())
+
+    def test_backfill_is_idempotent(self):
+        today = timezone.now().date()
+        since = (today - timedelta(days=14)).isoformat()
+        self.generate('--since', since)
+        self.assertEqual(WeeklyReport.objects.filter(user=self.user).count(), 3)
+
+        self.generate('--since', since, '--only-missing')
+        self.generate('--since', since)
+        self.assertEqual(WeeklyReport.objects.filter(user=self.user).count(), 3)
+
+        current = WeeklyReport.objects.get(user=self.user, week_start=today - timedelta(days=today.weekday()))
+        self.assertEqual(current.stats['completed_count'], 1)
+        self.assertEqual(current.stats['total_hours'], 4.0)
+
+    def test_reports_api_returns_stored_reports_for_owner(self):
+        self.generate('--by', 'skill')
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/weekly-reports/?scope=skill')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['skill_name'], "Python")
+        self.assertEqual(len(APIClient().get('/api/weekly-reports/').data['results']), 0)
+
+    def test_invalid_filters_are_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for params in ({'skill': 'abc'}, {'since': '2026-13-40'}, {'until': 'soon'}):
+            self.assertEqual(client.get('/api/weekly-reports/', params).status_code, 400)
+        self.assertEqual(client.get('/api/weekly-reports/', {'since': '2026-01-05'}).status_code, 200)
+
+
+class CollaborativeFilteringTests(TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir, ignore_errors=True)
+        override = override_settings(ITEM_SIMILARITY_DIR=self.model_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create(username='learner')
+        skills = [Skill.objects.create(name="Data"), Skill.objects.create(name="Web")]
+        self.resources = [
+            Resource.objects.create(skill=skills[i // 2], title=f"R{i}", resource_type='course', platform='udemy')
+            for i in range(4)
+        ]
+        # R0 and R1 share both the learner and the skill; R2 shares only the learner
+        for resource in self.resources[:3]:
+            Progress.objects.create(user=self.user, resource=resource, status='completed')
+
+    def train(self, *args):
+        call_command('train_item_similarity', *args, stdout=StringIO())
+        return collaborative.get_model()
+
+    def test_similar_resources_rank_by_co_completion(self):
+        model = self.train()
+        neighbors = model.similar(self.resources[0].id)
+        self.assertEqual(neighbors, [(self.resources[1].id, 1.0), (self.resources[2].id, 0.5)])
+
+        response = APIClient().get(f'/api/resources/{self.resources[0].id}/similar/')
+        self.assertEqual(response.data[0]['id'], self.resources[1].id)
+        self.assertEqual(len(APIClient().get(f'/api/resources/{self.resources[0].id}/similar/', {'limit': -3}).data), 1)
+        self.assertEqual(len(APIClient().get(f'/api/resources/{self.resources[0].id}/similar/', {'limit': 10**6}).data), 2)
+
+    def test_incremental_update_matches_full_rebuild(self):
+        self.train()
+        Progress.objects.create(resource=self.resources[3], status='completed')
+        self.assertTrue(Job.objects.filter(kind='update_item_similarity', status='pending').exists())
+
+        incremental = self.train('--incremental')
+        full = collaborative.ItemSimilarityModel(collaborative.save_model(*collaborative.ItemSimilarityTrainer().train()))
+        for name in ('item_ids', 'item_counts', 'pair_left', 'pair_right', 'pair_counts'):
+            np.testing.assert_array_equal(incremental.arrays[name], full.arrays[name])
+
+    def test_only_new_completions_queue_an_update(self):
+        self.train()
+        completed = Progress.objects.filter(status='completed').first()
+        completed.hours_spent = Decimal('2')
+        completed.notes = "Edited notes"
+        completed.save()
+        self.assertFalse(Job.objects.filter(kind='update_item_similarity').exists())
+
+        progress = Progress.objects.create(resource=self.resources[3], status='started')
+        self.assertFalse(Job.objects.filter(kind='update_item_similarity').exists())
+        progress.status = 'completed'
+        progress.save()
+        self.assertTrue(Job.objects.filter(kind='update_item_similarity', status='pending').exists())
+
+    def test_incremental_update_truncates_merged_baskets(self):
+        trainer = collaborative.ItemSimilarityTrainer(max_basket_size=2)
+        model = collaborative.ItemSimilarityModel(collaborative.save_model(*trainer.train()))
+        Progress.objects.create(user=self.user, resource=self.resources[3], status='completed')
+        arrays, _ = trainer.update(model)
+        full, _ = trainer.train()
+
+        def pairs(arrays, resource):
+            return {
+                (int(left), int(right)): int(count)
+                for left, right, count in zip(arrays['pair_left'], arrays['pair_right'], arrays['pair_counts'])
+                if resource in (left, right)
+            }
+
+        # R3 joins the learner's basket [R1, R2] + [R3] trimmed to [R2, R3], so it never pairs with R1
+        r1, r2, r3 = (resource.id for resource in self.resources[1:])
+        self.assertEqual(pairs(arrays, r3), pairs(full, r3))
+        self.assertEqual(pairs(arrays, r3), {(r2, r3): 2})
+        # The R1-R2 pair counted before R1 dropped out stays until the next full train
+        self.assertEqual(pairs(arrays, r1).get((r1, r2)), 1)
+        self.assertNotIn((r1, r2), pairs(full, r1))
+
+
+class RecommendationCacheTests(TestCase):
+    def setUp(self):
+        seed_tracker_data(2)
+        self.cache = RecommendationCache(maxsize=2, ttl=60)
+        self.recommender = ResourceRecommender(cache=self.cache)
+
+    def test_repeat_calls_hit_cache_until_data_changes(self):
+        first = self.recommender.recommend_resources(limit=3)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.recommender.recommend_resources(limit=3)
+        self.assertEqual(first, second)
+        self.assertEqual(len(ctx.captured_queries), 1)  # version check only
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+        Progress.objects.filter(status='started').update(status='completed', updated_at=timezone.now())
+        self.recommender.recommend_resources(limit=3)
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+    def test_lru_eviction_and_ttl(self):
+        for limit in (1, 2, 3):
+            self.recommender.recommend_resources(limit=limit)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+        self.cache.ttl = 0
+        self.recommender.recommend_resources(limit=4)
+        self.recommender.recommend_resources(limit=4)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+
+    def test_edits_without_updated_at_bumps_invalidate(self):
+        self.recommender.recommend_resources(limit=3)
+        Progress.objects.filter(status='started').update(status='completed')
+        self.recommender.recommend_resources(limit=3)
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+        skill = Skill.objects.get(name="Skill 0")
+        skill.name = "Renamed"
+        skill.save()
+        self.recommender.recommend_resources(limit=3)
+        self.assertEqual(self.cache.stats()['invalidations'], 2)
+
+    def test_stats_endpoint(self):
+        response = APIClient().get('/api/dashboard/recommendation_cache_stats/')
+        self.assertIn('hit_rate', response.data)
+
+
+class DailyActivityTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        self.skill = Skill.objects.create(user=self.user, name="Go")
+        self.resource = Resource.objects.create(
+            user=self.user, skill=self.skill, title="Tour", resource_type='tutorial', platform='other'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_progress_changes_roll_up_incrementally(self):
+        progress = Progress.objects.create(resource=self.resource, status='started', hours_spent=Decimal('1.5'))
+        progress.hours_spent = Decimal('4')
+        progress.status = 'completed'
+        progress.save()
+        # Re-saving without changes must not double count
+        Progress.objects.get(pk=progress.pk).save()
+
+        activity = DailyActivity.objects.get(skill=self.skill, date=timezone.localdate())
+        self.assertEqual((activity.hours, activity.completions), (Decimal('4'), 1))
+
+    def test_deleting_progress_rolls_back_its_activity(self):
+        completed = Progress.objects.create(resource=self.resource, status='completed', hours_spent=Decimal('3'))
+        other = Resource.objects.create(user=self.user, skill=self.skill, title="Blog", resource_type='article', platform='other')
+        Progress.objects.create(resource=other, status='started', hours_spent=Decimal('1'))
+        Progress.objects.get(pk=completed.pk).delete()
+        activity = DailyActivity.objects.get(skill=self.skill, date=timezone.localdate())
+        self.assertEqual((activity.hours, activity.completions), (Decimal('1'), 0))
+
+        other.delete()
+        activity.refresh_from_db()
+        self.assertEqual((activity.hours, activity.completions), (Decimal('0'), 0))
+        # Deleting the skill removes its rollup rows instead of adjusting them
+        Progress.objects.create(resource=self.resource, status='completed', hours_spent=Decimal('2'))
+        self.skill.delete()
+        self.assertFalse(DailyActivity.objects.exists())
+
+    def test_deleting_older_progress_leaves_todays_streak(self):
+        earlier = timezone.now() - timedelta(days=3)
+        old = Progress.objects.create(resource=self.resource, status='completed', hours_spent=Decimal('3'),
+                                      completed_at=earlier)
+        Progress.objects.filter(pk=old.pk).update(updated_at=earlier)
+        # Only part of the hours were rolled up on that day; the rest must not go negative
+        DailyActivity.objects.filter(skill=self.skill).update(date=timezone.localdate(earlier), hours=Decimal('2'))
+        other = Resource.objects.create(user=self.user, skill=self.skill, title="Blog", resource_type='article', platform='other')
+        Progress.objects.create(resource=other, status='started', hours_spent=Decimal('1'))
+
+        Progress.objects.get(pk=old.pk).delete()
+        rows = dict(DailyActivity.objects.values_list('date', 'hours'))
+        self.assertEqual(rows, {timezone.localdate(earlier): Decimal('0'), timezone.localdate(): Decimal('1')})
+        self.assertEqual(DailyActivity.objects.get(date=timezone.localdate(earlier)).completions, 0)
+        calendar = self.client.get('/api/dashboard/activity/').data
+        self.assertEqual((calendar['current_streak'], calendar['active_days']), (1, 1))
+
+    def test_calendar_and_streaks(self):
+        today = timezone.localdate()
+        for offset in (0, 1, 2, 5, 6, 7, 8):
+            DailyActivity.objects.create(
+                user=self.user, skill=self.skill, date=today - timedelta(days=offset), hours=Decimal('1')
+            )
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/dashboard/activity/')
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.data['current_streak'], 3)
+        self.assertEqual(response.data['longest_streak'], 4)
+        self.assertEqual(response.data['active_days'], 7)
+
+    def test_rebuild_matches_incremental(self):
+        Progress.objects.create(resource=self.resource, status='completed', hours_spent=Decimal('2'),
+                                completed_at=timezone.now())
+        incremental = list(DailyActivity.objects.values_list('date', 'hours', 'completions'))
+        call_command('rebuild_activity', stdout=StringIO())
+        self.assertEqual(list(DailyActivity.objects.values_list('date', 'hours', 'completions')), incremental)
+
+
+@override_settings(CHANGES_FEED_OVERLAP_SECONDS=0)
+class ChangesFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.skill = Skill.objects.create(user=self.user, name="Rust")
+        self.resource = Resource.objects.create(
+            user=self.user, skill=self.skill, title="Book", resource_type='book', platform='other'
+        )
+        Skill.objects.create(name="Someone else's")
+
+    def test_initial_sync_then_delta(self):
+        initial = self.client.get('/api/changes/').data
+        self.assertEqual([row['name'] for row in initial['changes']['skills']], ["Rust"])
+        self.assertEqual(len(initial['changes']['resources']), 1)
+
+        Progress.objects.create(resource=self.resource, status='started')
+        delta = self.client.get('/api/changes/', {'since': initial['cursor'].isoformat()}).data
+        self.assertEqual(len(delta['changes']['progress']), 1)
+        self.assertEqual(delta['changes']['skills'], [])
+        self.assertEqual(delta['changes']['resources'], [])
+
+    def test_deletions_produce_tombstones(self):
+        cursor = self.client.get('/api/changes/').data['cursor']
+        skill_id, resource_id = self.skill.id, self.resource.id
+        self.skill.delete()
+        delta = self.client.get('/api/changes/', {'since': cursor.isoformat()}).data
+        self.assertEqual(delta['deleted']['skills'], [skill_id])
+        self.assertEqual(delta['deleted']['resources'], [resource_id])
+
+    def test_limit_sets_has_more(self):
+        Skill.objects.create(user=self.user, name="Zig")
+        page = self.client.get('/api/changes/', {'limit': 1}).data
+        self.assertTrue(page['has_more'])
+        self.assertEqual(len(page['changes']['skills']), 1)
+
+    def test_pages_through_rows_sharing_a_timestamp(self):
+        for i in range(30):
+            Skill.objects.create(user=self.user, name=f"Skill {i}")
+        stamp = timezone.now()
+        Skill.objects.owned_by(self.user).update(updated_at=stamp)
+        since = (stamp - timedelta(minutes=1)).isoformat()
+        seen, params = [], {'since': since, 'limit': 10}
+        for _ in range(10):
+            page = self.client.get('/api/changes/', params).data
+            seen.extend(row['id'] for row in page['changes']['skills'])
+            if not page['has_more']:
+                break
+            params = {'page': page['next_page'], 'limit': 10}
+        self.assertFalse(page['has_more'])
+        self.assertEqual(sorted(seen), sorted(Skill.objects.owned_by(self.user).values_list('id', flat=True)))
+        self.assertEqual(len(seen), 31)
+
+    def test_certification_skill_changes_bump_updated_at(self):
+        certification = Certification.objects.create(user=self.user, name="Cert", issuing_organization="Org",
+                                                     issue_date=date.today())
+        cursor = self.client.get('/api/changes/').data['cursor']
+        certification.skills.add(self.skill)
+        delta = self.client.get('/api/changes/', {'since': cursor.isoformat()}).data
+        self.assertEqual([row['id'] for row in delta['changes']['certifications']], [certification.id])
+
+        Certification.objects.filter(pk=certification.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        cursor = self.client.get('/api/changes/').data['cursor']
+        self.skill.certifications.clear()
+        delta = self.client.get('/api/changes/', {'since': cursor.isoformat()}).data
+        self.assertEqual([row['id'] for row in delta['changes']['certifications']], [certification.id])
+
+    @override_settings(TOMBSTONE_RETENTION_DAYS=7)
+    def test_stale_cursor_gets_full_resync_and_tombstones_are_pruned(self):
+        Tombstone.objects.create(user=self.user, model='skills', object_id=999,
+                                 deleted_at=timezone.now() - timedelta(days=8))
+        Tombstone.objects.create(user=self.user, model='skills', object_id=1000)
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [1000])
+
+        stale = self.client.get('/api/changes/', {'since': (timezone.now() - timedelta(days=8)).isoformat()}).data
+        self.assertTrue(stale['resync'])
+        self.assertEqual([row['name'] for row in stale['changes']['skills']], ["Rust"])
+        fresh = self.client.get('/api/changes/', {'since': (timezone.now() - timedelta(days=1)).isoformat()}).data
+        self.assertFalse(fresh['resync'])
+        self.assertEqual(fresh['deleted']['skills'], [1000])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/changes/', {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/changes/', {'page': 'forged'}).status_code, 400)
+
+
+class DashboardStreamTests(TestCase):
+    def setUp(self):
+        self.version = 0
+
+        def compute(owner_id):
+            return {
+                'stats': {'total_skills': 1, 'version': self.version},
+                'skills_breakdown': [{'id': 1, 'name': 'Rust', 'version': self.version}],
+            }
+
+        self.broker = DashboardBroker(compute=compute, coalesce_seconds=0.01)
+
+    def test_bursts_are_coalesced_into_one_delta(self):
+        async def scenario():
+            queue, snapshot = await self.broker.subscribe(None)
+            self.assertEqual(snapshot['stats']['version'], 0)
+            self.version = 1
+            for _ in range(20):
+                self.broker.notify_change(None)
+            event, delta = await asyncio.wait_for(queue.get(), timeout=2)
+            await asyncio.sleep(0.05)
+            return event, delta, queue.qsize()
+
+        event, delta, remaining = asyncio.run(scenario())
+        self.assertEqual(event, 'delta')
+        self.assertEqual(delta['stats'], {'version': 1})
+        self.assertEqual(delta['skills'], [{'id': 1, 'name': 'Rust', 'version': 1}])
+        self.assertEqual(remaining, 0)
+        # Initial snapshot plus a single recompute for the whole burst
+        self.assertEqual(self.broker.recomputations, 2)
+
+    def test_notify_without_subscribers_is_noop(self):
+        self.broker.notify_change(None)
+        self.assertEqual(self.broker.recomputations, 0)
+
+    def sse_scope(self, *headers):
+        return {'type': 'http', 'method': 'GET', 'path': '/api/dashboard/stream/', 'headers': list(headers)}
+
+    def session_cookie(self, user):
+        self.client.force_login(user)
+        return (b'cookie', f"{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}".encode())
+
+    # Sessions are read from another thread, which cannot see the test transaction
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_sse_app_streams_snapshot_then_delta(self):
+        user = User.objects.create(username='streamer')
+        app = make_sse_app(self.broker)
+        sent = []
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+            if len(sent) == 2:
+                self.version = 1
+                self.broker.notify_change(user.pk)
+            elif len(sent) == 3:
+                disconnect.set()
+
+        scope = self.sse_scope(self.session_cookie(user), (b'origin', b'http://localhost:5173'))
+        asyncio.run(asyncio.wait_for(app(scope, receive, send), timeout=2))
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        self.assertIn((b'access-control-allow-origin', b'http://localhost:5173'), sent[0]['headers'])
+        self.assertIn((b'access-control-allow-credentials', b'true'), sent[0]['headers'])
+        self.assertTrue(sent[1]['body'].startswith(b'event: snapshot\n'))
+        self.assertTrue(sent[2]['body'].startswith(b'event: delta\n'))
+        self.assertEqual(self.broker.subscribers, {})
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_sse_app_rejects_anonymous_and_foreign_origins(self):
+        app = make_sse_app(self.broker)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = self.sse_scope((b'origin', b'http://evil.example'), (b'cookie', b'sessionid=expired'))
+        asyncio.run(asyncio.wait_for(app(scope, None, send), timeout=2))
+        self.assertEqual(sent[0]['status'], 401)
+        self.assertNotIn(b'access-control-allow-origin', dict(sent[0]['headers']))
+        self.assertEqual(self.broker.subscribers, {})
+
+    def test_diff_reports_removed_skills(self):
+        old = {'stats': {'a': 1}, 'skills_breakdown': [{'id': 1}, {'id': 2}]}
+        new = {'stats': {'a': 1}, 'skills_breakdown': [{'id': 1}]}
+        self.assertEqual(diff_snapshots(old, new), {'stats': {}, 'skills': [], 'removed_skills': [2]})
+        self.assertIsNone(diff_snapshots(new, new))
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.skill = Skill.objects.create(user=self.user, name="Rust")
+        self.resources = [
+            Resource.objects.create(user=self.user, skill=self.skill, title=f"Chapter {i}", resource_type='book', platform='other')
+            for i in range(4)
+        ]
+        Progress.objects.create(resource=self.resources[0], status='started')
+        self.foreign = Resource.objects.create(skill=Skill.objects.create(name="Other"), title="Theirs",
+                                               resource_type='book', platform='other')
+
+    def ids(self):
+        return [resource.id for resource in self.resources]
+
+    def test_bulk_mark_complete_reports_each_id(self):
+        response = self.client.post('/api/resources/bulk_mark_complete/',
+                                    {'resource_ids': self.ids() + [self.foreign.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        results = {row['resource_id']: row['result'] for row in response.data['results']}
+        self.assertEqual(results[self.resources[0].id], 'updated')
+        self.assertEqual(results[self.resources[1].id], 'created')
+        self.assertEqual(results[self.foreign.id], 'not_found')
+        self.assertEqual(Progress.objects.filter(status='completed', user=self.user).count(), 4)
+        self.assertIsNotNone(Progress.objects.get(resource=self.resources[0]).completed_at)
+        self.assertEqual(DailyActivity.objects.get(skill=self.skill).completions, 4)
+
+    def test_restarting_completed_resources_reverses_completions(self):
+        self.client.post('/api/resources/bulk_mark_complete/', {'resource_ids': self.ids()}, format='json')
+        before = Progress.objects.get(resource=self.resources[0]).updated_at
+        self.client.post('/api/resources/bulk_start_learning/', {'resource_ids': self.ids()[:2]}, format='json')
+        self.assertEqual(DailyActivity.objects.get(skill=self.skill).completions, 2)
+        self.assertGreater(Progress.objects.get(resource=self.resources[0]).updated_at, before)
+
+    def test_query_count_does_not_grow_with_ids(self):
+        for i in range(20):
+            Resource.objects.create(user=self.user, skill=self.skill, title=f"Extra {i}", resource_type='book', platform='other')
+        all_ids = list(Resource.objects.filter(user=self.user).order_by('id').values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as few:
+            self.client.post('/api/resources/bulk_start_learning/', {'resource_ids': all_ids[:3]}, format='json')
+        with CaptureQueriesContext(connection) as many:
+            self.client.post('/api/resources/bulk_start_learning/', {'resource_ids': all_ids}, format='json')
+        self.assertEqual(len(many), len(few))
+
+    def test_rejects_invalid_ids(self):
+        for payload in [{}, {'resource_ids': []}, {'resource_ids': ['1']}, {'resource_ids': 3}]:
+            response = self.client.post('/api/resources/bulk_mark_complete/', payload, format='json')
+            self.assertEqual(response.status_code, 400)
+
+
+class LogHoursTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.skill = Skill.objects.create(user=self.user, name="Rust")
+        resource = Resource.objects.create(user=self.user, skill=self.skill, title="Book", resource_type='book', platform='other')
+        self.progress = Progress.objects.create(resource=resource, status='started', hours_spent=Decimal('1.50'))
+        self.url = f'/api/progress/{self.progress.id}/log_hours/'
+
+    def test_increments_and_advances_status(self):
+        response = self.client.post(self.url, {'hours': '2.25', 'note': 'Chapter 3'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'in_progress')
+        self.assertEqual(Decimal(response.data['hours_spent']), Decimal('3.75'))
+        event = ProgressEvent.objects.get(progress=self.progress)
+        self.assertEqual((event.hours, event.note, event.user), (Decimal('2.25'), 'Chapter 3', self.user))
+        # 1.50 from creating the row plus the logged 2.25
+        self.assertEqual(DailyActivity.objects.get(skill=self.skill).hours, Decimal('3.75'))
+        self.assertEqual(len(self.client.get(f'/api/progress/{self.progress.id}/events/').data), 1)
+
+    def test_optional_event_and_status(self):
+        self.client.post(self.url, {'hours': 1, 'advance_status': False, 'record_event': False}, format='json')
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.status, 'started')
+        self.assertFalse(ProgressEvent.objects.exists())
+
+    def test_completed_progress_keeps_status(self):
+        Progress.objects.filter(pk=self.progress.pk).update(status='completed')
+        self.assertEqual(self.client.post(self.url, {'hours': 1}, format='json').data['status'], 'completed')
+
+    def test_rejects_non_positive_hours(self):
+        self.assertEqual(self.client.post(self.url, {'hours': 0}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, 400)
+
+    def test_rejects_total_beyond_field_limit(self):
+        Progress.objects.filter(pk=self.progress.pk).update(hours_spent=Decimal('999.00'))
+        response = self.client.post(self.url, {'hours': 5}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.hours_spent, Decimal('999.00'))
+        self.assertFalse(ProgressEvent.objects.exists())
+        self.assertEqual(self.client.post(self.url, {'hours': '0.99'}, format='json').status_code, 200)
+        self.assertEqual(self.client.get(f'/api/progress/{self.progress.id}/').status_code, 200)
+
+
+class LogHoursConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        # Lock conflicts on the shared in-memory test database fail at once and cannot
+        # always be rolled back, so writers use a file copy with a real busy timeout
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'concurrency.sqlite3')
+        connection.ensure_connection()
+        with closing(sqlite3.connect(path)) as target:
+            connection.connection.backup(target)
+        memory_name, memory_connection = connection.settings_dict['NAME'], connection.connection
+        connection.connection = None
+        connection.settings_dict['NAME'] = path
+
+        def restore():
+            connection.close()
+            connection.settings_dict['NAME'] = memory_name
+            connection.connection = memory_connection
+
+        self.addCleanup(restore)
+
+    def test_parallel_writers_lose_no_updates(self):
+        skill = Skill.objects.create(name="Rust")
+        resource = Resource.objects.create(skill=skill, title="Book", resource_type='book', platform='other')
+        progress = Progress.objects.create(resource=resource, status='started')
+        url = f'/api/progress/{progress.id}/log_hours/'
+        writers, requests_each = 8, 5
+        barrier = threading.Barrier(writers)
+        failures = []
+
+        def writer():
+            client = APIClient()
+            barrier.wait()
+            try:
+                for _ in range(requests_each):
+                    response = client.post(url, {'hours': '0.25'}, format='json')
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        progress.refresh_from_db()
+        logged = writers * requests_each
+        self.assertEqual(ProgressEvent.objects.filter(progress=progress).count(), logged)
+        self.assertEqual(progress.hours_spent, Decimal('0.25') * logged)
+        self.assertEqual(DailyActivity.objects.get(skill=skill).hours, Decimal('0.25') * logged)
+        self.assertEqual(progress.status, 'in_progress')
+
+
+class ResourceDedupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.skill = Skill.objects.create(user=self.user, name="Python")
+        self.resource = Resource.objects.create(
+            user=self.user, skill=self.skill, title="Course", resource_type='course', platform='udemy',
+            url="https://www.udemy.com/course/python-bootcamp/?couponCode=SAVE10&utm_source=newsletter",
+        )
+
+    def test_canonical_forms(self):
+        self.assertEqual(
+            canonicalize_url("HTTP://WWW.Udemy.com:80/course/python-bootcamp/?utm_medium=x#reviews"),
+            "https://udemy.com/course/python-bootcamp",
+        )
+        video = "https://youtube.com/watch?v=dQw4w9WgXcQ"
+        for link in [
+            "https://youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ",
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        ]:
+            self.assertEqual(canonicalize_url(link), video)
+        self.assertEqual(canonicalize_url("example.com/a?b=2&a=1"), "https://example.com/a?a=1&b=2")
+        self.assertIsNone(canonicalize_url("  "))
+
+    def test_check_duplicates(self):
+        response = self.client.post('/api/resources/check_duplicates/', {'urls': [
+            "udemy.com/course/python-bootcamp",
+            "https://udemy.com/course/rust-bootcamp/",
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data['results']
+        self.assertEqual((first['duplicate'], first['resource_id']), (True, self.resource.id))
+        self.assertEqual((second['duplicate'], second['resource_id']), (False, None))
+
+    def test_duplicates_are_per_owner(self):
+        other = APIClient()
+        other.force_authenticate(User.objects.create(username='other'))
+        response = other.post('/api/resources/check_duplicates/', {'urls': [self.resource.url]}, format='json')
+        self.assertFalse(response.data['results'][0]['duplicate'])
+
+    def test_insert_rejects_duplicate_link(self):
+        payload = {
+            'title': "Same course", 'skill': self.skill.id, 'resource_type': 'course', 'platform': 'udemy',
+            'url': "http://udemy.com/course/python-bootcamp",
+        }
+        response = self.client.post('/api/resources/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('url', response.data)
+        # Saving the existing resource again is not a duplicate of itself
+        response = self.client.patch(f'/api/resources/{self.resource.id}/', {'url': payload['url']}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_hash_follows_url_changes(self):
+        self.resource.url = "https://udemy.com/course/go"
+        self.resource.save(update_fields=['url'])
+        self.assertEqual(
+            Resource.objects.filter(url_hash=self.resource.url_hash).get(), self.resource
+        )
+        self.assertEqual(Resource.objects.get(pk=self.resource.pk).url_hash, self.resource.url_hash)
+
+
+class RenderingTests(TestCase):
+    def test_fast_renderer_matches_drf(self):
+        from rest_framework.renderers import JSONRenderer
+        data = {
+            'hours_spent': Decimal('3.25'),
+            'when': timezone.now(),
+            'day': date(2024, 1, 31),
+            'title': "Caf\u00e9 \u2028 line",
+            'nested': [{'target_hours': Decimal('10.00')}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_raw_dates_and_times_match_drf(self):
+        from datetime import datetime as dt, time as tm, timezone as tz
+        from zoneinfo import ZoneInfo
+        from rest_framework.renderers import JSONRenderer
+        data = {
+            'utc': dt(2026, 3, 1, 9, 30, 15, 123456, tzinfo=tz.utc),
+            'whole_seconds': dt(2026, 3, 1, 9, 30, 15, tzinfo=tz.utc),
+            'offset': dt(2026, 7, 1, 9, 30, 15, 500, tzinfo=ZoneInfo('Europe/Berlin')),
+            'naive': dt(2026, 3, 1, 9, 30),
+            'time': tm(8, 15, 0, 250000),
+            'date': date(2026, 3, 1),
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        aware_time = {'time': tm(8, 15, tzinfo=tz.utc)}
+        with self.assertRaises(ValueError):
+            FastJSONRenderer().render(aware_time)
+
+    def test_indented_output_uses_stdlib(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    @override_settings(GZIP_MIN_LENGTH=2000)
+    def test_gzip_only_above_threshold(self):
+        skill = Skill.objects.create(name="Python")
+        client = APIClient()
+        small = client.get(f'/api/skills/{skill.id}/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(small.has_header('Content-Encoding'))
+        for i in range(30):
+            Resource.objects.create(skill=skill, title=f"Resource {i}", resource_type='video', platform='youtube')
+        large = client.get('/api/resources/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(large['Content-Encoding'], 'gzip')
+
+
+class ProgressNotesStorageTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        skill = Skill.objects.create(name="Rust")
+        self.resource = Resource.objects.create(skill=skill, title="Book", resource_type='book', platform='other')
+        self.long_notes = "- Ownership moves values between bindings.\n" * 500
+        self.progress = Progress.objects.create(resource=self.resource, status='started', notes=self.long_notes)
+
+    def test_notes_are_compressed_in_side_table(self):
+        note = ProgressNote.objects.get(progress=self.progress)
+        self.assertEqual(note.codec, 'zlib')
+        self.assertEqual(note.size, len(self.long_notes))
+        self.assertLess(len(note.data), note.size / 10)
+        self.assertEqual(Progress.objects.get(pk=self.progress.pk).notes, self.long_notes)
+
+    def test_lists_leave_notes_out(self):
+        progress = self.client.get('/api/progress/').data['results'][0]
+        self.assertNotIn('notes', progress)
+        self.assertNotIn('key_points', progress)
+        resource = self.client.get('/api/resources/').data['results'][0]
+        self.assertNotIn('notes', resource['progress'])
+
+    def test_detail_includes_notes_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(f'/api/resources/{self.resource.id}/').data
+        self.assertEqual(data['progress']['notes'], self.long_notes)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.client.get(f'/api/progress/{self.progress.id}/').data['notes'], self.long_notes)
+
+    def test_notes_endpoint_and_patch(self):
+        url = f'/api/progress/{self.progress.id}/notes/'
+        self.assertEqual(self.client.get(url).data['notes'], self.long_notes)
+        self.client.put(url, {'notes': "Short"}, format='json')
+        self.assertEqual(ProgressNote.objects.get(progress=self.progress).codec, 'raw')
+        self.client.patch(f'/api/progress/{self.progress.id}/', {'notes': ''}, format='json')
+        self.assertFalse(ProgressNote.objects.filter(progress=self.progress).exists())
+        self.assertIsNone(self.client.get(url).data['notes'])
+
+
+class StreamingSummarizerTests(TestCase):
+    notes = "Intro line.  Second sentence!\n\n- First point\nTopic: detail\n* Third point\n1. Fourth?\n"
+
+    def test_chunked_input_matches_whole_string(self):
+        chunks = [self.notes[i:i + 3] for i in range(0, len(self.notes), 3)]
+        self.assertEqual(list(iter_lines(iter(chunks))), list(iter_lines(self.notes)))
+        self.assertEqual(list(iter_sentences(iter(chunks))), list(iter_sentences(self.notes)))
+        self.assertEqual(
+            NoteSummarizer().extract_key_points(iter(chunks)),
+            ['First point', 'Topic: detail', 'Third point', 'Fourth?'],
+        )
+
+    def test_stops_reading_once_enough_points_are_found(self):
+        consumed = []
+
+        def chunks():
+            for line in ["- one\n", "- two\n", "- three\n"]:
+                consumed.append(line)
+                yield line
+
+        self.assertEqual(NoteSummarizer().extract_key_points(chunks(), max_points=1), ['one'])
+        self.assertEqual(len(consumed), 1)
+
+    def test_falls_back_to_first_lines(self):
+        self.assertEqual(NoteSummarizer().extract_key_points("a\nb\nc", max_points=2), ['a', 'b'])
+        self.assertEqual(NoteSummarizer().summarize_notes("One. Two. Three. Four."), "One. Two. Three.")
+        self.assertEqual(NoteSummarizer().summarize_notes("One. Two."), "One. Two.")
+
+    def test_key_points_stream_from_compressed_notes(self):
+        skill = Skill.objects.create(name="Rust")
+        resource = Resource.objects.create(skill=skill, title="Book", resource_type='book', platform='other')
+        Progress.objects.create(resource=resource, notes="Prose line\n" * 5000 + "- Late point\n")
+        progress = Progress.objects.get(resource=resource)
+        self.assertEqual(progress.get_key_points(), ['Late point'])
+
+
+class NotesSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        skill = Skill.objects.create(user=self.user, name="Python")
+        self.items = {}
+        for title, notes in [
+            ("Async book", "asyncio event loops. Use asyncio.gather for fan-out; asyncio is great."),
+            ("ML course", "Gradient descent minimises the loss. Learning rate matters."),
+            ("Mixed", "Descent of the gradient, plus some asyncio."),
+        ]:
+            resource = Resource.objects.create(user=self.user, skill=skill, title=title, resource_type='book', platform='other')
+            self.items[title] = Progress.objects.create(resource=resource, status='started', notes=notes)
+
+    def search(self, **params):
+        response = self.client.get('/api/progress/notes_search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['resource_title'] for row in response.data['results']]
+
+    def test_terms_are_indexed_on_save(self):
+        counts = dict(NoteTerm.objects.filter(progress=self.items["Async book"]).values_list('term', 'count'))
+        self.assertEqual(counts['asyncio'], 3)
+        self.assertNotIn('is', counts)
+
+    def test_and_or_and_phrase_queries(self):
+        self.assertEqual(self.search(q='asyncio'), ["Async book", "Mixed"])
+        self.assertEqual(self.search(q='asyncio gradient'), ["Mixed"])
+        self.assertEqual(sorted(self.search(q='asyncio gradient', mode='or')), ["Async book", "ML course", "Mixed"])
+        self.assertEqual(self.search(q='"gradient descent"'), ["ML course"])
+
+    def test_compound_terms_in_phrases(self):
+        self.assertEqual(parse_query('"asyncio.gather for" fan-out'), [('asyncio.gather',), ('fan-out',)])
+        self.assertEqual(self.search(q='"use asyncio.gather"'), ["Async book"])
+        self.assertEqual(self.search(q='asyncio.gather'), ["Async book"])
+        self.assertEqual(self.search(q='"asyncio.gather loops"'), [])
+        self.assertEqual(self.search(q='asyncio', limit=-1), ["Async book"])
+
+    def test_index_follows_note_changes(self):
+        progress = self.items["ML course"]
+        progress.notes = "Now about asyncio only"
+        progress.save()
+        self.assertEqual(self.search(q='gradient', mode='or'), ["Mixed"])
+        self.assertIn("ML course", self.search(q='asyncio'))
+        progress.notes = ''
+        progress.save()
+        self.assertFalse(NoteTerm.objects.filter(progress=progress).exists())
+
+    def test_other_users_notes_are_not_searched(self):
+        other = APIClient()
+        other.force_authenticate(User.objects.create(username='other'))
+        self.assertEqual(other.get('/api/progress/notes_search/', {'q': 'asyncio'}).data['results'], [])
+
+    def test_rebuild_command_and_bad_queries(self):
+        NoteTerm.objects.all().delete()
+        call_command('rebuild_note_index', stdout=StringIO())
+        self.assertEqual(self.search(q='asyncio'), ["Async book", "Mixed"])
+        self.assertEqual(self.client.get('/api/progress/notes_search/', {'q': 'the'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/progress/notes_search/', {'q': 'x', 'mode': 'xor'}).status_code, 400)
+
+
+class EngineLoadingTests(TestCase):
+    def test_app_import_does_not_load_numpy(self):
+        script = (
+            "import sys, django; django.setup(); import skillstack.urls, tracker.views, tracker.signals; "
+            "print('numpy' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, env=dict(os.environ, DJANGO_SETTINGS_MODULE='skillstack.settings'))
+        self.assertEqual(result.stdout.strip(), 'False', result.stderr)
+
+    def test_similarity_model_lookup_without_model(self):
+        model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, model_dir)
+        self.assertFalse(engines.similarity_model_exists(model_dir))
+        with override_settings(ITEM_SIMILARITY_DIR=model_dir):
+            self.assertIsNone(engines.similarity_model())
+
+    def test_warmup_only_when_enabled(self):
+        with override_settings(TRACKER_WARMUP=False):
+            self.assertIsNone(engines.warmup_if_enabled())
+        with override_settings(TRACKER_WARMUP=True):
+            timings = engines.warmup_if_enabled()
+        self.assertEqual(set(timings), set(engines.ENGINE_MODULES) | {'similarity model'})
+        self.assertIs(engines.summarizer(), engines.summarizer())
+
+    def test_startup_profile_enforces_budget(self):
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('startup_profile', path='/api/', budget=0.001, top=5, stdout=out)
+        self.assertIn('first request:', out.getvalue())
+        self.assertIn('NumPy imported at startup: no', out.getvalue())
+
+
+class AnalyticsSnapshotTests(TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_tracker_reads_use_fresh_snapshot_inside_block(self):
+        router = analytics_db.AnalyticsRouter()
+        with mock.patch.object(analytics_db, 'snapshot_is_fresh', return_value=True):
+            self.assertIsNone(router.db_for_read(Skill))
+            with analytics_db.analytics_reads():
+                self.assertEqual(router.db_for_read(Skill), 'analytics')
+                self.assertIsNone(router.db_for_read(User))
+                self.assertEqual(router.db_for_write(Skill), 'default')
+        with mock.patch.object(analytics_db, 'snapshot_is_fresh', return_value=False):
+            with analytics_db.analytics_reads():
+                self.assertIsNone(router.db_for_read(Skill))
+
+    def test_primary_reads_win_over_analytics_reads(self):
+        router = analytics_db.AnalyticsRouter()
+        with mock.patch.object(analytics_db, 'snapshot_is_fresh', return_value=True):
+            with analytics_db.primary_reads(), analytics_db.analytics_reads():
+                self.assertIsNone(router.db_for_read(Skill))
+            with mock.patch.object(weekly_summary.WeeklySummaryGenerator, 'build_weekly_report',
+                                   side_effect=lambda *args, **kwargs: (router.db_for_read(Progress), {})):
+                with analytics_db.analytics_reads():
+                    fields = weekly_summary.build_report_fields('user', None, date(2026, 1, 5))
+            self.assertIsNone(fields['summary'])
+        self.assertFalse(router.allow_migrate('analytics', 'tracker'))
+        self.assertTrue(router.allow_migrate('default', 'tracker'))
+
+    def test_staleness_limit(self):
+        snapshot = self.tmp / 'analytics.sqlite3'
+        with mock.patch.object(analytics_db, 'snapshot_path', return_value=snapshot):
+            self.assertFalse(analytics_db.snapshot_is_fresh())
+            snapshot.touch()
+            taken = time.time() - 600
+            os.utime(snapshot, (taken, taken))
+            with override_settings(ANALYTICS_MAX_STALENESS_SECONDS=900):
+                self.assertTrue(analytics_db.snapshot_is_fresh())
+            with override_settings(ANALYTICS_MAX_STALENESS_SECONDS=300):
+                self.assertFalse(analytics_db.snapshot_is_fresh())
+
+    def test_copy_database_replaces_snapshot(self):
+        source, target = self.tmp / 'primary.sqlite3', self.tmp / 'analytics.sqlite3'
+        with closing(sqlite3.connect(source)) as db, db:
+            db.execute("CREATE TABLE t (n INTEGER)")
+            db.executemany("INSERT INTO t VALUES (?)", [(n,) for n in range(1000)])
+        target.write_bytes(b'old snapshot')
+        size, _ = analytics_db.copy_database(source, target, pages=1)
+        self.assertEqual(size, target.stat().st_size)
+        self.assertFalse(target.with_name(target.name + '.partial').exists())
+        with closing(sqlite3.connect(f"file:{target}?mode=ro", uri=True)) as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM t").fetchone()[0], 1000)
+        self.assertLess(analytics_db.snapshot_age(target), 60)
+
+    def test_in_memory_databases_stay_on_primary(self):
+        self.assertIsNone(analytics_db.snapshot_path())
+        with self.assertRaises(CommandError):
+            call_command('refresh_analytics_snapshot', stdout=StringIO())
+        with analytics_db.analytics_reads():
+            self.assertEqual(Skill.objects.all().db, 'default')
+
+
+class SingleFlightTests(TestCase):
+    def start_callers(self, flight, key, compute, count):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do(key, compute))) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.005)
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return {'total': 42}
+
+        threads, results = self.start_callers(flight, ('stats', 1), compute, 5)
+        self.wait_for(lambda: flight.stats()['shared'] == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [{'total': 42}] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats()['in_flight'], 0)
+        # Finished computations are not reused without stale-while-revalidate
+        flight.do(('stats', 1), compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def compute():
+            release.wait(5)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                flight.do('key', compute)
+            except ValueError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.wait_for(lambda: flight.stats()['shared'] == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+
+    def test_stale_while_revalidate(self):
+        flight = SingleFlight(stale_seconds=60, refresh_seconds=0)
+        versions = iter(range(1, 10))
+        self.assertEqual(flight.do('key', lambda: next(versions)), 1)
+        self.assertEqual(flight.do('key', lambda: next(versions)), 1)
+        self.wait_for(lambda: flight.stats()['computations'] == 2 and flight.stats()['in_flight'] == 0)
+        self.assertEqual(flight.do('key', lambda: 'unused'), 2)
+        self.assertEqual(flight.stats()['stale_served'], 2)
+
+        flight.stale_seconds = 0.001
+        time.sleep(0.01)
+        self.assertEqual(flight.do('key', lambda: 'fresh'), 'fresh')
+
+    def test_one_background_refresh_per_key_and_interval(self):
+        flight = SingleFlight(stale_seconds=60, refresh_seconds=0.2)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            if len(calls) > 1:
+                raise ValueError("refresh failed")
+            return 'cached'
+
+        self.assertEqual(flight.do('key', compute), 'cached')
+        for _ in range(5):
+            self.assertEqual(flight.do('key', compute), 'cached')
+        self.assertEqual(flight.stats()['refreshes'], 0)
+
+        time.sleep(0.25)
+        with self.assertLogs('tracker.singleflight', level='ERROR'):
+            for _ in range(5):
+                self.assertEqual(flight.do('key', compute), 'cached')
+            self.wait_for(lambda: len(calls) == 2 and flight.stats()['in_flight'] == 0)
+        # The failed refresh is not retried by every hit within the interval
+        for _ in range(5):
+            self.assertEqual(flight.do('key', compute), 'cached')
+        self.assertEqual((len(calls), flight.stats()['refreshes']), (2, 1))
+
+    def test_processes_reuse_result_stored_under_file_lock(self):
+        lock_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_dir)
+        # Separate instances behave like separate processes sharing lock_dir
+        first, second = SingleFlight(lock_dir=lock_dir), SingleFlight(lock_dir=lock_dir)
+        release = threading.Event()
+
+        def slow():
+            release.wait(5)
+            return ['shared result']
+
+        threads, results = self.start_callers(first, ('recommendations', 7), slow, 1)
+        self.wait_for(lambda: first.stats()['computations'] == 1)
+        more_threads, more_results = self.start_callers(second, ('recommendations', 7), lambda: ['recomputed'], 1)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads + more_threads:
+            thread.join()
+        self.assertEqual(results, [['shared result']])
+        self.assertEqual(more_results, [['shared result']])
+        self.assertEqual(second.stats()['computations'], 0)
+
+    def test_dashboard_endpoints_respond_through_single_flight(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username='flight'))
+        for endpoint in ('stats', 'skills_breakdown', 'recommendations'):
+            self.assertEqual(client.get(f'/api/dashboard/{endpoint}/').status_code, 200)
+        self.assertEqual(client.get('/api/dashboard/single_flight/').data['in_flight'], 0)
+
+
+class LoadTestHarnessTests(LiveServerTestCase):
+    def setUp(self):
+        skill = Skill.objects.create(name="Load")
+        self.resource_ids = [
+            Resource.objects.create(skill=skill, title=f"R{i}", resource_type='course', platform='udemy').id
+            for i in range(3)
+        ]
+
+    def test_mix_and_percentiles(self):
+        self.assertEqual(parse_mix('resources=3, dashboard'), {'resources': 3.0, 'dashboard': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('nope=1')
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, pct) for pct in (50, 95, 99)], [50, 95, 99])
+        self.assertIsNone(percentile([], 50))
+
+    def test_stage_reports_every_endpoint_in_the_mix(self):
+        resource_ids = asyncio.run(discover_resource_ids(self.live_server_url))
+        self.assertEqual(sorted(resource_ids), self.resource_ids)
+        mix = {'resources': 1, 'dashboard': 1, 'mark_complete': 1}
+        result = asyncio.run(run_stage(self.live_server_url, 2, 30, mix, resource_ids=resource_ids,
+                                       seed=1, max_requests=30))
+        summary = result.summary()
+        self.assertEqual(summary['all']['requests'], 30)
+        self.assertEqual(summary['all']['errors'], 0)
+        self.assertEqual(set(summary), {'resources', 'dashboard', 'mark_complete', 'all'})
+        self.assertLessEqual(summary['all']['p50'], summary['all']['p99'])
+        self.assertTrue(Progress.objects.filter(status='completed').exists())
+
+    def test_command_ramps_until_slo_breaks(self):
+        out = StringIO()
+        call_command('loadtest', url=self.live_server_url, duration=0.2, concurrency=1, ramp=True,
+                     max_concurrency=2, slo_ms=0.001, mix='skills=1', stdout=out)
+        self.assertIn('SLO broken', out.getvalue())
+        self.assertIn('break p95 <= 0.001 ms', out.getvalue())
+
+
+class RequestProfilerTests(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        override = override_settings(PROFILING_DIR=self.profile_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        Skill.objects.create(name="Python")
+
+    def profiles(self):
+        return sorted(path.name for path in Path(self.profile_dir).iterdir())
+
+    def test_staff_requests_are_profiled_by_flag_or_header(self):
+        self.client.force_login(User.objects.create(username='admin', is_staff=True))
+        response = self.client.get('/api/skills/', {'profile': '1'})
+        profile_id = response['X-Profile-Id']
+        self.assertEqual(self.profiles(), [f"{profile_id}.pstats", f"{profile_id}.sql.json"])
+        sql_log = json.loads((Path(self.profile_dir) / f"{profile_id}.sql.json").read_text())
+        self.assertEqual(sql_log['query_count'], int(response['X-Profile-Query-Count']))
+        self.assertTrue(any('explain' in query for query in sql_log['queries']))
+
+        response = self.client.get('/api/skills/', HTTP_X_PROFILE='1')
+        self.assertIn('X-Profile-Id', response)
+        self.assertEqual(len(self.profiles()), 4)
+
+    def test_unrequested_and_non_staff_requests_are_not_profiled(self):
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/skills/'))
+        with override_settings(DEBUG=True):
+            for params, headers in (({'profile': '0'}, {}), ({'profile': 'false'}, {}), ({}, {'HTTP_X_PROFILE': 'no'})):
+                self.assertNotIn('X-Profile-Id', self.client.get('/api/skills/', params, **headers))
+        self.client.force_login(User.objects.create(username='learner'))
+        response = self.client.get('/api/skills/', {'profile': '1'}, HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(self.profiles(), [])
+
+    def test_debug_profiles_anonymous_requests(self):
+        with override_settings(DEBUG=True):
+            response = self.client.get('/api/skills/', {'profile': '1'})
+        self.assertIn('X-Profile-Id', response)
+        self.assertEqual(len(self.profiles()), 2)
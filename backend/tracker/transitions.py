@@ -0,0 +1,137 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from .activity import record_activity
+from .models import Progress, ProgressEvent, Resource
+
+# Largest number of resource ids accepted by one bulk transition
+MAX_BULK_RESOURCES = 1000
+
+# Largest value Progress.hours_spent can hold (999.99 for max_digits=5, decimal_places=2)
+_hours_field = Progress._meta.get_field('hours_spent')
+MAX_HOURS_SPENT = Decimal(10) ** (_hours_field.max_digits - _hours_field.decimal_places) - Decimal(1).scaleb(-_hours_field.decimal_places)
+
+
+class HoursLimitExceeded(ValueError):
+    """
+    Logging the hours would push hours_spent past MAX_HOURS_SPENT
+    """
+
+
+# Status set by each transition and the timestamp it stamps
+TRANSITIONS = {
+    'start': ('started', 'started_at'),
+    'complete': ('completed', 'completed_at'),
+}
+
+
+def bulk_transition(resources, resource_ids, transition):
+    """
+    Apply a progress transition to many resources in one transaction
+
+    ``resources`` is the caller's (already owner-scoped) Resource queryset.
+    Missing Progress rows are inserted with one ``bulk_create`` and existing
+    ones are moved with a single ``UPDATE ... WHERE id IN``. Returns one
+    ``{'resource_id', 'result', 'progress_id'}`` entry per requested id, in
+    request order, where result is ``created``, ``updated`` or ``not_found``.
+
+    Neither bulk path sends ``post_save``, so the activity rollup, dashboard
+    streams and the similarity model are updated here instead.
+    """
+    new_status, timestamp_field = TRANSITIONS[transition]
+    now = timezone.now()
+    resource_ids = list(dict.fromkeys(resource_ids))
+
+    with transaction.atomic():
+        found = {
+            resource_id: (skill_id, user_id)
+            for resource_id, skill_id, user_id in resources.filter(pk__in=resource_ids).values_list('id', 'skill_id', 'user_id')
+        }
+        existing = {
+            resource_id: (progress_id, old_status)
+            for progress_id, resource_id, old_status in Progress.objects.filter(
+                resource_id__in=found
+            ).values_list('id', 'resource_id', 'status')
+        }
+
+        missing = [resource_id for resource_id in found if resource_id not in existing]
+        Progress.objects.bulk_create([
+            Progress(resource_id=resource_id, user_id=found[resource_id][1], status=new_status, **{timestamp_field: now})
+            for resource_id in missing
+        ])
+        if existing:
+            Progress.objects.filter(pk__in=[progress_id for progress_id, _ in existing.values()]).update(
+                status=new_status, updated_at=now, **{timestamp_field: now}
+            )
+        created = dict(Progress.objects.filter(resource_id__in=missing).values_list('resource_id', 'id'))
+
+        completions = defaultdict(int)
+        for resource_id, (skill_id, user_id) in found.items():
+            old_status = existing[resource_id][1] if resource_id in existing else None
+            if new_status == 'completed' and old_status != 'completed':
+                completions[(skill_id, user_id)] += 1
+            elif old_status == 'completed' and new_status != 'completed':
+                completions[(skill_id, user_id)] -= 1
+        for (skill_id, user_id), count in completions.items():
+            record_activity(skill_id, user_id, completions=count)
+
+    _after_direct_update({user_id for _, user_id in found.values()}, any(count > 0 for count in completions.values()))
+
+    results = []
+    for resource_id in resource_ids:
+        if resource_id in created:
+            results.append({'resource_id': resource_id, 'result': 'created', 'progress_id': created[resource_id]})
+        elif resource_id in existing:
+            results.append({'resource_id': resource_id, 'result': 'updated', 'progress_id': existing[resource_id][0]})
+        else:
+            results.append({'resource_id': resource_id, 'result': 'not_found', 'progress_id': None})
+    return results
+
+
+def log_hours(progress, hours, note='', advance_status=True, record_event=True):
+    """
+    Atomically add ``hours`` to a Progress row and return the refreshed row
+
+    The increment runs in the database (``hours_spent = hours_spent + n``), so
+    concurrent writers never lose updates. With ``advance_status`` a row that
+    is merely ``started`` moves to ``in_progress`` in the same UPDATE.
+
+    Raises HoursLimitExceeded, changing nothing, when the new total would not
+    fit in ``hours_spent``. The row is re-read inside the transaction, so
+    callers that wrap this in their own atomic block commit only once
+    everything they need has been read.
+    """
+    hours = Decimal(hours)
+    now = timezone.now()
+    changes = {'hours_spent': F('hours_spent') + hours, 'updated_at': now}
+    if advance_status:
+        changes['status'] = Case(When(status='started', then=Value('in_progress')), default=F('status'))
+
+    with transaction.atomic():
+        # The bound is checked in the same statement as the increment
+        updated = Progress.objects.filter(pk=progress.pk, hours_spent__lte=MAX_HOURS_SPENT - hours).update(**changes)
+        if not updated:
+            raise HoursLimitExceeded(f"hours_spent cannot exceed {MAX_HOURS_SPENT}")
+        if record_event:
+            ProgressEvent.objects.create(user_id=progress.user_id, progress_id=progress.pk, hours=hours, note=note or None)
+        skill_id = Resource.objects.filter(pk=progress.resource_id).values_list('skill_id', flat=True).first()
+        if skill_id is not None:
+            record_activity(skill_id, progress.user_id, hours=hours)
+        progress.refresh_from_db()
+        progress.mark_saved_values()
+        user_id = progress.user_id
+        transaction.on_commit(lambda: _after_direct_update({user_id}, completed=False), robust=True)
+    return progress
+
+
+def _after_direct_update(user_ids, completed):
+    from .events import broker
+    for user_id in user_ids:
+        broker.notify_change(user_id)
+    if completed:
+        from .engines import similarity_model_exists
+        if similarity_model_exists():
+            from . import jobs
+            jobs.enqueue('update_item_similarity')
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import SkillViewSet, ResourceViewSet, ProgressViewSet, CategoryViewSet, DashboardViewSet, CertificationViewSet
+from .views import SkillViewSet, ResourceViewSet, ProgressViewSet, CategoryViewSet, DashboardViewSet, CertificationViewSet, JobViewSet, WeeklyReportViewSet, ChangesViewSet
 
 router = DefaultRouter()
 router.register(r'skills', SkillViewSet)
@@ -9,6 +9,9 @@ router.register(r'progress', ProgressViewSet)
 router.register(r'categories', CategoryViewSet)
 router.register(r'certifications', CertificationViewSet)
 router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'jobs', JobViewSet)
+router.register(r'weekly-reports', WeeklyReportViewSet)
+router.register(r'changes', ChangesViewSet, basename='changes')
 
 urlpatterns = [
     path('api/', include(router.urls)),
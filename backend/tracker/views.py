@@ -1,27 +1,68 @@
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.shortcuts import render
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, mixins
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models import Count, Sum
+from rest_framework.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
 from datetime import datetime, timedelta
-from .models import Skill, Resource, Progress, Category, SkillCategory, Certification
+from .models import Skill, Resource, Progress, Category, SkillCategory, Certification, Job, WeeklyReport
 from .serializers import (
     SkillSerializer, 
     ResourceSerializer, 
     ProgressSerializer, 
+    ProgressListSerializer,
+    ProgressNotesSerializer,
     CategorySerializer,
     SkillDetailSerializer,
     ResourceDetailSerializer,
+    ResourceListSerializer,
     CertificationSerializer,
-    CertificationDetailSerializer
+    CertificationDetailSerializer,
+    JobSerializer,
+    WeeklyReportSerializer,
+    LogHoursSerializer,
+    ProgressEventSerializer
 )
-from .recommendations import ResourceRecommender
-from .summarization import NoteSummarizer
+from .activity import activity_calendar
+from .analytics_db import analytics_reads
+from .dashboard import DashboardContext, build_stats, build_skills_breakdown
+from .changes import collect_changes
+from .dedup import MAX_CHECK_URLS, canonicalize_url, find_duplicates
+from .note_search import parse_query, search_notes
+from .singleflight import dashboard_flight
+from .transitions import MAX_BULK_RESOURCES, HoursLimitExceeded, bulk_transition, log_hours
+from . import engines, jobs
 
-class SkillViewSet(viewsets.ModelViewSet):
+def request_owner(request):
+    """The authenticated user behind a request, or None for anonymous callers"""
+    user = getattr(request, 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
+class OwnedQuerysetMixin:
+    """
+    Scope a viewset to the requesting user's rows and stamp new rows with the owner
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().owned_by(request_owner(self.request))
+        
+    def perform_create(self, serializer):
+        serializer.save(user=request_owner(self.request))
+
+class SkillViewSet(OwnedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('resources')
+        return queryset
+        
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return SkillDetailSerializer
@@ -31,23 +72,44 @@ class SkillViewSet(viewsets.ModelViewSet):
     def recommend_resources(self, request, pk=None):
         """Recommend resources for a specific skill"""
         skill = self.get_object()
-        recommender = ResourceRecommender()
-        recommendations = recommender.recommend_resources_by_skill(skill.id)
-        serializer = ResourceDetailSerializer(recommendations, many=True)
+        recommender = engines.recommender()
+        with analytics_reads():
+            recommendations = recommender.recommend_resources_by_skill(skill.id)
+        serializer = ResourceListSerializer(recommendations, many=True)
         return Response(serializer.data)
+        
+    @action(detail=False, methods=['get'])
+    def coverage(self, request):
+        """Certification, resource and hour coverage for every skill (?output=csv for CSV)"""
+        report = engines.coverage_report(self.get_queryset())
+        rows = report.build()
+        if request.query_params.get('output') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="skill_coverage.csv"'
+            report.write_csv(response, rows)
+            return response
+        return Response(rows)
 
-class ResourceViewSet(viewsets.ModelViewSet):
-    queryset = Resource.objects.all()
+class ResourceViewSet(OwnedQuerysetMixin, viewsets.ModelViewSet):
+    queryset = Resource.objects.select_related('skill', 'progress')
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('progress__note_blob')
+        return queryset
+        
     def get_serializer_class(self):
-        if self.action == 'retrieve' or self.action == 'list':
+        if self.action == 'retrieve':
             return ResourceDetailSerializer
+        if self.action == 'list':
+            return ResourceListSerializer
         return ResourceSerializer
         
     @action(detail=True, methods=['post'])
     def start_learning(self, request, pk=None):
         resource = self.get_object()
-        progress, created = Progress.objects.get_or_create(resource=resource)
+        progress, created = Progress.objects.get_or_create(resource=resource, defaults={'user_id': resource.user_id})
         progress.status = 'started'
         progress.started_at = datetime.now()
         progress.save()
@@ -57,138 +119,422 @@ class ResourceViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def mark_complete(self, request, pk=None):
         resource = self.get_object()
-        progress, created = Progress.objects.get_or_create(resource=resource)
+        progress, created = Progress.objects.get_or_create(resource=resource, defaults={'user_id': resource.user_id})
         progress.status = 'completed'
         progress.completed_at = datetime.now()
         progress.save()
         serializer = ProgressSerializer(progress)
         return Response(serializer.data)
         
+    @action(detail=False, methods=['post'])
+    def bulk_start_learning(self, request):
+        """Start learning every resource in ``resource_ids`` in one transaction"""
+        return self._bulk_transition(request, 'start')
+        
+    @action(detail=False, methods=['post'])
+    def bulk_mark_complete(self, request):
+        """Mark every resource in ``resource_ids`` complete in one transaction"""
+        return self._bulk_transition(request, 'complete')
+        
+    def _bulk_transition(self, request, transition):
+        resource_ids = request.data.get('resource_ids')
+        if (
+            not isinstance(resource_ids, list) or not resource_ids
+            or not all(isinstance(resource_id, int) and not isinstance(resource_id, bool) for resource_id in resource_ids)
+        ):
+            return Response({'error': 'resource_ids must be a non-empty list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(resource_ids) > MAX_BULK_RESOURCES:
+            return Response(
+                {'error': f'At most {MAX_BULK_RESOURCES} resource_ids are accepted per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        results = bulk_transition(self.get_queryset(), resource_ids, transition)
+        return Response({'results': results})
+        
+    @action(detail=False, methods=['post'])
+    def check_duplicates(self, request):
+        """Report which of ``urls`` are already tracked, matching on the canonical URL"""
+        urls = request.data.get('urls')
+        if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            return Response({'error': 'urls must be a list of strings'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(urls) > MAX_CHECK_URLS:
+            return Response(
+                {'error': f'At most {MAX_CHECK_URLS} urls are accepted per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        existing = find_duplicates(self.get_queryset(), urls)
+        results = [
+            {
+                'url': url,
+                'canonical_url': canonicalize_url(url),
+                'duplicate': existing[url] is not None,
+                'resource_id': existing[url],
+            }
+            for url in urls
+        ]
+        return Response({'results': results})
+        
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Resources completed alongside this one (item-item collaborative filtering)"""
+        resource = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            
+        model = engines.similarity_model()
+        if model is None:
+            # No trained model yet: fall back to the popularity heuristic for the skill
+            recommender = engines.recommender()
+            with analytics_reads():
+                candidates = recommender.recommend_resources_by_skill(resource.skill_id, limit=limit + 1)
+            recommendations = [candidate for candidate in candidates if candidate.id != resource.id][:limit]
+        else:
+            # Over-fetch so neighbours owned by other users can be dropped
+            neighbor_ids = [neighbor_id for neighbor_id, score in model.similar(resource.id, limit=limit * 4)]
+            resources = self.get_queryset().in_bulk(neighbor_ids)
+            recommendations = [resources[i] for i in neighbor_ids if i in resources][:limit]
+        serializer = ResourceListSerializer(recommendations, many=True)
+        return Response(serializer.data)
+        
     @action(detail=False, methods=['get'])
     def recommend(self, request):
         """Get recommended resources for the user"""
-        recommender = ResourceRecommender()
-        recommendations = recommender.recommend_resources()
-        serializer = ResourceDetailSerializer(recommendations, many=True)
+        recommender = engines.recommender()
+        with analytics_reads():
+            recommendations = recommender.recommend_resources(user_id=request.user.pk)
+        serializer = ResourceListSerializer(recommendations, many=True)
         return Response(serializer.data)
 
-class ProgressViewSet(viewsets.ModelViewSet):
+class ProgressViewSet(OwnedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Progress.objects.all()
     serializer_class = ProgressSerializer
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('retrieve', 'notes'):
+            queryset = queryset.select_related('note_blob')
+        return queryset
+        
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProgressListSerializer
+        return ProgressSerializer
+        
+    @action(detail=False, methods=['get'])
+    def notes_search(self, request):
+        """Progress whose notes mention ``q`` (terms or "quoted phrases"; ?mode=and|or)"""
+        query = request.query_params.get('q', '')
+        mode = request.query_params.get('mode', 'and').lower()
+        if mode not in ('and', 'or'):
+            return Response({'error': 'mode must be "and" or "or"'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not parse_query(query):
+            return Response({'error': 'q must contain at least one searchable term'}, status=status.HTTP_400_BAD_REQUEST)
+            
+        matches = search_notes(request_owner(request), query, mode)
+        page = matches[:limit]
+        progress_items = self.get_queryset().select_related('resource').in_bulk([progress_id for progress_id, _, _ in page])
+        results = [
+            {
+                'progress': progress_id,
+                'resource': progress_items[progress_id].resource_id,
+                'resource_title': progress_items[progress_id].resource.title,
+                'status': progress_items[progress_id].status,
+                'score': score,
+                'matches': counts,
+            }
+            for progress_id, score, counts in page if progress_id in progress_items
+        ]
+        return Response({'count': len(matches), 'mode': mode, 'results': results})
+        
+    @action(detail=True, methods=['get', 'put'])
+    def notes(self, request, pk=None):
+        """Read or replace just the notes of this progress"""
+        progress = self.get_object()
+        if request.method == 'PUT':
+            serializer = ProgressNotesSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            progress.notes = serializer.validated_data['notes']
+            progress.save(update_fields=['notes'])
+        return Response({'id': progress.id, 'notes': progress.notes})
+        
     @action(detail=False, methods=['get'])
     def weekly_summary(self, request):
-        """Generate a weekly summary of progress"""
+        """Generate a weekly summary of progress (?async=true queues it as a background job)"""
+        if request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+            job, created = jobs.enqueue('weekly_summary', user=request_owner(request))
+            return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+            
         # Get progress items from the last 7 days
         week_ago = datetime.now() - timedelta(days=7)
-        progress_items = Progress.objects.filter(
+        progress_items = self.get_queryset().filter(
             updated_at__gte=week_ago
         ).select_related('resource')
         
-        summarizer = NoteSummarizer()
+        summarizer = engines.summarizer()
         summary = summarizer.generate_weekly_summary(progress_items)
         
         return Response({'summary': summary})
+        
+    @action(detail=True, methods=['post'])
+    def log_hours(self, request, pk=None):
+        """Atomically add hours to this progress (optionally advancing started to in_progress)"""
+        progress = self.get_object()
+        serializer = LogHoursSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            # Serialize before committing so a failed request never leaves hours logged
+            with transaction.atomic():
+                progress = log_hours(progress, **serializer.validated_data)
+                data = ProgressSerializer(progress).data
+        except HoursLimitExceeded as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+        
+    @action(detail=True, methods=['get'])
+    def events(self, request, pk=None):
+        """Time logged against this progress, newest first"""
+        progress = self.get_object()
+        serializer = ProgressEventSerializer(progress.events.all(), many=True)
+        return Response(serializer.data)
 
 class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
 class DashboardViewSet(viewsets.ViewSet):
+    def dispatch(self, request, *args, **kwargs):
+        # Dashboard reads come from the analytics snapshot while it is fresh
+        with analytics_reads():
+            return super().dispatch(request, *args, **kwargs)
+            
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        total_skills = Skill.objects.count()
-        total_resources = Resource.objects.count()
-        completed_resources = Progress.objects.filter(status='completed').count()
-        
-        # Get resources by platform
-        resources_by_platform = Resource.objects.values('platform').annotate(count=Count('platform'))
+        owner = request_owner(request)
+        return Response(dashboard_flight.do(('stats', request.user.pk), lambda: build_stats(owner)))
         
-        # Get resources by type
-        resources_by_type = Resource.objects.values('resource_type').annotate(count=Count('resource_type'))
+    @action(detail=False, methods=['get'])
+    def skills_breakdown(self, request):
+        owner = request_owner(request)
+        return Response(dashboard_flight.do(('skills_breakdown', request.user.pk), lambda: build_skills_breakdown(owner)))
         
-        # Get recent activity (last 7 days)
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_activity = Progress.objects.filter(
-            updated_at__gte=week_ago
-        ).values('status').annotate(count=Count('status'))
-        
-        # Get certification count
-        total_certifications = Certification.objects.count()
-        
-        data = {
-            'total_skills': total_skills,
-            'total_resources': total_resources,
-            'total_certifications': total_certifications,
-            'completed_resources': completed_resources,
-            'completion_rate': (completed_resources / total_resources * 100) if total_resources > 0 else 0,
-            'resources_by_platform': list(resources_by_platform),
-            'resources_by_type': list(resources_by_type),
-            'recent_activity': list(recent_activity)
-        }
+    @action(detail=False, methods=['get'])
+    def categories_breakdown(self, request):
+        """Resource, status and hour totals per category (see categories_rollup for overall totals)"""
+        skills = Skill.objects.owned_by(request_owner(request))
+        progress = 'skillcategory__skill__resources__progress'
+        # Categories are shared, so only the requesting user's skills are counted
+        owned = Q(skillcategory__skill__in=skills)
+        categories = Category.objects.annotate(
+            skill_count=Count('skillcategory__skill', filter=owned, distinct=True),
+            resource_count=Count('skillcategory__skill__resources', filter=owned, distinct=True),
+            started_count=Count(progress, filter=owned & Q(**{f'{progress}__status': 'started'}), distinct=True),
+            in_progress_count=Count(progress, filter=owned & Q(**{f'{progress}__status': 'in_progress'}), distinct=True),
+            completed_count=Count(progress, filter=owned & Q(**{f'{progress}__status': 'completed'}), distinct=True),
+            hours_spent=Sum(f'{progress}__hours_spent', filter=owned),
+        ).values(
+            'id', 'name', 'skill_count', 'resource_count', 'started_count',
+            'in_progress_count', 'completed_count', 'hours_spent'
+        )
         
-        return Response(data)
+        categories_list = []
+        for category in categories:
+            resource_count = category['resource_count']
+            category['hours_spent'] = float(category['hours_spent'] or 0)
+            category['completion_rate'] = (category['completed_count'] / resource_count * 100) if resource_count > 0 else 0
+            categories_list.append(category)
+        return Response(categories_list)
         
     @action(detail=False, methods=['get'])
-    def skills_breakdown(self, request):
-        # Get skills with their resource counts and completion status
-        skills_data = Skill.objects.prefetch_related('resources__progress').annotate(
-            resource_count=Count('resources')
+    def categories_rollup(self, request):
+        """Totals over all categorized skills, counting each skill and resource once"""
+        # Skills can sit in several categories, so totals are computed over the
+        # distinct set of categorized skills rather than summed per category
+        categorized = Skill.objects.owned_by(request_owner(request)).filter(
+            id__in=SkillCategory.objects.values('skill_id')
+        )
+        totals = Resource.objects.filter(skill__in=categorized).aggregate(
+            resource_count=Count('id'),
+            started_count=Count('progress', filter=Q(progress__status='started')),
+            in_progress_count=Count('progress', filter=Q(progress__status='in_progress')),
+            completed_count=Count('progress', filter=Q(progress__status='completed')),
+            hours_spent=Sum('progress__hours_spent'),
         )
+        # Counted separately so categorized skills without resources are included
+        totals['skill_count'] = categorized.count()
+        totals['hours_spent'] = float(totals['hours_spent'] or 0)
+        totals['completion_rate'] = (totals['completed_count'] / totals['resource_count'] * 100) if totals['resource_count'] > 0 else 0
+        return Response(totals)
         
-        skills_list = []
-        for skill in skills_data:
-            # Count resources by different statuses
-            started_count = 0
-            in_progress_count = 0
-            completed_count = 0
+    @action(detail=False, methods=['get'])
+    def recommendations(self, request):
+        """Get skill and resource recommendations"""
+        def compute():
+            recommender = engines.recommender()
+            recommended_skills = recommender.recommend_skills(user_id=request.user.pk)
+            recommended_resources = recommender.recommend_resources(user_id=request.user.pk)
             
-            for resource in skill.resources.all():
-                if hasattr(resource, 'progress') and resource.progress:
-                    status = resource.progress.status
-                    if status == 'started':
-                        started_count += 1
-                    elif status == 'in_progress':
-                        in_progress_count += 1
-                    elif status == 'completed':
-                        completed_count += 1
+            skill_serializer = SkillSerializer(recommended_skills, many=True)
+            resource_serializer = ResourceListSerializer(recommended_resources, many=True)
             
-            # Total active resources (started + in_progress + completed)
-            active_count = started_count + in_progress_count + completed_count
+            return {
+                'skills': skill_serializer.data,
+                'resources': resource_serializer.data
+            }
             
-            skills_list.append({
-                'id': skill.id,
-                'name': skill.name,
-                'resource_count': skill.resource_count,
-                'started_count': started_count,
-                'in_progress_count': in_progress_count,
-                'completed_count': completed_count,
-                'active_count': active_count,
-                'completion_rate': (completed_count / skill.resource_count * 100) if skill.resource_count > 0 else 0,
-                'activity_rate': (active_count / skill.resource_count * 100) if skill.resource_count > 0 else 0
-            })
+        return Response(dashboard_flight.do(('recommendations', request.user.pk), compute))
+        
+    @action(detail=False, methods=['get'])
+    def bootstrap(self, request):
+        """Stats, skills breakdown, recommendations and weekly summary in one response"""
+        owner = request_owner(request)
+        
+        def compute():
+            # Every section is derived from the same few queries
+            context = DashboardContext(owner)
+            recommended_skills, recommended_resources = context.recommendations(engines.recommender())
+            return {
+                'stats': context.stats(),
+                'skills_breakdown': context.skills_breakdown(),
+                'recommendations': {
+                    'skills': SkillSerializer(recommended_skills, many=True).data,
+                    'resources': ResourceListSerializer(recommended_resources, many=True).data
+                },
+                'weekly_summary': {
+                    'summary': engines.summarizer().generate_weekly_summary(context.recent_progress())
+                },
+            }
             
-        return Response(skills_list)
+        return Response(dashboard_flight.do(('bootstrap', request.user.pk), compute))
         
     @action(detail=False, methods=['get'])
-    def recommendations(self, request):
-        """Get skill and resource recommendations"""
-        recommender = ResourceRecommender()
-        recommended_skills = recommender.recommend_skills()
-        recommended_resources = recommender.recommend_resources()
+    def activity(self, request):
+        """Daily hours/completions heatmap for the last year with learning streaks"""
+        try:
+            days = min(int(request.query_params.get('days', 365)), 366 * 5)
+            skill_id = int(request.query_params['skill']) if request.query_params.get('skill') else None
+        except ValueError:
+            return Response({'error': 'days and skill must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(activity_calendar(request_owner(request), days=max(days, 1), skill_id=skill_id))
         
-        skill_serializer = SkillSerializer(recommended_skills, many=True)
-        resource_serializer = ResourceDetailSerializer(recommended_resources, many=True)
+    @action(detail=False, methods=['get'])
+    def recommendation_cache_stats(self, request):
+        """Hit-rate and size statistics for the recommendation cache"""
+        return Response(engines.recommendation_cache().stats())
         
-        return Response({
-            'skills': skill_serializer.data,
-            'resources': resource_serializer.data
-        })
+    @action(detail=False, methods=['get'])
+    def single_flight(self, request):
+        """Coalescing statistics for the stats, skills_breakdown and recommendations endpoints"""
+        return Response(dashboard_flight.stats())
         
-class CertificationViewSet(viewsets.ModelViewSet):
-    queryset = Certification.objects.all()
+class CertificationViewSet(OwnedQuerysetMixin, viewsets.ModelViewSet):
+    queryset = Certification.objects.prefetch_related('skills')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        expiry_status = self.request.query_params.get('status')
+        if expiry_status == 'expired':
+            queryset = queryset.expired()
+        elif expiry_status == 'active':
+            queryset = queryset.active()
+        return queryset
     
     def get_serializer_class(self):
-        if self.action == 'retrieve' or self.action == 'list':
+        if self.action in ('retrieve', 'list', 'expiring'):
             return CertificationSerializer
         return CertificationDetailSerializer
+        
+    @action(detail=False, methods=['get'])
+    def expiring(self, request):
+        """Get certifications expiring within the next `days` days (default 30)"""
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if days < 0:
+            return Response({'error': 'days must not be negative'}, status=status.HTTP_400_BAD_REQUEST)
+            
+        # Same owner scoping, ?status filter and prefetch as the list
+        queryset = self.filter_queryset(self.get_queryset()).expiring(days)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+class JobViewSet(OwnedQuerysetMixin,
+                 mixins.CreateModelMixin,
+                 mixins.RetrieveModelMixin,
+                 mixins.ListModelMixin,
+                 viewsets.GenericViewSet):
+    """Queue background jobs and poll their status"""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job, created = jobs.enqueue(
+            serializer.validated_data['kind'],
+            serializer.validated_data.get('payload'),
+            user=request_owner(request)
+        )
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+class WeeklyReportViewSet(OwnedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    """Stored weekly reports (see the generate_weekly_summary command)"""
+    queryset = WeeklyReport.objects.select_related('skill')
+    serializer_class = WeeklyReportSerializer
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if params.get('scope'):
+            queryset = queryset.filter(scope=params['scope'])
+        if params.get('skill'):
+            if not params['skill'].isdigit():
+                raise ValidationError({'skill': 'must be a skill id'})
+            queryset = queryset.filter(skill_id=params['skill'])
+        for name, lookup in (('since', 'week_start__gte'), ('until', 'week_start__lte')):
+            if params.get(name):
+                queryset = queryset.filter(**{lookup: self.parse_date_param(name)})
+        return queryset
+        
+    def parse_date_param(self, name):
+        try:
+            value = parse_date(self.request.query_params[name])
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError({name: 'must be a valid YYYY-MM-DD date'})
+        return value
+
+class ChangesViewSet(viewsets.ViewSet):
+    """Incremental sync: rows changed since a cursor plus deletion tombstones"""
+    
+    def list(self, request):
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = parse_datetime(request.query_params['since'])
+            except ValueError:
+                since = None
+            if since is None:
+                return Response({'error': 'since must be an ISO-8601 timestamp cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 500)), 1), 5000)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return Response(collect_changes(request_owner(request), since=since, limit=limit,
+                                            page=request.query_params.get('page') or None))
+        except ValueError:
+            return Response({'error': 'page must be a next_page token from this feed'}, status=status.HTTP_400_BAD_REQUEST)
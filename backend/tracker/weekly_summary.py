@@ -1,4 +1,7 @@
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+from .analytics_db import primary_reads
 from .models import Progress
 
 class WeeklySummaryGenerator:
@@ -6,41 +9,75 @@ class WeeklySummaryGenerator:
     Generates a weekly summary of learning progress
     """
     
-    def generate_weekly_summary(self, user=None):
+    def generate_weekly_summary(self, user=None, skill=None, week_start=None):
         """
         Generate a weekly summary of learning progress
+        Limited to the given user's (or skill's) progress when one is passed
         """
-        # Get progress items updated in the last 7 days
-        week_ago = datetime.now() - timedelta(days=7)
-        progress_items = Progress.objects.filter(updated_at__gte=week_ago).select_related('resource__skill')
+        progress_items = Progress.objects.all()
+        if user is not None:
+            progress_items = progress_items.owned_by(user)
+        if skill is not None:
+            progress_items = progress_items.filter(resource__skill=skill)
+        summary, stats = self.build_weekly_report(progress_items, week_start=week_start)
+        return summary
         
-        if not progress_items.exists():
-            return "No learning activity in the past week."
-        
-        # Summary statistics
-        total_resources = progress_items.count()
-        completed_count = progress_items.filter(status='completed').count()
-        in_progress_count = progress_items.filter(status='in_progress').count()
-        started_count = progress_items.filter(status='started').count()
+    def build_weekly_report(self, progress_items, week_start=None):
+        """
+        Build the summary text and raw statistics for one week of progress_items
+        The week is the 7 days ending now, or the 7 days starting at week_start (a date)
+        """
+        if week_start is None:
+            period_end = timezone.now()
+            period_start = period_end - timedelta(days=7)
+        else:
+            period_start = timezone.make_aware(datetime.combine(week_start, time.min))
+            period_end = period_start + timedelta(days=7)
+            
+        progress_items = progress_items.filter(updated_at__gte=period_start, updated_at__lt=period_end)
         
-        # Hours spent
-        total_hours = sum(float(item.hours_spent) for item in progress_items if item.hours_spent)
+        # Summary statistics in a single aggregate query
+        totals = progress_items.aggregate(
+            total_resources=Count('id'),
+            completed_count=Count('id', filter=Q(status='completed')),
+            in_progress_count=Count('id', filter=Q(status='in_progress')),
+            started_count=Count('id', filter=Q(status='started')),
+            total_hours=Sum('hours_spent'),
+            avg_difficulty=Avg('difficulty_rating'),
+        )
+        total_resources = totals['total_resources']
+        completed_count = totals['completed_count']
+        in_progress_count = totals['in_progress_count']
+        started_count = totals['started_count']
+        total_hours = float(totals['total_hours'] or 0)
+        avg_difficulty = totals['avg_difficulty'] or 0
         
         # Skills worked on
-        skills = set()
-        for item in progress_items:
-            if item.resource and item.resource.skill:
-                skills.add(item.resource.skill.name)
+        skills = set(
+            progress_items.order_by().values_list('resource__skill__name', flat=True).distinct()
+        )
+        skills.discard(None)
         
-        # Difficulty ratings
-        difficulty_ratings = [item.difficulty_rating for item in progress_items if item.difficulty_rating]
-        avg_difficulty = sum(difficulty_ratings) / len(difficulty_ratings) if difficulty_ratings else 0
+        stats = {
+            'period_start': period_start.isoformat(),
+            'period_end': period_end.isoformat(),
+            'total_resources': total_resources,
+            'completed_count': completed_count,
+            'in_progress_count': in_progress_count,
+            'started_count': started_count,
+            'total_hours': total_hours,
+            'avg_difficulty': round(avg_difficulty, 2),
+            'skills': sorted(skills),
+        }
+        
+        if total_resources == 0:
+            return "No learning activity in the past week.", stats
         
         # Generate summary text
         summary = f"""
 Weekly Learning Summary Report
 ==============================
-Report Period: {week_ago.strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}
+Report Period: {period_start.strftime('%Y-%m-%d')} to {period_end.strftime('%Y-%m-%d')}
 
 Overview:
 - Total resources worked on: {total_resources}
@@ -84,7 +121,7 @@ Top Achievements:
         if len(skills) < 2:
             summary += "- Try exploring resources in different skill areas\n"
             
-        return summary.strip()
+        return summary.strip(), stats
     
     def print_weekly_summary(self):
         """
@@ -96,4 +133,52 @@ Top Achievements:
         print("=" * 50)
         print(summary)
         print("=" * 50)
-        return summary
\ No newline at end of file
+        return summary
+
+def week_starts(since, until):
+    """
+    Monday of every week from the week containing since to the week containing until
+    """
+    current = since - timedelta(days=since.weekday())
+    last = until - timedelta(days=until.weekday())
+    weeks = []
+    while current <= last:
+        weeks.append(current)
+        current += timedelta(days=7)
+    return weeks
+
+
+def scope_key(scope, scope_id):
+    return f"{scope}:{'none' if scope_id is None else scope_id}"
+
+
+def build_report_fields(scope, scope_id, week_start):
+    """
+    Compute one WeeklyReport row as a dict of field values
+    Module-level so it can run in a process pool
+    """
+    from .models import Skill
+    if scope == 'skill':
+        owner_id = Skill.objects.filter(pk=scope_id).values_list('user_id', flat=True).first()
+        progress_items = Progress.objects.filter(resource__skill_id=scope_id)
+    else:
+        owner_id = scope_id
+        progress_items = Progress.objects.owned_by(scope_id)
+        
+    # Stored reports are built from the primary, never from a possibly stale snapshot
+    with primary_reads():
+        summary, stats = WeeklySummaryGenerator().build_weekly_report(progress_items, week_start=week_start)
+    return {
+        'user_id': owner_id,
+        'skill_id': scope_id if scope == 'skill' else None,
+        'scope': scope,
+        'scope_key': scope_key(scope, scope_id),
+        'week_start': week_start,
+        'week_end': week_start + timedelta(days=6),
+        'summary': summary,
+        'stats': stats,
+    }
+
+
+def _build_report_fields_star(args):
+    return build_report_fields(*args)